@@ -0,0 +1,118 @@
+# coding=utf-8
+"""
+离线抓取基准测试
+
+启动本地回放服务（见 replay_server.py），把 newsnow 数据源指向它，
+在临时目录中连续执行若干轮完整流程（抓取 + 保存 + 分析 + 生成报告），
+统计每轮的抓取耗时、整轮耗时、请求次数、重试次数和失败平台。
+
+注意：注入错误后 DataFetcher 会按正常逻辑等待 3~5 秒再重试，
+整轮耗时会明显变长，这正是需要观察的重试行为。
+
+用法（在项目根目录执行）:
+    python benchmarks/bench_crawl_replay.py [--ticks 5] [--latency 80] [--jitter 40]
+        [--error-rate 0.05] [--cache-rate 0.1] [--concurrency 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线抓取基准测试")
+    parser.add_argument("--ticks", type=int, default=5, help="执行轮数")
+    parser.add_argument("--date", help="回放的日期目录，默认最近一天")
+    parser.add_argument("--latency", type=float, default=80, help="回放服务固定延迟(毫秒)")
+    parser.add_argument("--jitter", type=float, default=40, help="回放服务随机附加延迟(毫秒)")
+    parser.add_argument("--error-rate", type=float, default=0, help="注入 HTTP 错误的概率")
+    parser.add_argument("--cache-rate", type=float, default=0, help="返回 status=cache 的概率")
+    parser.add_argument("--concurrency", type=int, default=8, help="max_concurrency，1 为串行")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep-limits", action="store_true", help="保留配置中的限流和熔断")
+    args = parser.parse_args()
+
+    # 配置使用项目中的文件，输出写到临时目录，避免污染 output
+    os.environ["CONFIG_PATH"] = str(ROOT / "config" / "config.yaml")
+    os.environ["FREQUENCY_WORDS_PATH"] = str(ROOT / "config" / "frequency_words.txt")
+    os.environ["ENABLE_NOTIFICATION"] = "false"
+    os.environ["DOCKER_CONTAINER"] = "true"  # 不打开浏览器
+    work_dir = tempfile.mkdtemp(prefix="trendradar-replay-")
+    os.chdir(work_dir)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main as trendradar
+        from replay_server import start_replay_server
+
+    server = start_replay_server(
+        ROOT / "output",
+        args.date,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        cache_rate=args.cache_rate,
+        seed=args.seed,
+    )
+    fixtures = server.fixtures
+
+    config = trendradar.CONFIG
+    config["SOURCES"] = {"newsnow": {"url": server.base_url}}
+    config["PLATFORMS"] = [
+        platform for platform in config["PLATFORMS"] if platform["id"] in fixtures.snapshots
+    ]
+    config["MAX_CONCURRENCY"] = args.concurrency
+    # 每轮都要请求回放服务，抓取缓存不参与测量
+    config["FETCH_CACHE"] = {**config["FETCH_CACHE"], "ENABLED": False}
+    if not args.keep_limits:
+        # 连续多轮会很快耗尽每分钟的请求令牌，默认关闭限流和熔断
+        config["CIRCUIT_BREAKER"] = {**config["CIRCUIT_BREAKER"], "ENABLED": False}
+
+    print(f"回放日期: {fixtures.date}，平台 {len(config['PLATFORMS'])} 个，工作目录 {work_dir}")
+    print(f"延迟 {args.latency}+{args.jitter}ms，错误率 {args.error_rate}，cache 比例 {args.cache_rate}，并发 {args.concurrency}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = trendradar.NewsAnalyzer()
+
+    try:
+        for tick in range(1, args.ticks + 1):
+            log = io.StringIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                try:
+                    analyzer.run()
+                except Exception as e:
+                    print(f"执行失败: {e}")
+            tick_time = time.perf_counter() - start
+
+            stats = analyzer.data_fetcher.crawl_stats
+            attempts = sum(item.get("attempts", 0) for item in stats.values())
+            failed = [pid for pid, item in stats.items() if item.get("status") != "success"]
+            ttfbs = [item["ttfb"] for item in stats.values() if item.get("ttfb") is not None]
+            crawl_time = max(ttfbs) if ttfbs else 0
+            print(
+                f"第 {tick} 轮: 整轮 {tick_time * 1000:7.0f} ms  "
+                f"请求 {attempts:3d} 次（重试 {attempts - len(stats):2d}）  "
+                f"最慢首字节 {crawl_time * 1000:5.0f} ms  "
+                f"吞吐 {len(stats) / tick_time:5.1f} 平台/秒  失败 {failed or '-'}"
+            )
+    finally:
+        server.shutdown()
+
+    total = {"requests": 0}
+    for item in server.stats.values():
+        for key, value in item.items():
+            total[key] = total.get(key, 0) + value
+    print(f"回放服务统计: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# coding=utf-8
+"""
+日数据内存基准测试
+
+用合成语料（默认 90 天，每天 48 个批次、15 个平台、每个平台每批 50 条，
+每批约 15% 的标题更替）分别构建旧的字典表示和紧凑表示，统计全部天数常驻的内存和构建耗时：
+
+- main.py：all_results + title_info 两份字典（旧的逐批合并）对比 DayTitleTable
+- MCP：read_all_titles_for_date 的 {title: {ranks, url, mobileUrl}} 字典对比 DayTitles
+
+用法（在项目根目录执行）:
+    python benchmarks/bench_day_model.py [--days 90] [--ticks 48] [--platforms 15] [--titles 50]
+                                          [--churn 0.15] [--timing-days 5]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import DayTitleTable  # noqa: E402
+from mcp_server.services.day_titles import DayTitles  # noqa: E402
+
+
+def generate_day(day: int, ticks: int, platforms: int, titles: int, churn: float):
+    """生成一天的批次快照，逐批产出 (time_info, {platform_id: {title: {ranks, url, mobileUrl}}})
+
+    字段分布参照真实数据：标题约 22 字，链接约 75 字符，约 3/4 的移动端链接为空、1/5 与链接相同
+    """
+    rng = random.Random(day)
+    serial = 0
+
+    def new_title(platform_index: int):
+        nonlocal serial
+        serial += 1
+        # 约 10% 的标题在多个平台同时出现
+        if rng.random() < 0.1:
+            key = rng.randrange(titles)
+            title = f"第{day}天跨平台热点事件{key}的最新进展与各方回应"
+        else:
+            title = f"第{day}天平台{platform_index}热点新闻{serial}：最新通报引发广泛关注"
+        url = f"https://www.example.com/news/{platform_index}/{day:03d}/{serial:08d}?source=hot&from=list&share=0"
+        roll = rng.random()
+        mobile_url = "" if roll < 0.75 else url if roll < 0.95 else url.replace("www.", "m.")
+        return title, url, mobile_url
+
+    boards = [[new_title(p) for _ in range(titles)] for p in range(platforms)]
+    for tick in range(ticks):
+        time_info = f"{tick * 30 // 60:02d}时{tick * 30 % 60:02d}分"
+        snapshot = {}
+        for p, board in enumerate(boards):
+            if tick:
+                for index in range(len(board)):
+                    if rng.random() < churn:
+                        board[index] = new_title(p)
+                # 相邻排名小幅交换
+                for _ in range(titles // 10):
+                    a = rng.randrange(titles - 1)
+                    board[a], board[a + 1] = board[a + 1], board[a]
+            snapshot[f"platform-{p}"] = {
+                title: {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+                for rank, (title, url, mobile_url) in enumerate(board, 1)
+            }
+        yield time_info, snapshot
+
+
+def legacy_main_day(day_data):
+    """旧的 main.py 汇总：all_results 与 title_info 两份字典"""
+    all_results, title_info = {}, {}
+    for time_info, titles_by_id in day_data:
+        for source_id, title_data in titles_by_id.items():
+            results = all_results.setdefault(source_id, {})
+            infos = title_info.setdefault(source_id, {})
+            for title, data in title_data.items():
+                ranks = data["ranks"]
+                if title not in results:
+                    results[title] = {"ranks": ranks, "url": data["url"], "mobileUrl": data["mobileUrl"]}
+                    infos[title] = {
+                        "first_time": time_info,
+                        "last_time": time_info,
+                        "count": 1,
+                        "ranks": ranks,
+                        "url": data["url"],
+                        "mobileUrl": data["mobileUrl"],
+                    }
+                    continue
+                merged_ranks = results[title]["ranks"].copy()
+                for rank in ranks:
+                    if rank not in merged_ranks:
+                        merged_ranks.append(rank)
+                results[title] = {
+                    "ranks": merged_ranks,
+                    "url": results[title]["url"] or data["url"],
+                    "mobileUrl": results[title]["mobileUrl"] or data["mobileUrl"],
+                }
+                info = infos[title]
+                info["last_time"] = time_info
+                info["ranks"] = merged_ranks
+                info["count"] += 1
+    return all_results, title_info
+
+
+def compact_main_day(day_data):
+    table = DayTitleTable()
+    for time_info, titles_by_id in day_data:
+        table.add_snapshot(time_info, titles_by_id)
+    return table
+
+
+def legacy_mcp_day(day_data):
+    """旧的 MCP 按日读取：排名追加，链接取首次出现的值"""
+    all_titles = {}
+    for _, titles_by_id in day_data:
+        for platform_id, titles in titles_by_id.items():
+            platform_titles = all_titles.setdefault(platform_id, {})
+            for title, info in titles.items():
+                if title in platform_titles:
+                    platform_titles[title]["ranks"].extend(info["ranks"])
+                else:
+                    platform_titles[title] = dict(info, ranks=list(info["ranks"]))
+    return all_titles
+
+
+def compact_mcp_day(day_data):
+    day_titles = DayTitles()
+    for _, titles_by_id in day_data:
+        day_titles.add_snapshot(titles_by_id)
+    return day_titles
+
+
+def measure(name, build, args):
+    """构建全部天数并保留结果，统计常驻内存（不含合成快照本身）；耗时在关闭 tracemalloc 后单独统计"""
+    gc.collect()
+    tracemalloc.start()
+    kept = []
+    for day in range(args.days):
+        # 快照在构建后释放，只留下构建结果
+        day_data = list(generate_day(day, args.ticks, args.platforms, args.titles, args.churn))
+        kept.append(build(day_data))
+        del day_data
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    timing_days = min(args.days, args.timing_days)
+    elapsed = 0.0
+    for day in range(timing_days):
+        day_data = list(generate_day(day, args.ticks, args.platforms, args.titles, args.churn))
+        start = time.perf_counter()
+        build(day_data)
+        elapsed += time.perf_counter() - start
+
+    print(
+        f"{name:<24} 常驻 {current / 1024 / 1024:8.1f} MB  "
+        f"构建 {elapsed * 1000 / timing_days:7.1f} ms/天"
+    )
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日数据内存基准测试")
+    parser.add_argument("--days", type=int, default=90, help="天数")
+    parser.add_argument("--ticks", type=int, default=48, help="每天批次数")
+    parser.add_argument("--platforms", type=int, default=15, help="平台数")
+    parser.add_argument("--titles", type=int, default=50, help="每个平台每批标题数")
+    parser.add_argument("--churn", type=float, default=0.15, help="每批标题更替比例")
+    parser.add_argument("--timing-days", type=int, default=5, help="统计构建耗时的天数")
+    args = parser.parse_args()
+
+    print(
+        f"合成语料: {args.days} 天 × {args.ticks} 批 × {args.platforms} 平台 × {args.titles} 条，"
+        f"每批更替 {args.churn:.0%}"
+    )
+    legacy = measure("main 旧字典（两份）", legacy_main_day, args)
+    compact = measure("main DayTitleTable", compact_main_day, args)
+    print(f"main 常驻内存减少 {(1 - compact / legacy) * 100:.1f}%")
+    legacy = measure("MCP 旧字典", legacy_mcp_day, args)
+    compact = measure("MCP DayTitles", compact_mcp_day, args)
+    print(f"MCP 常驻内存减少 {(1 - compact / legacy) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# coding=utf-8
+"""
+响应解码基准测试
+
+对比旧的解码流程（response.text -> json.loads 校验状态 -> 再次 json.loads ->
+每条标题 7 个键的字典）与适配器的单次解码（字节直接 json.loads -> TitleRecord），
+统计每次抓取（每个平台一份响应）的内存分配和耗时。
+
+响应样本默认由 output 目录中最近的 txt 快照还原为 newsnow 接口格式；
+也可以用 --payload-dir 指定抓包保存的原始 JSON 响应目录（*.json）。
+
+用法（在项目根目录执行）:
+    python benchmarks/bench_decode_payload.py [--snapshots 20] [--payload-dir DIR]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import NewsNowAdapter, parse_file_titles  # noqa: E402
+
+
+def load_captured_payloads(payload_dir: Path):
+    """读取抓包保存的原始响应，每个文件视为一次抓取中的一个平台"""
+    return [[path.read_bytes()] for path in sorted(payload_dir.glob("*.json"))]
+
+
+def build_payloads_from_snapshots(limit: int):
+    """把 txt 快照还原为 newsnow 响应，每个快照为一次抓取"""
+    files = sorted(Path("output").glob("*/txt/*.txt"))[-limit:]
+    crawls = []
+    for file_path in files:
+        titles_by_id, _ = parse_file_titles(file_path)
+        payloads = []
+        for source_id, titles in titles_by_id.items():
+            items = []
+            for title, info in sorted(titles.items(), key=lambda x: x[1]["ranks"][0]):
+                items.append(
+                    {
+                        "id": info["url"] or title,
+                        "title": title,
+                        "url": info["url"],
+                        "mobileUrl": info["mobileUrl"],
+                        "extra": {},
+                    }
+                )
+            body = {"status": "success", "id": source_id, "updatedTime": 0, "items": items}
+            payloads.append(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+        crawls.append(payloads)
+    return crawls
+
+
+def legacy_decode(content: bytes):
+    """旧实现：先解码文本校验状态，再解析一遍构建 7 键字典"""
+    data_text = content.decode("utf-8")
+    status = json.loads(data_text).get("status", "未知")
+    if status not in ["success", "cache"]:
+        raise ValueError(status)
+
+    data = json.loads(data_text)
+    title_data = {}
+    for index, item in enumerate(data.get("items", []), 1):
+        title = item["title"]
+        if title in title_data:
+            title_data[title]["ranks"].append(index)
+        else:
+            title_data[title] = {
+                "ranks": [index],
+                "url": item.get("url", ""),
+                "mobileUrl": item.get("mobileUrl", ""),
+                "desc": item.get("desc", ""),
+                "hot": item.get("hot", ""),
+                "timestamp": item.get("timestamp", ""),
+                "extra": item.get("extra", {}),
+            }
+    return title_data
+
+
+def measure(name, decode, crawls):
+    # 内存：逐次抓取统计峰值和解码结果常驻的内存块
+    peaks, retained_blocks, retained_bytes = [], [], []
+    for payloads in crawls:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        results = [decode(content) for content in payloads]
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        diff = [stat for stat in after.compare_to(before, "filename") if stat.size_diff > 0]
+        retained_blocks.append(sum(stat.count_diff for stat in diff))
+        retained_bytes.append(sum(stat.size_diff for stat in diff))
+        peaks.append(peak)
+        del results
+
+    # 耗时：关闭 tracemalloc 单独计时
+    start = time.perf_counter()
+    for payloads in crawls:
+        for content in payloads:
+            decode(content)
+    per_crawl_ms = (time.perf_counter() - start) * 1000 / len(crawls)
+
+    count = len(crawls)
+    print(
+        f"{name:<24} 常驻内存块 {sum(retained_blocks) / count:9.0f}  "
+        f"常驻 {sum(retained_bytes) / count / 1024:8.1f} KB  "
+        f"峰值 {sum(peaks) / count / 1024:8.1f} KB  "
+        f"耗时 {per_crawl_ms:7.2f} ms/次"
+    )
+    return sum(retained_blocks) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="响应解码基准测试")
+    parser.add_argument("--snapshots", type=int, default=20, help="从 output 还原的抓取次数")
+    parser.add_argument("--payload-dir", type=Path, help="抓包保存的原始 JSON 响应目录")
+    args = parser.parse_args()
+
+    if args.payload_dir:
+        crawls = load_captured_payloads(args.payload_dir)
+    else:
+        crawls = build_payloads_from_snapshots(args.snapshots)
+    crawls = [payloads for payloads in crawls if payloads]
+    if not crawls:
+        print("没有可用的响应样本")
+        return
+
+    total = sum(len(payloads) for payloads in crawls)
+    size = sum(len(content) for payloads in crawls for content in payloads)
+    print(f"样本: {len(crawls)} 次抓取，{total} 份响应，共 {size / 1024:.0f} KB")
+
+    adapter = NewsNowAdapter()
+    legacy = measure("旧实现（两次解析+字典）", legacy_decode, crawls)
+    compact = measure("单次解码 TitleRecord", lambda c: adapter.decode(c, True), crawls)
+    measure("单次解码（丢弃可选字段）", lambda c: adapter.decode(c, False), crawls)
+
+    if legacy:
+        print(f"每次抓取常驻内存块减少 {(1 - compact / legacy) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# coding=utf-8
+"""
+HTTP 连接池基准测试
+
+在本地启动一个 keep-alive 的 newsnow 替身服务，分别用模块级 requests.get
+（旧实现）和共享 HttpClient 模拟一次完整运行的请求量，统计服务端收到的
+TCP 连接数（即握手次数）和耗时。
+
+用法（在项目根目录执行）:
+    python benchmarks/bench_http_pool.py [--platforms 15] [--runs 3]
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests  # noqa: E402
+
+from main import DataFetcher, HttpClient  # noqa: E402
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """统计连接数的替身接口"""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # 避免头部和正文分两次写入时触发 Nagle + 延迟 ACK
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with CountingHandler.lock:
+            CountingHandler.connections += 1
+
+    def do_GET(self):
+        body = json.dumps(
+            {
+                "status": "success",
+                "items": [{"title": f"标题 {i}", "url": f"https://example.com/{i}"} for i in range(30)],
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_case(name, get_func, urls):
+    CountingHandler.connections = 0
+    start = time.perf_counter()
+    for url in urls:
+        get_func(url).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} 请求数 {len(urls):>4}  新建连接 {CountingHandler.connections:>4}  耗时 {elapsed * 1000:8.1f} ms")
+    return CountingHandler.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 连接池基准测试")
+    parser.add_argument("--platforms", type=int, default=15, help="每次运行抓取的平台数")
+    parser.add_argument("--runs", type=int, default=3, help="模拟的运行次数（含重试可调大）")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/api/s"
+    urls = [f"{base}?id=p{i}&latest" for i in range(args.platforms)] * args.runs
+
+    try:
+        legacy = run_case("requests.get", lambda url: requests.get(url, timeout=10), urls)
+        client = HttpClient()
+        pooled = run_case("HttpClient", client.get, urls)
+        client.close()
+
+        # 关闭同域名间隔，只比较连接复用
+        fetcher = DataFetcher(max_concurrency=8, per_host_interval=0)
+        fetcher.http_client = HttpClient()
+        CountingHandler.connections = 0
+        start = time.perf_counter()
+        for url in urls:
+            fetcher._request(url).raise_for_status()
+        print(
+            f"{'DataFetcher._request':<20} 请求数 {len(urls):>4}  新建连接 {CountingHandler.connections:>4}  "
+            f"耗时 {(time.perf_counter() - start) * 1000:8.1f} ms"
+        )
+
+        if legacy:
+            print(f"握手次数减少 {(1 - pooled / legacy) * 100:.1f}%")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
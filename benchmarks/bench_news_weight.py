@@ -0,0 +1,134 @@
+# coding=utf-8
+"""
+新闻权重批量计算基准测试
+
+用合成的标题记录（默认 10 万条，出现次数和排名分布参照一天 48 个批次的榜单）比较：
+
+- main.py：逐条调用 calculate_news_weight 作为排序键，对比 calculate_news_weights 批量计算后
+  按预先算好的权重排序（纯 Python 与 NumPy 两种路径）
+- MCP：按 calculate_news_weight 排序，对比 sort_news_by_weight
+
+同时校验各路径的权重和排序结果与逐条计算完全一致。未安装 NumPy 时只比较纯 Python 路径。
+
+用法（在项目根目录执行）:
+    python benchmarks/bench_news_weight.py [--records 100000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def generate_records(count: int, seed: int = 1):
+    """生成标题记录 {ranks, count}：多数标题只出现几个批次，少数常驻榜单，排名集中在前 50"""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        appearances = min(48, int(rng.expovariate(1 / 6)) + 1)
+        base_rank = rng.randint(1, 50)
+        ranks = []
+        for _ in range(min(appearances, rng.randint(1, 8))):
+            rank = max(1, base_rank + rng.randint(-5, 5))
+            if rank not in ranks:
+                ranks.append(rank)
+        records.append({"ranks": ranks, "count": appearances})
+    return records
+
+
+def timed(function, repeat: int):
+    """返回 (最后一次的结果, 最短耗时秒数)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻权重批量计算基准测试")
+    parser.add_argument("--records", type=int, default=100000, help="标题记录数")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    os.environ.setdefault("CONFIG_PATH", str(ROOT / "config" / "config.yaml"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main as trendradar
+    from mcp_server.tools import analytics
+
+    records = generate_records(args.records)
+    threshold = trendradar.CONFIG["RANK_THRESHOLD"]
+    print(f"合成记录: {len(records)} 条，排名共 {sum(len(r['ranks']) for r in records)} 个，"
+          f"NumPy: {'已安装' if trendradar.np is not None else '未安装'}")
+
+    # main.py：旧的排序方式，排序键逐条计算权重
+    expected_weights = [trendradar.calculate_news_weight(record, threshold) for record in records]
+    expected_order, legacy = timed(
+        lambda: sorted(
+            range(len(records)),
+            key=lambda index: -trendradar.calculate_news_weight(records[index], threshold),
+        ),
+        args.repeat,
+    )
+    print(f"main 逐条计算排序键          {legacy * 1000:8.1f} ms")
+
+    columns, build = timed(lambda: trendradar.news_weight_columns(records), args.repeat)
+    print(f"main 转为列                  {build * 1000:8.1f} ms")
+
+    paths = [("纯 Python", None)]
+    if trendradar.np is not None:
+        paths.append(("NumPy", 1))
+    numpy_min_batch = trendradar.NUMPY_MIN_BATCH
+    for name, min_batch in paths:
+        trendradar.NUMPY_MIN_BATCH = min_batch if min_batch is not None else len(records) + 1
+        weights, elapsed = timed(
+            lambda: trendradar.calculate_news_weights(*columns, threshold), args.repeat
+        )
+        order, sort_elapsed = timed(
+            lambda: sorted(range(len(records)), key=lambda index: -weights[index]), args.repeat
+        )
+        assert weights == expected_weights, f"{name} 权重与逐条计算不一致"
+        assert order == expected_order, f"{name} 排序与逐条计算不一致"
+        total = build + elapsed + sort_elapsed
+        print(
+            f"main 批量计算（{name:<8}）  {elapsed * 1000:8.1f} ms  含转列和排序 {total * 1000:8.1f} ms"
+            f"  加速 {legacy / total:5.1f}x"
+        )
+    trendradar.NUMPY_MIN_BATCH = numpy_min_batch
+
+    # MCP：旧的 list.sort 排序键逐条计算，对比 sort_news_by_weight
+    def legacy_mcp_sort():
+        news = list(records)
+        news.sort(key=lambda x: analytics.calculate_news_weight(x), reverse=True)
+        return news
+
+    expected_news, legacy = timed(legacy_mcp_sort, args.repeat)
+    print(f"MCP 逐条计算排序键            {legacy * 1000:8.1f} ms")
+
+    numpy_min_batch = analytics.NUMPY_MIN_BATCH
+    for name, min_batch in paths:
+        analytics.NUMPY_MIN_BATCH = min_batch if min_batch is not None else len(records) + 1
+
+        def batch_mcp_sort():
+            news = list(records)
+            analytics.sort_news_by_weight(news)
+            return news
+
+        news, elapsed = timed(batch_mcp_sort, args.repeat)
+        assert all(a is b for a, b in zip(news, expected_news)), f"MCP {name} 排序与逐条计算不一致"
+        print(f"MCP 批量排序（{name:<8}）        {elapsed * 1000:8.1f} ms  加速 {legacy / elapsed:5.1f}x")
+    analytics.NUMPY_MIN_BATCH = numpy_min_batch
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# coding=utf-8
+"""
+单批次分析流程基准测试
+
+启动本地回放服务（见 replay_server.py），在临时目录中连续抓取若干批次，对比两份 main.py
+完成每个批次分析（实时报告、汇总报告、通知内容）时的读取和推导次数及耗时：
+
+- 基准：--baseline 指定的 git 版本中的 main.py（默认 HEAD），运行该版本自己的 NewsAnalyzer
+  分析流程；对比引入 AnalysisContext 之前的流程可指定该提交的上一个版本
+- 当前：工作区中的 main.py，即 NewsAnalyzer 当前的流程
+
+两份 main.py 各自在新的临时目录中抓取相同的回放数据，只统计抓取保存之后的分析阶段。
+统计项：批次列表（list_day_snapshots）、快照读取（单个批次的读取函数）、文件解析
+（txt 解析和列式快照库文件加载）、新增检测、频率词加载、词频统计，以及分析阶段耗时和 CPU 时间。
+通知不会真正发送，只生成通知内容。
+
+用法（在项目根目录执行）:
+    python benchmarks/bench_tick_pipeline.py [--baseline HEAD] [--ticks 8] [--modes current,daily,incremental]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from functools import wraps
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+COUNTERS = [
+    ("list_day_snapshots", "批次列表"),
+    ("snapshot_reads", "快照读取"),
+    ("file_parses", "文件解析"),
+    ("detect_latest_new_titles", "新增检测"),
+    ("load_frequency_words", "频率词加载"),
+    ("count_word_frequency", "词频统计"),
+]
+
+
+def install_counters(trendradar, counts):
+    """包装 main.py 中的相关函数，调用时计数（模块内按全局名调用，替换模块属性即可生效）"""
+
+    def counted(name, key):
+        original = getattr(trendradar, name)
+
+        @wraps(original)
+        def wrapper(*args, **kwargs):
+            counts[key] = counts.get(key, 0) + 1
+            return original(*args, **kwargs)
+
+        setattr(trendradar, name, wrapper)
+
+    for name in ("list_day_snapshots", "detect_latest_new_titles", "load_frequency_words",
+                 "count_word_frequency"):
+        counted(name, name)
+    for name in ("_read_txt_snapshot", "_read_archived_snapshot", "_read_partitioned_snapshot"):
+        counted(name, "snapshot_reads")
+    counted("parse_snapshot_text", "file_parses")
+
+    load = trendradar.ColumnarDayStore.load
+
+    def counted_load(self):
+        counts["file_parses"] = counts.get("file_parses", 0) + 1
+        return load(self)
+
+    trendradar.ColumnarDayStore.load = counted_load
+
+
+def analyze_tick(trendradar, analyzer, results, id_to_name, failed_ids, time_info):
+    """用该版本 NewsAnalyzer 自己的分析流程处理一个已保存的批次"""
+    mode_strategy = analyzer._get_mode_strategy()
+    if hasattr(trendradar, "AnalysisContext"):
+        context = trendradar.AnalysisContext(
+            results, id_to_name, failed_ids, time_info,
+            analyzer.data_fetcher.unchanged_ids, analyzer.rank_threshold,
+        )
+        analyzer._execute_mode_strategy(mode_strategy, context)
+    else:
+        # 引入 AnalysisContext 之前的版本
+        analyzer._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids, time_info)
+
+
+def load_baseline(revision: str):
+    """从 git 取出指定版本的 main.py，作为独立模块加载"""
+    source = subprocess.run(
+        ["git", "-C", str(ROOT), "show", f"{revision}:main.py"],
+        check=True, capture_output=True,
+    ).stdout
+    path = Path(tempfile.mkdtemp(prefix="trendradar-baseline-")) / "main.py"
+    path.write_bytes(source)
+    spec = importlib.util.spec_from_file_location("trendradar_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def configure(trendradar, server):
+    """指向回放服务，关闭熔断和抓取缓存，通知只生成内容不发送"""
+    config = trendradar.CONFIG
+    config["SOURCES"] = {"newsnow": {"url": server.base_url}}
+    config["PLATFORMS"] = [
+        platform for platform in config["PLATFORMS"]
+        if platform["id"] in server.fixtures.snapshots
+    ]
+    config["CIRCUIT_BREAKER"] = {**config["CIRCUIT_BREAKER"], "ENABLED": False}
+    config["FETCH_CACHE"] = {**config["FETCH_CACHE"], "ENABLED": False}
+    config["ENABLE_NOTIFICATION"] = True
+    config["PUSH_WINDOW"] = {**config["PUSH_WINDOW"], "ENABLED": False}
+
+    prepare_report_data = trendradar.prepare_report_data
+
+    def send_to_notifications(stats, failed_ids=None, report_type="", new_titles=None,
+                              id_to_name=None, update_info=None, proxy_url=None, mode="daily",
+                              html_file_path=None, **kwargs):
+        prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode, **kwargs)
+        return {}
+
+    trendradar.send_to_notifications = send_to_notifications
+
+
+def run(trendradar, server, tick_counts, mode, ticks):
+    """在新的临时目录中抓取 ticks 个批次，返回分析阶段的 (各项计数合计, 耗时合计, CPU 时间合计)"""
+    os.chdir(tempfile.mkdtemp(prefix="trendradar-tick-"))
+    server.fixtures.reset()
+    trendradar._partitioned_store_cache.clear()
+    trendradar._columnar_store_cache.clear()
+    trendradar.CONFIG["REPORT_MODE"] = mode
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer = trendradar.NewsAnalyzer()
+    analyzer._has_notification_configured = lambda: True
+
+    counts = {}
+    elapsed = 0.0
+    cpu = 0.0
+    for tick in range(ticks):
+        time_info = f"{8 + tick // 2:02d}时{tick % 2 * 30:02d}分"
+        trendradar.format_time_filename = lambda value=time_info: value
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, id_to_name, failed_ids, time_info = analyzer._crawl_data()
+            tick_counts.clear()
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            analyze_tick(trendradar, analyzer, results, id_to_name, failed_ids, time_info)
+            elapsed += time.perf_counter() - start
+            cpu += time.process_time() - cpu_start
+        for key, value in tick_counts.items():
+            counts[key] = counts.get(key, 0) + value
+    return counts, elapsed, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="单批次分析流程基准测试")
+    parser.add_argument("--ticks", type=int, default=8, help="每种模式抓取的批次数")
+    parser.add_argument("--modes", default="current,daily,incremental", help="报告模式，逗号分隔")
+    parser.add_argument("--date", help="回放的日期目录，默认最近一天")
+    parser.add_argument("--baseline", default="HEAD", help="作为基准的 git 版本")
+    args = parser.parse_args()
+
+    # 配置使用项目中的文件，输出写到临时目录，避免污染 output
+    os.environ["CONFIG_PATH"] = str(ROOT / "config" / "config.yaml")
+    os.environ["FREQUENCY_WORDS_PATH"] = str(ROOT / "config" / "frequency_words.txt")
+    os.environ["DOCKER_CONTAINER"] = "true"  # 不打开浏览器
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main as trendradar
+        baseline = load_baseline(args.baseline)
+        from replay_server import start_replay_server
+
+    server = start_replay_server(ROOT / "output", args.date, latency=0, jitter=0, seed=1)
+    # 只统计分析阶段：run 在每批次抓取保存之后清零
+    tick_counts = {}
+    for module in (baseline, trendradar):
+        configure(module, server)
+        install_counters(module, tick_counts)
+
+    print(f"回放日期: {server.fixtures.date}，平台 {len(trendradar.CONFIG['PLATFORMS'])} 个，"
+          f"每种模式 {args.ticks} 个批次，基准版本 {args.baseline}")
+    # 单核或繁忙的机器上耗时受磁盘和调度影响波动很大，比较时以 CPU 时间为准
+    print("每批次平均: " + "  ".join(label for _, label in COUNTERS) + "  分析耗时  CPU 时间")
+    try:
+        for mode in args.modes.split(","):
+            for name, module in (("基准", baseline), ("当前", trendradar)):
+                counts, elapsed, cpu = run(module, server, tick_counts, mode, args.ticks)
+                values = "  ".join(
+                    f"{counts.get(key, 0) / args.ticks:{len(label) * 2}.1f}" for key, label in COUNTERS
+                )
+                print(
+                    f"{mode:<12}{name:<6}{values}  {elapsed * 1000 / args.ticks:7.1f} ms"
+                    f"  {cpu * 1000 / args.ticks:7.1f} ms"
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
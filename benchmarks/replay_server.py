@@ -0,0 +1,291 @@
+# coding=utf-8
+"""
+newsnow 接口本地回放服务
+
+从 output/<日期>/txt 的历史快照还原各平台的接口响应，在本地提供与
+https://newsnow.busiyi.world/api/s?id=<平台>&latest 相同格式的接口，
+支持模拟延迟、错误注入和 "cache" 状态，用于离线复现抓取吞吐、重试行为和整轮耗时。
+
+把 config.yaml 中的 crawler.sources.newsnow.url 改为
+    http://127.0.0.1:9876/api/s?id={id}&latest
+后，main.py 和 MCP 的 trigger_crawl 都会从回放服务抓取。
+
+用法（在项目根目录执行）:
+    python benchmarks/replay_server.py [--date 2025年11月17日] [--port 9876]
+        [--latency 80] [--jitter 40] [--error-rate 0.05] [--cache-rate 0.2]
+
+接口:
+    GET /api/s?id=<平台>   按快照时间顺序依次返回该平台的数据（--mode latest 时固定返回最新快照）
+    GET /stats             各平台请求次数、注入错误次数
+"""
+
+import argparse
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import parse_file_titles  # noqa: E402
+
+
+class ReplayFixtures:
+    """按时间顺序保存某一天各平台的快照数据"""
+
+    def __init__(self, output_dir: Path, date: Optional[str] = None, mode: str = "cycle"):
+        txt_dir = self._find_txt_dir(output_dir, date)
+        self.date = txt_dir.parent.name
+        self.mode = mode
+        self.snapshots: Dict[str, List[Tuple[str, Dict]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        for file_path in sorted(txt_dir.glob("*.txt")):
+            titles_by_id, _ = parse_file_titles(file_path)
+            for source_id, titles in titles_by_id.items():
+                self.snapshots.setdefault(source_id, []).append(
+                    (file_path.stem, self._build_payload(source_id, titles))
+                )
+
+    @staticmethod
+    def _find_txt_dir(output_dir: Path, date: Optional[str]) -> Path:
+        if date:
+            txt_dir = output_dir / date / "txt"
+            if not txt_dir.exists():
+                raise FileNotFoundError(f"快照目录不存在: {txt_dir}")
+            return txt_dir
+
+        candidates = sorted(
+            path for path in output_dir.glob("*/txt") if any(path.glob("*.txt"))
+        )
+        if not candidates:
+            raise FileNotFoundError(f"{output_dir} 下没有可回放的 txt 快照")
+        return candidates[-1]
+
+    @staticmethod
+    def _build_payload(source_id: str, titles: Dict) -> Dict:
+        """还原为 newsnow 接口的响应结构"""
+        items = []
+        for title, info in sorted(titles.items(), key=lambda x: x[1]["ranks"][0]):
+            items.append(
+                {
+                    "id": info["url"] or title,
+                    "title": title,
+                    "url": info["url"],
+                    "mobileUrl": info["mobileUrl"],
+                }
+            )
+        return {"status": "success", "id": source_id, "updatedTime": 0, "items": items}
+
+    def reset(self) -> None:
+        """各平台重新从第一份快照开始回放"""
+        with self._lock:
+            self._cursors.clear()
+
+    def next_payload(self, source_id: str) -> Optional[Dict]:
+        """返回平台的下一份快照，回放到最后一份后从头循环"""
+        snapshots = self.snapshots.get(source_id)
+        if not snapshots:
+            return None
+        if self.mode == "latest":
+            return snapshots[-1][1]
+
+        with self._lock:
+            cursor = self._cursors.get(source_id, 0)
+            self._cursors[source_id] = (cursor + 1) % len(snapshots)
+        return snapshots[cursor][1]
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """带错误注入的回放服务"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        fixtures: ReplayFixtures,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+        bad_status_rate: float = 0,
+        cache_rate: float = 0,
+        fail_platforms: Optional[Set[str]] = None,
+        slow_platforms: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(address, ReplayHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.bad_status_rate = bad_status_rate
+        self.cache_rate = cache_rate
+        self.fail_platforms = fail_platforms or set()
+        self.slow_platforms = slow_platforms or {}
+        self.random = random.Random(seed)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/s?id={{id}}&latest"
+
+    def draw(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+    def record(self, source_id: str, outcome: str) -> None:
+        with self.lock:
+            stats = self.stats.setdefault(source_id, {"requests": 0})
+            stats["requests"] += 1
+            stats[outcome] = stats.get(outcome, 0) + 1
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # 避免头部和正文分两次写入时触发 Nagle + 延迟 ACK
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send_json(self, status_code: int, body: Dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server: ReplayServer = self.server
+        parsed = urlparse(self.path)
+
+        if parsed.path == "/stats":
+            with server.lock:
+                self._send_json(200, {"date": server.fixtures.date, "platforms": server.stats})
+            return
+        if parsed.path != "/api/s":
+            self._send_json(404, {"status": "error", "message": "not found"})
+            return
+
+        source_id = parse_qs(parsed.query).get("id", [""])[0]
+
+        delay = server.slow_platforms.get(source_id, server.latency)
+        if server.jitter:
+            delay += server.draw() * server.jitter
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if source_id in server.fail_platforms or server.draw() < server.error_rate:
+            server.record(source_id, "errors")
+            self._send_json(server.error_status, {"status": "error", "message": "injected"})
+            return
+        if server.draw() < server.bad_status_rate:
+            server.record(source_id, "bad_status")
+            self._send_json(200, {"status": "error", "message": "injected"})
+            return
+
+        payload = server.fixtures.next_payload(source_id)
+        if payload is None:
+            server.record(source_id, "missing")
+            self._send_json(404, {"status": "error", "message": f"unknown id {source_id}"})
+            return
+
+        if server.draw() < server.cache_rate:
+            server.record(source_id, "cache")
+            payload = {**payload, "status": "cache"}
+        else:
+            server.record(source_id, "success")
+        self._send_json(200, payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def parse_slow_platforms(value: str) -> Dict[str, float]:
+    """解析 "weibo:2000,zhihu:500" 形式的慢平台配置（毫秒）"""
+    result = {}
+    for part in filter(None, (item.strip() for item in value.split(","))):
+        source_id, delay = part.split(":", 1)
+        result[source_id] = float(delay)
+    return result
+
+
+def start_replay_server(
+    output_dir: Path = Path("output"),
+    date: Optional[str] = None,
+    mode: str = "cycle",
+    host: str = "127.0.0.1",
+    port: int = 0,
+    **options,
+) -> ReplayServer:
+    """在后台线程启动回放服务，port 为 0 时自动分配端口"""
+    fixtures = ReplayFixtures(output_dir, date, mode)
+    server = ReplayServer((host, port), fixtures, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="newsnow 接口本地回放服务")
+    parser.add_argument("--output-dir", type=Path, default=Path("output"), help="快照根目录")
+    parser.add_argument("--date", help="回放的日期目录，如 2025年11月17日，默认最近一天")
+    parser.add_argument("--mode", choices=["cycle", "latest"], default="cycle", help="按时间顺序循环回放或固定返回最新快照")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9876)
+    parser.add_argument("--latency", type=float, default=0, help="每个请求的固定延迟(毫秒)")
+    parser.add_argument("--jitter", type=float, default=0, help="随机附加延迟上限(毫秒)")
+    parser.add_argument("--error-rate", type=float, default=0, help="返回 HTTP 错误的概率")
+    parser.add_argument("--error-status", type=int, default=503, help="注入错误使用的 HTTP 状态码")
+    parser.add_argument("--bad-status-rate", type=float, default=0, help="返回 status=error 的概率")
+    parser.add_argument("--cache-rate", type=float, default=0, help="返回 status=cache 的概率")
+    parser.add_argument("--fail-platforms", default="", help="始终失败的平台，逗号分隔")
+    parser.add_argument("--slow-platforms", default="", help="单独设置延迟的平台，如 weibo:2000,zhihu:500")
+    parser.add_argument("--seed", type=int, help="随机种子，便于复现")
+    args = parser.parse_args()
+
+    server = start_replay_server(
+        args.output_dir,
+        args.date,
+        args.mode,
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        bad_status_rate=args.bad_status_rate,
+        cache_rate=args.cache_rate,
+        fail_platforms={item.strip() for item in args.fail_platforms.split(",") if item.strip()},
+        slow_platforms=parse_slow_platforms(args.slow_platforms),
+        seed=args.seed,
+    )
+    fixtures = server.fixtures
+    print(f"回放日期: {fixtures.date}，平台 {len(fixtures.snapshots)} 个，模式 {fixtures.mode}")
+    print(f"接口地址: {server.base_url}")
+    print("按 Ctrl+C 停止")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(json.dumps(server.stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
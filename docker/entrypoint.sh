@@ -38,6 +38,11 @@ case "${RUN_MODE:-cron}" in
     
     exec /usr/local/bin/supercronic -passthrough-logs /tmp/crontab
     ;;
+"daemon")
+    # 常驻进程，按 CRON_SCHEDULE 在进程内调度，IMMEDIATE_RUN 由 main.py 读取
+    echo "♻️ 常驻模式: ${CRON_SCHEDULE:-*/30 * * * *}"
+    exec /usr/local/bin/python main.py --daemon
+    ;;
 *)
     exec "$@"
     ;;
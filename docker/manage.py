@@ -133,6 +133,9 @@ def show_status():
         if "supercronic" in pid1_cmdline.lower():
             print("  ✅ supercronic 正确运行为 PID 1")
             supercronic_is_pid1 = True
+        elif "main.py --daemon" in pid1_cmdline:
+            print("  ✅ 常驻调度进程 (daemon 模式) 正确运行为 PID 1")
+            supercronic_is_pid1 = True
         else:
             print("  ❌ PID 1 不是 supercronic")
             print(f"  📋 实际的 PID 1: {pid1_cmdline}")
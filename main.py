@@ -1,23 +1,55 @@
 # coding=utf-8
 
+import argparse
+import hashlib
+import heapq
 import json
 import os
 import random
 import re
+import shutil
+import signal
+import struct
+import sys
+import threading
 import time
 import webbrowser
 import smtplib
+import sqlite3
+import tempfile
+import zipfile
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
 from email.utils import formataddr, formatdate, make_msgid
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple, Optional, Union
+from urllib.parse import quote, urlparse
+from xml.etree import ElementTree
 
 import pytz
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+try:
+    import numpy as np  # 可选依赖，用于批量计算新闻权重
+except ImportError:
+    np = None
+
+try:
+    import fcntl  # 快照清单的进程间锁，Windows 上没有
+except ImportError:
+    fcntl = None
 
 
 VERSION = "3.0.5"
@@ -63,15 +95,43 @@ def load_config():
         config_data = yaml.safe_load(f)
 
     print(f"配置文件加载成功: {config_path}")
+    circuit_breaker_config = config_data["crawler"].get("circuit_breaker") or {}
 
     # 构建配置
     config = {
         "VERSION_CHECK_URL": config_data["app"]["version_check_url"],
         "SHOW_VERSION_UPDATE": config_data["app"]["show_version_update"],
         "REQUEST_INTERVAL": config_data["crawler"]["request_interval"],
+        "MAX_CONCURRENCY": config_data["crawler"].get("max_concurrency", 8),
+        "PER_HOST_CONCURRENCY": config_data["crawler"].get("per_host_concurrency", 8),
+        "PER_HOST_INTERVAL": config_data["crawler"].get("per_host_interval", 50),
+        "HTTP_POOL_SIZE": config_data["crawler"].get("http_pool_size", 10),
+        "CONNECT_TIMEOUT": config_data["crawler"].get("connect_timeout", 5),
+        "READ_TIMEOUT": config_data["crawler"].get("read_timeout", 10),
+        "CRAWL_DEADLINE": float(
+            os.environ.get("CRAWL_DEADLINE", "").strip()
+            or config_data["crawler"].get("crawl_deadline", 0)
+        ),
+        "HEDGE_AFTER": config_data["crawler"].get("hedge_after", 0),
+        "SOURCES": config_data["crawler"].get("sources") or {},
+        "FETCH_CACHE": {
+            "ENABLED": (config_data["crawler"].get("fetch_cache") or {}).get(
+                "enabled", True
+            ),
+            "TTL": (config_data["crawler"].get("fetch_cache") or {}).get("ttl", 300),
+        },
+        "CIRCUIT_BREAKER": {
+            "ENABLED": circuit_breaker_config.get("enabled", True),
+            "FAILURE_THRESHOLD": circuit_breaker_config.get("failure_threshold", 3),
+            "COOLDOWN": circuit_breaker_config.get("cooldown", 1800),
+            "RATE_PER_MINUTE": circuit_breaker_config.get("rate_per_minute", 2),
+            "BURST": circuit_breaker_config.get("burst", 5),
+            "MIN_TIMEOUT": circuit_breaker_config.get("min_timeout", 3),
+        },
         "REPORT_MODE": os.environ.get("REPORT_MODE", "").strip()
         or config_data["report"]["mode"],
         "RANK_THRESHOLD": config_data["report"]["rank_threshold"],
+        "MAX_TITLES_PER_GROUP": config_data["report"].get("max_titles_per_group", 0),
         "USE_PROXY": config_data["crawler"]["use_proxy"],
         "DEFAULT_PROXY": config_data["crawler"]["default_proxy"],
         "ENABLE_CRAWLER": os.environ.get("ENABLE_CRAWLER", "").strip().lower()
@@ -128,6 +188,31 @@ def load_config():
             "FREQUENCY_WEIGHT": config_data["weight"]["frequency_weight"],
             "HOTNESS_WEIGHT": config_data["weight"]["hotness_weight"],
         },
+        "STORAGE": {
+            "COLUMNAR": (config_data.get("storage") or {}).get("columnar", False),
+            "SQLITE": {
+                "ENABLED": ((config_data.get("storage") or {}).get("sqlite") or {}).get(
+                    "enabled", False
+                ),
+                "PATH": ((config_data.get("storage") or {}).get("sqlite") or {}).get(
+                    "path", "output/news.db"
+                ),
+            },
+            "COMPACTION": {
+                "ENABLED": ((config_data.get("storage") or {}).get("compaction") or {}).get(
+                    "enabled", False
+                ),
+                "AFTER_DAYS": ((config_data.get("storage") or {}).get("compaction") or {}).get(
+                    "after_days", 1
+                ),
+            },
+            "RETENTION": {
+                artifact.upper(): ((config_data.get("storage") or {}).get("retention") or {}).get(
+                    artifact, 0
+                )
+                for artifact in ("txt", "html", "columnar")
+            },
+        },
         "PLATFORMS": config_data["platforms"],
     }
 
@@ -257,24 +342,89 @@ def get_output_path(subfolder: str, filename: str) -> str:
     return str(output_dir / filename)
 
 
+# === HTTP 客户端 ===
+class HttpClient:
+    """进程内共享的 HTTP 客户端，复用连接池和 keep-alive 连接"""
+
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        pool_size: int = CONFIG["HTTP_POOL_SIZE"],
+        connect_timeout: float = CONFIG["CONNECT_TIMEOUT"],
+        read_timeout: float = CONFIG["READ_TIMEOUT"],
+    ):
+        self.proxy_url = proxy_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+
+        # pool_maxsize 是单个主机的连接上限，pool_connections 是缓存的主机数
+        pool_maxsize = max(int(pool_size), int(CONFIG["PER_HOST_CONCURRENCY"]))
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.proxies = None
+        if proxy_url:
+            self.proxies = {"http": proxy_url, "https": proxy_url}
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """发送请求，未指定 timeout 时使用配置的连接/读取超时"""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        # 按请求传入代理，优先级高于环境变量中的代理设置
+        if self.proxies and "proxies" not in kwargs:
+            kwargs["proxies"] = self.proxies
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_http_clients: Dict[Optional[str], HttpClient] = {}
+_http_clients_lock = threading.Lock()
+
+
+def get_http_client(proxy_url: Optional[str] = None) -> HttpClient:
+    """获取共享 HTTP 客户端，每个代理地址对应一个连接池"""
+    with _http_clients_lock:
+        client = _http_clients.get(proxy_url)
+        if client is None:
+            client = HttpClient(
+                proxy_url,
+                CONFIG["HTTP_POOL_SIZE"],
+                CONFIG["CONNECT_TIMEOUT"],
+                CONFIG["READ_TIMEOUT"],
+            )
+            _http_clients[proxy_url] = client
+        return client
+
+
+def close_http_clients() -> None:
+    """关闭并丢弃所有共享 HTTP 客户端，下次获取时按当前配置重建"""
+    with _http_clients_lock:
+        for client in _http_clients.values():
+            client.close()
+        _http_clients.clear()
+
+
 def check_version_update(
     current_version: str, version_url: str, proxy_url: Optional[str] = None
 ) -> Tuple[bool, Optional[str]]:
     """检查版本更新"""
     try:
-        proxies = None
-        if proxy_url:
-            proxies = {"http": proxy_url, "https": proxy_url}
-
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             "Accept": "text/plain, */*",
             "Cache-Control": "no-cache",
         }
 
-        response = requests.get(
-            version_url, proxies=proxies, headers=headers, timeout=10
-        )
+        response = get_http_client(proxy_url).get(version_url, headers=headers)
         response.raise_for_status()
 
         remote_version = response.text.strip()
@@ -304,8 +454,11 @@ def check_version_update(
 def is_first_crawl_today() -> bool:
     """检测是否是当天第一次爬取"""
     date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+    manifest = read_snapshot_manifest(Path("output") / date_folder)
+    if manifest is not None:
+        return len(manifest) <= 1
 
+    txt_dir = Path("output") / date_folder / "txt"
     if not txt_dir.exists():
         return True
 
@@ -771,12 +924,685 @@ class PushRecordManager:
         return result
 
 
+# === 平台健康度 ===
+class PlatformHealthTracker:
+    """平台健康度跟踪：延迟/错误率统计、令牌桶限流和熔断，状态持久化到 output 目录"""
+
+    # 指数滑动平均系数
+    EWMA_ALPHA = 0.3
+
+    def __init__(self, state_file: Optional[Path] = None):
+        self.config = CONFIG["CIRCUIT_BREAKER"]
+        self.state_file = state_file or Path("output") / ".crawler_health.json"
+        self._lock = threading.Lock()
+        self.platforms: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        """读取上次运行保存的健康度状态"""
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                self.platforms = json.load(f).get("platforms", {})
+        except Exception as e:
+            print(f"读取平台健康度状态失败: {e}")
+            self.platforms = {}
+
+    def save(self) -> None:
+        """保存健康度状态（先写临时文件再替换，避免中途退出写坏文件）"""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(".tmp")
+            with self._lock:
+                data = {"platforms": self.platforms}
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"保存平台健康度状态失败: {e}")
+
+    def _get_state(self, platform_id: str) -> Dict:
+        if platform_id not in self.platforms:
+            self.platforms[platform_id] = {
+                "avg_latency": None,
+                "error_rate": 0.0,
+                "samples": 0,
+                "consecutive_failures": 0,
+                "circuit": "closed",
+                "opened_at": None,
+                "last_success": None,
+                "last_failure": None,
+                "tokens": float(self.config["BURST"]),
+                "tokens_updated": time.time(),
+            }
+        return self.platforms[platform_id]
+
+    def allow_request(self, platform_id: str) -> Tuple[bool, str]:
+        """熔断检查，返回 (是否允许请求, 熔断状态)"""
+        if not self.config["ENABLED"]:
+            return True, "closed"
+
+        with self._lock:
+            state = self._get_state(platform_id)
+            if state["circuit"] == "open":
+                opened_at = state.get("opened_at") or 0
+                if time.time() - opened_at < self.config["COOLDOWN"]:
+                    return False, "open"
+                # 冷却期结束，半开状态下放行一次试探请求
+                state["circuit"] = "half_open"
+            return True, state["circuit"]
+
+    def acquire_token(self, platform_id: str) -> bool:
+        """令牌桶限流：每次请求（包括重试）消耗一个令牌"""
+        if not self.config["ENABLED"]:
+            return True
+
+        with self._lock:
+            state = self._get_state(platform_id)
+            now = time.time()
+            elapsed = max(0.0, now - state.get("tokens_updated", now))
+            refill = elapsed * self.config["RATE_PER_MINUTE"] / 60
+            tokens = min(float(self.config["BURST"]), state.get("tokens", 0.0) + refill)
+            state["tokens_updated"] = now
+            if tokens < 1:
+                state["tokens"] = tokens
+                return False
+            state["tokens"] = tokens - 1
+            return True
+
+    def get_timeout(self, platform_id: str, default_timeout: float) -> float:
+        """根据历史延迟缩短响应较快平台的读取超时"""
+        if not self.config["ENABLED"]:
+            return default_timeout
+
+        with self._lock:
+            state = self.platforms.get(platform_id)
+            if not state or state["samples"] < 3 or state["avg_latency"] is None:
+                return default_timeout
+            if state["error_rate"] > 0.2:
+                return default_timeout
+            adaptive = state["avg_latency"] * 3 + 1
+        return max(self.config["MIN_TIMEOUT"], min(default_timeout, adaptive))
+
+    def record_attempt(
+        self, platform_id: str, success: bool, latency: Optional[float] = None
+    ) -> None:
+        """记录单次请求结果"""
+        alpha = self.EWMA_ALPHA
+        with self._lock:
+            state = self._get_state(platform_id)
+            state["samples"] += 1
+            state["error_rate"] = (1 - alpha) * state["error_rate"] + alpha * (
+                0.0 if success else 1.0
+            )
+            if success and latency is not None:
+                if state["avg_latency"] is None:
+                    state["avg_latency"] = latency
+                else:
+                    state["avg_latency"] = (1 - alpha) * state[
+                        "avg_latency"
+                    ] + alpha * latency
+
+    def record_result(self, platform_id: str, success: bool) -> None:
+        """记录一次抓取（含重试）的最终结果，更新熔断状态"""
+        now = time.time()
+        with self._lock:
+            state = self._get_state(platform_id)
+            if success:
+                state["consecutive_failures"] = 0
+                state["last_success"] = now
+                if state["circuit"] != "closed":
+                    print(f"平台 {platform_id} 已恢复，关闭熔断")
+                state["circuit"] = "closed"
+                state["opened_at"] = None
+                return
+
+            state["consecutive_failures"] += 1
+            state["last_failure"] = now
+            if not self.config["ENABLED"]:
+                return
+            if (
+                state["circuit"] == "half_open"
+                or state["consecutive_failures"] >= self.config["FAILURE_THRESHOLD"]
+            ):
+                state["circuit"] = "open"
+                state["opened_at"] = now
+                print(
+                    f"平台 {platform_id} 连续失败 {state['consecutive_failures']} 次，"
+                    f"熔断 {self.config['COOLDOWN']} 秒"
+                )
+
+
+# === 响应指纹 ===
+def compute_titles_fingerprint(title_data: Dict) -> str:
+    """按榜单顺序计算平台条目指纹（标题、排名和链接）"""
+    digest = hashlib.sha1()
+    for title, info in title_data.items():
+        ranks = ",".join(str(rank) for rank in info.get("ranks", []))
+        line = f"{title}\t{ranks}\t{info.get('url', '')}\t{info.get('mobileUrl', '')}\n"
+        digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    """当天各平台最近一次抓取的响应指纹，用于识别与上一批次完全相同的平台数据"""
+
+    def __init__(self, date_folder: Optional[str] = None):
+        date_folder = date_folder or format_date_folder()
+        self.state_file = Path("output") / date_folder / ".fingerprints.json"
+        self.platforms: Dict[str, Dict] = {}
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    self.platforms = json.load(f).get("platforms", {})
+            except Exception as e:
+                print(f"读取响应指纹失败: {e}")
+
+    def get(self, platform_id: str) -> Optional[str]:
+        return self.platforms.get(platform_id, {}).get("fingerprint")
+
+    def update(self, platform_id: str, fingerprint: str, time_info: str) -> None:
+        self.platforms[platform_id] = {"fingerprint": fingerprint, "time": time_info}
+
+    def save(self) -> None:
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"platforms": self.platforms}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"保存响应指纹失败: {e}")
+
+
+# === 数据源适配器 ===
+class TitleRecord:
+    """单条标题的紧凑记录，支持 get / [] 读取，与文件解析得到的标题字典用法一致
+
+    desc、hot、timestamp、extra 等可选字段只在非空时保存在 details 中；
+    记录在批次之间共享（解析缓存），调用方不应原地修改
+    """
+
+    __slots__ = ("ranks", "url", "mobileUrl", "details")
+
+    FIELDS = ("ranks", "url", "mobileUrl")
+    DETAIL_FIELDS = ("desc", "hot", "timestamp", "extra")
+
+    def __init__(
+        self,
+        ranks: List[int],
+        url: str = "",
+        mobile_url: str = "",
+        details: Optional[Dict] = None,
+    ):
+        self.ranks = ranks
+        self.url = url
+        self.mobileUrl = mobile_url
+        self.details = details
+
+    def get(self, key: str, default=None):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.details:
+            return self.details.get(key, default)
+        return default
+
+    def __getitem__(self, key: str):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.details and key in self.details:
+            return self.details[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS or bool(self.details and key in self.details)
+
+    def __repr__(self) -> str:
+        return (
+            f"TitleRecord(ranks={self.ranks!r}, url={self.url!r}, "
+            f"mobileUrl={self.mobileUrl!r}, details={self.details!r})"
+        )
+
+
+def extract_title_details(item: Dict) -> Optional[Dict]:
+    """提取可选字段（描述、热度、时间戳、额外信息），全部为空时返回 None"""
+    details = None
+    for field in TitleRecord.DETAIL_FIELDS:
+        value = item.get(field)
+        if value:
+            if details is None:
+                details = {}
+            details[field] = value
+    return details
+
+
+class SourceAdapter(ABC):
+    """数据源适配器基类：负责获取原始响应、校验状态和解析标题，并声明自身的并发限制
+
+    平台配置中的 source 字段选择适配器（默认 newsnow），
+    crawler.sources.<适配器名> 下的配置会作为 options 传入
+    """
+
+    # 适配器名称，对应平台配置中的 source 字段
+    name = ""
+    # 该类数据源同时进行的最大请求数，None 表示只受全局 max_concurrency 限制
+    default_max_concurrency: Optional[int] = None
+    # 对同一域名的最大并发，None 表示使用全局 per_host_concurrency
+    default_per_host_concurrency: Optional[int] = None
+    # 成功的响应是否写入抓取缓存（见 FetchCache）
+    cacheable = True
+
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+        "Connection": "keep-alive",
+        "Cache-Control": "no-cache",
+    }
+
+    def __init__(self, options: Optional[Dict] = None):
+        self.options = options or {}
+        self.max_concurrency = self.options.get(
+            "max_concurrency", self.default_max_concurrency
+        )
+        self.per_host_concurrency = self.options.get(
+            "per_host_concurrency", self.default_per_host_concurrency
+        )
+
+    @abstractmethod
+    def build_url(self, platform: Dict) -> str:
+        """平台的请求地址，缺少必要配置时抛出 ValueError"""
+
+    def fetch(
+        self, fetcher: "DataFetcher", platform: Dict, timeout: Tuple[float, float]
+    ) -> Tuple[bytes, Optional[float]]:
+        """获取原始响应，返回(响应内容, 首字节时间)"""
+        response = fetcher._hedged_request(
+            self.build_url(platform),
+            headers=self.headers,
+            timeout=timeout,
+            per_host_concurrency=self.per_host_concurrency,
+        )
+        # elapsed 为发出请求到解析完响应头的时间，即首字节时间
+        ttfb = response.elapsed.total_seconds()
+        response.raise_for_status()
+        return response.content, ttfb
+
+    @abstractmethod
+    def decode(
+        self, content: bytes, keep_details: bool = True
+    ) -> Tuple[str, Dict[str, TitleRecord]]:
+        """一次解码完成状态校验和标题解析，返回(状态描述, {title: TitleRecord})
+
+        异常状态抛出 ValueError；keep_details 为 False 时丢弃描述、热度等可选字段
+        """
+
+
+SOURCE_ADAPTERS: Dict[str, type] = {}
+
+
+def register_source_adapter(adapter_class: type) -> type:
+    """注册数据源适配器（可作为类装饰器使用）"""
+    SOURCE_ADAPTERS[adapter_class.name] = adapter_class
+    return adapter_class
+
+
+def create_source_adapter(
+    name: str, sources_config: Optional[Dict] = None
+) -> SourceAdapter:
+    """按名称创建适配器实例，sources_config 为 crawler.sources 配置"""
+    adapter_class = SOURCE_ADAPTERS.get(name)
+    if adapter_class is None:
+        raise ValueError(
+            f"未知的数据源类型: {name}，可用类型: {', '.join(SOURCE_ADAPTERS)}"
+        )
+    return adapter_class((sources_config or {}).get(name))
+
+
+@register_source_adapter
+class NewsNowAdapter(SourceAdapter):
+    """newsnow 聚合接口"""
+
+    name = "newsnow"
+    DEFAULT_URL = "https://newsnow.busiyi.world/api/s?id={id}&latest"
+
+    headers = {
+        **SourceAdapter.headers,
+        "Accept": "application/json, text/plain, */*",
+    }
+
+    def build_url(self, platform: Dict) -> str:
+        return self.options.get("url", self.DEFAULT_URL).format(id=platform["id"])
+
+    # 响应缺少 status 字段时的默认值
+    default_status = "未知"
+    status_names = {"success": "最新数据", "cache": "缓存数据"}
+
+    def decode(
+        self, content: bytes, keep_details: bool = True
+    ) -> Tuple[str, Dict[str, TitleRecord]]:
+        # 直接从字节解码，避免 response.text 的编码探测和重复 json.loads
+        data = json.loads(content)
+        status = data.get("status", self.default_status)
+        if status not in self.status_names:
+            raise ValueError(f"响应状态异常: {status}")
+
+        title_data = {}
+        for index, item in enumerate(data.get("items", []), 1):
+            title = item["title"]
+            record = title_data.get(title)
+            if record is not None:
+                record.ranks.append(index)
+                continue
+
+            title_data[title] = TitleRecord(
+                [index],
+                item.get("url", ""),
+                item.get("mobileUrl", ""),
+                extract_title_details(item) if keep_details else None,
+            )
+        return self.status_names[status], title_data
+
+
+@register_source_adapter
+class RssAdapter(SourceAdapter):
+    """通用 RSS 2.0 / RSS 1.0 / Atom 订阅源，平台配置中的 url 为订阅地址"""
+
+    name = "rss"
+    # 订阅源多为独立站点，默认对同一站点保守一些
+    default_per_host_concurrency = 2
+
+    headers = {
+        **SourceAdapter.headers,
+        "Accept": "application/rss+xml, application/atom+xml, application/xml, text/xml, */*",
+    }
+
+    def build_url(self, platform: Dict) -> str:
+        url = platform.get("url")
+        if not url:
+            raise ValueError(f"RSS 平台 {platform['id']} 未配置 url")
+        return url
+
+    @staticmethod
+    def _local_name(tag: str) -> str:
+        return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+    def _child_text(self, element, *names: str) -> str:
+        for child in element:
+            if self._local_name(child.tag) in names and child.text:
+                return child.text.strip()
+        return ""
+
+    def _entry_link(self, element) -> str:
+        fallback = ""
+        for child in element:
+            if self._local_name(child.tag) != "link":
+                continue
+            # RSS: <link>url</link>；Atom: <link rel="alternate" href="url"/>
+            if child.text and child.text.strip():
+                return child.text.strip()
+            href = child.get("href", "")
+            if href and child.get("rel", "alternate") == "alternate":
+                return href
+            fallback = fallback or href
+        return fallback
+
+    def decode(
+        self, content: bytes, keep_details: bool = True
+    ) -> Tuple[str, Dict[str, TitleRecord]]:
+        root = ElementTree.fromstring(content)
+        title_data = {}
+        index = 0
+        for element in root.iter():
+            if self._local_name(element.tag) not in ("item", "entry"):
+                continue
+            title = clean_title(self._child_text(element, "title"))
+            if not title:
+                continue
+
+            index += 1
+            record = title_data.get(title)
+            if record is not None:
+                record.ranks.append(index)
+                continue
+
+            details = None
+            if keep_details:
+                details = extract_title_details(
+                    {
+                        "desc": self._child_text(element, "description", "summary"),
+                        "timestamp": self._child_text(
+                            element, "pubDate", "published", "updated", "date"
+                        ),
+                    }
+                )
+            title_data[title] = TitleRecord(
+                [index], self._entry_link(element), "", details
+            )
+        return "最新数据", title_data
+
+
+@register_source_adapter
+class LocalJsonAdapter(NewsNowAdapter):
+    """本地 JSON 文件（与 newsnow 响应格式相同），用于离线调试和测试
+
+    平台配置中的 path 指定文件；未指定时读取 crawler.sources.file.directory 下的 <id>.json
+    """
+
+    name = "file"
+    default_max_concurrency = 4
+    # 读取本地文件本身就很快，不需要缓存
+    cacheable = False
+
+    def _resolve_path(self, platform: Dict) -> Path:
+        if platform.get("path"):
+            return Path(platform["path"])
+        directory = self.options.get("directory", "fixtures")
+        return Path(directory) / f"{platform['id']}.json"
+
+    def build_url(self, platform: Dict) -> str:
+        return self._resolve_path(platform).resolve().as_uri()
+
+    def fetch(
+        self, fetcher: "DataFetcher", platform: Dict, timeout: Tuple[float, float]
+    ) -> Tuple[bytes, Optional[float]]:
+        start_time = time.monotonic()
+        content = self._resolve_path(platform).read_bytes()
+        return content, time.monotonic() - start_time
+
+    # 本地文件可以省略 status 字段
+    default_status = "success"
+    status_names = {"success": "本地数据", "cache": "本地数据"}
+
+
+# === 抓取缓存 ===
+class FetchCache:
+    """抓取结果磁盘缓存：按平台和请求地址保存最近一次成功的原始响应
+
+    定时任务和 MCP trigger_crawl 共用 output/.fetch_cache：定时任务只写入（write_only），
+    每轮都请求上游；trigger_crawl 在有效期（ttl 秒）内直接复用缓存的响应，不再请求上游。
+    文件修改时间即抓取时间
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: float = CONFIG["FETCH_CACHE"]["TTL"],
+        write_only: bool = False,
+    ):
+        self.cache_dir = cache_dir or Path("output") / ".fetch_cache"
+        self.ttl = max(0.0, float(ttl or 0))
+        self.write_only = write_only
+
+    def _path(self, id_value: str, url: str) -> Path:
+        # 请求地址参与命名，切换数据源或接口地址后旧缓存自然失效
+        url_hash = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        safe_id = re.sub(r"[^\w.-]", "_", id_value)
+        return self.cache_dir / f"{safe_id}-{url_hash}.cache"
+
+    def get(self, id_value: str, url: str) -> Optional[Tuple[bytes, float]]:
+        """返回有效期内的(原始响应, 缓存时长秒)，没有、已过期或只写模式返回 None"""
+        if self.ttl <= 0 or self.write_only:
+            return None
+        path = self._path(id_value, url)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age > self.ttl or age < 0:
+                return None
+            return path.read_bytes(), age
+        except OSError:
+            return None
+
+    def put(self, id_value: str, url: str, content: bytes) -> None:
+        """原子写入缓存，失败只打印日志"""
+        if self.ttl <= 0:
+            return
+        path = self._path(id_value, url)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"写入抓取缓存失败 {id_value}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+
 # === 数据获取 ===
 class DataFetcher:
     """数据获取器"""
 
-    def __init__(self, proxy_url: Optional[str] = None):
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        max_concurrency: int = CONFIG["MAX_CONCURRENCY"],
+        per_host_concurrency: int = CONFIG["PER_HOST_CONCURRENCY"],
+        per_host_interval: int = CONFIG["PER_HOST_INTERVAL"],
+        hedge_after: float = CONFIG["HEDGE_AFTER"],
+        platforms: Optional[List[Dict]] = None,
+        sources_config: Optional[Dict] = None,
+        health_file: Optional[Path] = None,
+        track_fingerprints: bool = True,
+        keep_details: bool = True,
+        fetch_cache: Optional[FetchCache] = None,
+    ):
+        """platforms/sources_config 默认读取 CONFIG；track_fingerprints 为 False 时
+        不读写当天的响应指纹（临时抓取使用）；keep_details 为 False 时丢弃
+        描述、热度等只有全部新闻页面使用的可选字段；fetch_cache 为 None 时不使用抓取缓存"""
         self.proxy_url = proxy_url
+        self.http_client = get_http_client(proxy_url)
+        self.health = PlatformHealthTracker(health_file)
+        if platforms is None:
+            platforms = CONFIG["PLATFORMS"]
+        self.platforms = {platform["id"]: platform for platform in platforms}
+        self.sources_config = (
+            sources_config if sources_config is not None else CONFIG["SOURCES"]
+        )
+        self.track_fingerprints = track_fingerprints
+        self.keep_details = keep_details
+        self.fetch_cache = fetch_cache
+        self.force_refresh = False
+        self._adapters: Dict[str, SourceAdapter] = {}
+        self._adapter_semaphores: Dict[str, threading.Semaphore] = {}
+        self.max_concurrency = max(1, int(max_concurrency or 1))
+        self.per_host_concurrency = max(1, int(per_host_concurrency or 1))
+        self.per_host_interval = max(0, int(per_host_interval or 0))
+        self.hedge_after = max(0.0, float(hedge_after or 0))
+        self.deadline: Optional[float] = None
+        self.crawl_stats: Dict[str, Dict] = {}
+        self.unchanged_ids: List[str] = []
+        # 平台 -> (原始响应哈希, 状态描述, 解析结果)，响应字节完全相同时跳过解码（常驻进程中跨批次复用）
+        self._parsed_cache: Dict[str, Tuple[str, str, Dict[str, TitleRecord]]] = {}
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._host_lock = threading.Lock()
+        self._host_semaphores = {}
+        self._host_next_start = {}
+
+    def get_adapter(self, id_value: str) -> Tuple[Dict, SourceAdapter]:
+        """返回平台配置和对应的数据源适配器，未知的数据源类型抛出 ValueError"""
+        platform = self.platforms.get(id_value, {"id": id_value})
+        source = platform.get("source", "newsnow")
+        with self._host_lock:
+            if source not in self._adapters:
+                adapter = create_source_adapter(source, self.sources_config)
+                self._adapters[source] = adapter
+                if adapter.max_concurrency:
+                    self._adapter_semaphores[source] = threading.Semaphore(
+                        int(adapter.max_concurrency)
+                    )
+            return platform, self._adapters[source]
+
+    def _get_host_semaphore(
+        self, host: str, limit: Optional[int] = None
+    ) -> threading.Semaphore:
+        """获取主机级并发信号量，limit 为适配器声明的单主机并发（首次创建时生效）"""
+        with self._host_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.Semaphore(
+                    max(1, int(limit or self.per_host_concurrency))
+                )
+            return self._host_semaphores[host]
+
+    def _wait_host_interval(self, host: str) -> None:
+        """同一主机的请求之间保持最小启动间隔"""
+        if self.per_host_interval <= 0:
+            return
+
+        with self._host_lock:
+            now = time.monotonic()
+            start_at = max(now, self._host_next_start.get(host, now))
+            self._host_next_start[host] = start_at + self.per_host_interval / 1000
+
+        wait_time = start_at - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def _request(
+        self, url: str, per_host_concurrency: Optional[int] = None, **kwargs
+    ) -> requests.Response:
+        """按主机限流发送请求"""
+        host = urlparse(url).netloc
+        semaphore = self._get_host_semaphore(host, per_host_concurrency)
+        with semaphore:
+            self._wait_host_interval(host)
+            return self.http_client.get(url, **kwargs)
+
+    def remaining_time(self) -> Optional[float]:
+        """距抓取截止时间的剩余秒数，未设置截止时间时返回 None"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def _hedged_request(self, url: str, **kwargs) -> requests.Response:
+        """请求超过 hedge_after 秒未返回时发起一次重复请求，取先成功的结果"""
+        remaining = self.remaining_time()
+        if (
+            self.hedge_after <= 0
+            or self._hedge_executor is None
+            or (remaining is not None and remaining <= self.hedge_after)
+        ):
+            return self._request(url, **kwargs)
+
+        primary = self._hedge_executor.submit(self._request, url, **kwargs)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        print(f"请求 {url} 超过 {self.hedge_after} 秒未返回，发起对冲请求")
+        hedge = self._hedge_executor.submit(self._request, url, **kwargs)
+        pending = {primary, hedge}
+        last_error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+        raise last_error
 
     def fetch_data(
         self,
@@ -784,473 +1610,2998 @@ class DataFetcher:
         max_retries: int = 2,
         min_retry_wait: int = 3,
         max_retry_wait: int = 5,
-    ) -> Tuple[Optional[str], str, str]:
-        """获取指定ID数据，支持重试"""
+    ) -> Tuple[Optional[Dict[str, TitleRecord]], str, str]:
+        """通过平台对应的数据源适配器获取并解码数据，返回({title: TitleRecord}, id, 别名)，支持重试"""
         if isinstance(id_info, tuple):
             id_value, alias = id_info
         else:
             id_value = id_info
             alias = id_value
 
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
+        try:
+            platform, adapter = self.get_adapter(id_value)
+        except ValueError as e:
+            print(f"平台 {id_value} 配置错误: {e}")
+            return None, id_value, alias
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Connection": "keep-alive",
-            "Cache-Control": "no-cache",
-        }
+        cache_url = None
+        if self.fetch_cache is not None and adapter.cacheable:
+            try:
+                cache_url = adapter.build_url(platform)
+            except ValueError:
+                cache_url = None
+        if cache_url and not self.force_refresh and not self.fetch_cache.write_only:
+            title_data = self._load_from_cache(id_value, adapter, cache_url)
+            if title_data is not None:
+                return title_data, id_value, alias
+
+        allowed, circuit = self.health.allow_request(id_value)
+        if not allowed:
+            print(f"平台 {id_value} 处于熔断状态，跳过本次请求")
+            return None, id_value, alias
+        if circuit == "half_open":
+            # 半开状态只发一次试探请求，不重试
+            print(f"平台 {id_value} 熔断冷却结束，发送试探请求")
+            max_retries = 0
+
+        read_timeout = self.health.get_timeout(id_value, CONFIG["READ_TIMEOUT"])
+        stats = self.crawl_stats.setdefault(id_value, {"attempts": 0, "ttfb": None})
 
         retries = 0
         while retries <= max_retries:
-            try:
-                response = requests.get(
-                    url, proxies=proxies, headers=headers, timeout=10
-                )
-                response.raise_for_status()
+            remaining = self.remaining_time()
+            if remaining is not None and remaining <= 0:
+                print(f"请求 {id_value} 已超过抓取时限，放弃")
+                break
+            if not self.health.acquire_token(id_value):
+                print(f"请求 {id_value} 超出限流配额，放弃本次请求")
+                break
 
-                data_text = response.text
-                data_json = json.loads(data_text)
+            timeout = (CONFIG["CONNECT_TIMEOUT"], read_timeout)
+            if remaining is not None:
+                timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
 
-                status = data_json.get("status", "未知")
-                if status not in ["success", "cache"]:
-                    raise ValueError(f"响应状态异常: {status}")
+            stats["attempts"] += 1
+            start_time = time.monotonic()
+            try:
+                content, stats["ttfb"] = adapter.fetch(self, platform, timeout)
+                status_info, title_data = self._decode(id_value, adapter, content)
 
-                status_info = "最新数据" if status == "success" else "缓存数据"
+                self.health.record_attempt(
+                    id_value, True, time.monotonic() - start_time
+                )
+                self.health.record_result(id_value, True)
+                if cache_url:
+                    self.fetch_cache.put(id_value, cache_url, content)
                 print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
+                return title_data, id_value, alias
 
             except Exception as e:
+                self.health.record_attempt(id_value, False)
                 retries += 1
                 if retries <= max_retries:
                     base_wait = random.uniform(min_retry_wait, max_retry_wait)
                     additional_wait = (retries - 1) * random.uniform(1, 2)
                     wait_time = base_wait + additional_wait
+                    remaining = self.remaining_time()
+                    if remaining is not None and wait_time >= remaining:
+                        print(f"请求 {id_value} 失败: {e}. 剩余时间不足以重试")
+                        break
                     print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
                     time.sleep(wait_time)
                 else:
                     print(f"请求 {id_value} 失败: {e}")
-                    return None, id_value, alias
+
+        self.health.record_result(id_value, False)
         return None, id_value, alias
 
+    def _decode(
+        self, id_value: str, adapter: SourceAdapter, content: bytes
+    ) -> Tuple[str, Dict[str, TitleRecord]]:
+        """解码原始响应，响应字节与上次相同时直接复用解析结果"""
+        raw_hash = hashlib.sha1(content).hexdigest()
+        self.crawl_stats.setdefault(id_value, {})["raw_hash"] = raw_hash
+
+        cached = self._parsed_cache.get(id_value)
+        if cached and cached[0] == raw_hash:
+            _, status_info, title_data = cached
+        else:
+            status_info, title_data = adapter.decode(content, self.keep_details)
+            self._parsed_cache[id_value] = (raw_hash, status_info, title_data)
+        # 外层字典按批次新建，记录本身只读共享
+        return status_info, dict(title_data)
+
+    def _load_from_cache(
+        self, id_value: str, adapter: SourceAdapter, cache_url: str
+    ) -> Optional[Dict[str, TitleRecord]]:
+        """从抓取缓存读取有效期内的响应，不产生网络请求"""
+        cached = self.fetch_cache.get(id_value, cache_url)
+        if cached is None:
+            return None
+
+        content, age = cached
+        stats = self.crawl_stats.setdefault(id_value, {"attempts": 0, "ttfb": None})
+        try:
+            _, title_data = self._decode(id_value, adapter, content)
+        except Exception as e:
+            print(f"读取 {id_value} 抓取缓存失败: {e}")
+            return None
+
+        stats["cached"] = True
+        print(f"获取 {id_value} 成功（抓取缓存，{age:.0f} 秒前）")
+        return title_data
+
+    def parse_response(
+        self, id_value: str, response: Union[bytes, str]
+    ) -> Optional[Dict[str, TitleRecord]]:
+        """用平台对应的适配器解析响应为 {title: TitleRecord}，失败返回 None"""
+        try:
+            _, adapter = self.get_adapter(id_value)
+            if isinstance(response, str):
+                response = response.encode("utf-8")
+            return adapter.decode(response, self.keep_details)[1]
+        except (json.JSONDecodeError, ElementTree.ParseError):
+            print(f"解析 {id_value} 响应失败")
+        except Exception as e:
+            print(f"处理 {id_value} 数据出错: {e}")
+        return None
+
+    def _fetch_and_parse(
+        self, id_info: Union[str, Tuple[str, str]]
+    ) -> Tuple[str, Optional[Dict]]:
+        """获取并解析单个平台数据，受适配器声明的并发上限约束"""
+        id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+        try:
+            _, adapter = self.get_adapter(id_value)
+            semaphore = self._adapter_semaphores.get(adapter.name)
+        except ValueError:
+            semaphore = None
+
+        if semaphore is not None:
+            with semaphore:
+                title_data, id_value, _ = self.fetch_data(id_info)
+        else:
+            title_data, id_value, _ = self.fetch_data(id_info)
+        return id_value, title_data
+
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: int = CONFIG["REQUEST_INTERVAL"],
+        deadline: Optional[float] = None,
+        force_refresh: bool = False,
     ) -> Tuple[Dict, Dict, List]:
-        """爬取多个网站数据"""
+        """爬取多个网站数据，deadline 为抓取总时限（秒），超时未完成的平台记为失败；
+        force_refresh 为 True 时忽略抓取缓存，全部请求上游"""
         results = {}
         id_to_name = {}
         failed_ids = []
+        self.crawl_stats = {}
+        self.force_refresh = force_refresh
+        self.deadline = time.monotonic() + deadline if deadline else None
+        if self.hedge_after > 0:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency * 2, thread_name_prefix="hedge"
+            )
 
-        for i, id_info in enumerate(ids_list):
+        for id_info in ids_list:
             if isinstance(id_info, tuple):
                 id_value, name = id_info
             else:
                 id_value = id_info
                 name = id_value
-
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
 
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item["title"]
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-                        # 提取更多可用字段
-                        desc = item.get("desc", "")  # 描述
-                        hot = item.get("hot", "")  # 热度
-                        timestamp = item.get("timestamp", "")  # 时间戳
-                        extra = item.get("extra", {})  # 额外信息
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                                "desc": desc,
-                                "hot": hot,
-                                "timestamp": timestamp,
-                                "extra": extra,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
+        try:
+            if self.max_concurrency > 1 and len(ids_list) > 1:
+                outcomes = self._crawl_concurrently(ids_list)
+            else:
+                outcomes = self._crawl_sequentially(ids_list, request_interval)
+        finally:
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+                self._hedge_executor = None
+
+        for id_value, title_data in outcomes:
+            if title_data is not None:
+                results[id_value] = title_data
+                self.crawl_stats.setdefault(id_value, {})["status"] = "success"
             else:
                 failed_ids.append(id_value)
+                stats = self.crawl_stats.setdefault(id_value, {})
+                stats.setdefault("status", "failed")
+
+        self.health.save()
+        if self.track_fingerprints:
+            self._update_fingerprints(results)
+        else:
+            self.unchanged_ids = []
+        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        if self.unchanged_ids:
+            print(f"与上一批次相同: {self.unchanged_ids}")
+        return results, id_to_name, failed_ids
+
+    def _update_fingerprints(self, results: Dict) -> None:
+        """对比并更新当天的响应指纹，记录未变化的平台"""
+        self.unchanged_ids = []
+        store = FingerprintStore()
+        time_info = format_time_filename()
+        for id_value, title_data in results.items():
+            fingerprint = compute_titles_fingerprint(title_data)
+            if store.get(id_value) == fingerprint:
+                self.unchanged_ids.append(id_value)
+                self.crawl_stats.setdefault(id_value, {})["unchanged"] = True
+            store.update(id_value, fingerprint, time_info)
+        store.save()
+
+    def _crawl_sequentially(
+        self, ids_list: List[Union[str, Tuple[str, str]]], request_interval: int
+    ) -> List[Tuple[str, Optional[Dict]]]:
+        """逐个平台抓取，平台之间按 request_interval 间隔"""
+        outcomes = []
+        for i, id_info in enumerate(ids_list):
+            remaining = self.remaining_time()
+            if remaining is not None and remaining <= 0:
+                id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+                print(f"已超过抓取时限，跳过 {id_value}")
+                self.crawl_stats[id_value] = {"status": "timeout"}
+                outcomes.append((id_value, None))
+                continue
 
+            outcome = self._fetch_and_parse(id_info)
+            outcomes.append(outcome)
+
+            # 命中抓取缓存时没有发出请求，不需要间隔
+            if self.crawl_stats.get(outcome[0], {}).get("cached"):
+                continue
             if i < len(ids_list) - 1:
                 actual_interval = request_interval + random.randint(-10, 20)
                 actual_interval = max(50, actual_interval)
                 time.sleep(actual_interval / 1000)
+        return outcomes
 
-        print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
-        return results, id_to_name, failed_ids
+    def _crawl_concurrently(
+        self, ids_list: List[Union[str, Tuple[str, str]]]
+    ) -> List[Tuple[str, Optional[Dict]]]:
+        """并发抓取所有平台，结果保持配置中的平台顺序"""
+        max_workers = min(self.max_concurrency, len(ids_list))
+        print(
+            f"并发抓取 {len(ids_list)} 个平台，最大并发 {max_workers}，"
+            f"单主机并发 {self.per_host_concurrency}"
+        )
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="crawler"
+        )
+        futures = [
+            executor.submit(self._fetch_and_parse, id_info) for id_info in ids_list
+        ]
+        wait(futures, timeout=self.remaining_time())
+        # 截止时间到达后不再等待未完成的请求，报告生成不受慢平台拖累
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        outcomes = []
+        for id_info, future in zip(ids_list, futures):
+            id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+            if future.done() and not future.cancelled():
+                outcomes.append(future.result())
+            else:
+                print(f"平台 {id_value} 未在抓取时限内完成，记为失败")
+                self.crawl_stats.setdefault(id_value, {})["status"] = "timeout"
+                outcomes.append((id_value, None))
+        return outcomes
+
+    def print_crawl_summary(self) -> None:
+        """打印各平台首字节时间和抓取状态"""
+        if not self.crawl_stats:
+            return
 
+        status_names = {"success": "成功", "failed": "失败", "timeout": "超时"}
+        print("平台抓取耗时汇总（首字节时间）:")
+        for id_value, stats in self.crawl_stats.items():
+            ttfb = stats.get("ttfb")
+            ttfb_text = f"{ttfb * 1000:.0f}ms" if ttfb is not None else "-"
+            status = status_names.get(stats.get("status"), stats.get("status", "-"))
+            if stats.get("cached"):
+                status += "（抓取缓存）"
+            if stats.get("unchanged"):
+                status += "（未变化）"
+            print(
+                f"  {id_value}: {ttfb_text}，请求 {stats.get('attempts', 0)} 次，{status}"
+            )
 
-# === 数据处理 ===
-def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-    """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        for id_value, title_data in results.items():
-            # id | name 或 id
-            name = id_to_name.get(id_value)
-            if name and name != id_value:
-                f.write(f"{id_value} | {name}\n")
-            else:
-                f.write(f"{id_value}\n")
-
-            # 按排名排序标题
-            sorted_titles = []
-            for title, info in title_data.items():
-                cleaned_title = clean_title(title)
-                if isinstance(info, dict):
-                    ranks = info.get("ranks", [])
-                    url = info.get("url", "")
-                    mobile_url = info.get("mobileUrl", "")
-                else:
-                    ranks = info if isinstance(info, list) else []
-                    url = ""
-                    mobile_url = ""
+# === 列式快照存储 ===
+_COLUMNAR_MAGIC = b"TRC1"
+_COLUMNAR_BLOCK = struct.Struct("<cII")  # 块类型、长度、CRC32
+_COLUMNAR_TICK = struct.Struct("<IdHH")  # 批次时间(字符串编号)、时间戳、平台数、失败平台数
+_COLUMNAR_ROW_SIZE = 14  # 每条标题：标题编号 I + 排名 H + URL 编号 I + MOBILE 编号 I
 
-                rank = ranks[0] if ranks else 1
-                sorted_titles.append((rank, cleaned_title, url, mobile_url))
 
-            sorted_titles.sort(key=lambda x: x[0])
+def _pack_array(typecode: str, values) -> bytes:
+    """按小端序打包整数列"""
+    data = array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
 
-            for rank, cleaned_title, url, mobile_url in sorted_titles:
-                line = f"{rank}. {cleaned_title}"
 
-                if url:
-                    line += f" [URL:{url}]"
-                if mobile_url:
-                    line += f" [MOBILE:{mobile_url}]"
-                f.write(line + "\n")
+def _unpack_array(typecode: str, buffer, offset: int, count: int) -> Tuple[array, int]:
+    """从 offset 读取 count 个小端序整数，返回(整数列, 结束位置)"""
+    data = array(typecode)
+    end = offset + count * data.itemsize
+    data.frombytes(buffer[offset:end])
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data, end
 
-            f.write("\n")
 
-        if failed_ids:
-            f.write("==== 以下ID请求失败 ====\n")
-            for id_value in failed_ids:
-                f.write(f"{id_value}\n")
+def snapshot_timestamp(date_folder: str, time_info: str) -> Optional[float]:
+    """由日期目录名和批次时间（如 2025年11月17日 / 08时30分）还原北京时间时间戳"""
+    try:
+        moment = datetime.strptime(f"{date_folder} {time_info}", "%Y年%m月%d日 %H时%M分")
+    except ValueError:
+        return None
+    return pytz.timezone("Asia/Shanghai").localize(moment).timestamp()
 
-    return file_path
 
+def normalize_snapshot(results: Dict, id_to_name: Dict) -> Tuple[Dict, Dict]:
+    """把抓取结果整理成与 txt 快照读回后相同的结构 (titles_by_id, id_to_name)
 
-def load_frequency_words(
-    frequency_file: Optional[str] = None,
-) -> Tuple[List[Dict], List[str]]:
-    """加载频率词配置"""
-    if frequency_file is None:
-        frequency_file = os.environ.get(
-            "FREQUENCY_WORDS_PATH", "config/frequency_words.txt"
-        )
+    与 save_titles_to_file + parse_file_titles 一致：标题经过清理，只保留首个排名，
+    按排名排序，清理后重名的标题以排名靠后的一条为准，没有标题的平台不保留
+    """
+    titles_by_id = {}
+    names = {}
+    for id_value, title_data in results.items():
+        rows = []
+        for title, info in title_data.items():
+            if isinstance(info, list):
+                ranks, url, mobile_url = info, "", ""
+            else:
+                ranks = info.get("ranks", [])
+                url = info.get("url", "")
+                mobile_url = info.get("mobileUrl", "")
+            rows.append((ranks[0] if ranks else 1, clean_title(title), url, mobile_url))
+        rows.sort(key=lambda x: x[0])
+
+        titles = {}
+        for rank, title, url, mobile_url in rows:
+            titles[title] = {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+        if titles:
+            titles_by_id[id_value] = titles
+            names[id_value] = id_to_name.get(id_value) or id_value
+    return titles_by_id, names
+
+
+class ColumnarDayStore:
+    """追加写入的列式快照库文件：按平台分区后每个平台一个文件（见 PartitionedDayStore），
+    早期版本为整天一个 output/<日期>/snapshots.col
+
+    文件头之后是若干带长度和 CRC32 的块，只追加不改写：
+      S 块：新增的字符串（标题、链接、平台名、批次时间共用一个字典，编号按出现顺序递增）；
+            Z 块为 zlib 压缩后的 S 块，新写入的字符串都用 Z 块
+      P 块：新增的平台（平台 ID 和名称的字符串编号）
+      T 块：完整批次（关键帧），依次为批次信息、平台目录（平台编号、条数）、失败平台，
+            之后按平台存放 标题编号/排名/URL 编号/MOBILE 编号 四列
+      D 块：增量批次，相对上一批次记录每个平台的变化：平台目录之后按平台存放
+            行段（沿用上一批次的连续若干行，或依次取本批次新上榜的条目）、
+            排名（与行号一致时省略）和新上榜条目的 标题/URL/MOBILE 编号，未被引用的行即为下榜
+    每 KEYFRAME_INTERVAL 个批次写一个关键帧，读取任一批次最多回溯到上一个关键帧；
+    按平台目录可直接定位某个平台的数据，不必解码其他平台；
+    写入中断留下的残缺块读取时忽略，下次写入前截掉
+    """
 
-    frequency_path = Path(frequency_file)
+    FILE_NAME = "snapshots.col"
+    KEYFRAME_INTERVAL = 12
+    # 行段起点为该值时表示取新上榜的条目
+    NEW_ROWS = 0xFFFFFFFF
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.load()
+
+    @classmethod
+    def for_date(
+        cls, date_folder: Optional[str] = None, output_dir: str = "output"
+    ) -> "ColumnarDayStore":
+        return cls(Path(output_dir) / (date_folder or format_date_folder()) / cls.FILE_NAME)
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> None:
+        """读取文件，重建字符串字典、平台表和批次目录"""
+        self.strings: List[str] = []
+        self.string_ids: Dict[str, int] = {}
+        self.platforms: List[Tuple[str, str]] = []
+        self.platform_ids: Dict[Tuple[str, str], int] = {}
+        # (批次时间, 时间戳, 块内容偏移, 块内容长度, 块类型)
+        self.ticks: List[Tuple[str, float, int, int, bytes]] = []
+        self._tick_cache: Dict[Tuple[int, Optional[frozenset]], Tuple[Dict, Dict, List[str]]] = {}
+        # 批次序号 -> 平台目录；(批次序号, 平台编号) -> 四列编号
+        self._directory_cache: Dict[int, Tuple[Dict[int, Tuple], List[int]]] = {}
+        self._rows_cache: Dict[Tuple[int, int], Tuple[List[int], ...]] = {}
+        self._signature = self._file_signature()
+
+        try:
+            buffer = self.path.read_bytes()
+        except FileNotFoundError:
+            buffer = b""
+        if not buffer.startswith(_COLUMNAR_MAGIC):
+            if buffer:
+                print(f"列式快照库格式不正确，将重新写入: {self.path}")
+            self._buffer = b""
+            self._valid_end = 0
+            return
+
+        self._buffer = buffer
+        view = memoryview(buffer)
+        offset = len(_COLUMNAR_MAGIC)
+        while offset + _COLUMNAR_BLOCK.size <= len(buffer):
+            kind, length, checksum = _COLUMNAR_BLOCK.unpack_from(buffer, offset)
+            start = offset + _COLUMNAR_BLOCK.size
+            end = start + length
+            if end > len(buffer) or zlib.crc32(view[start:end]) != checksum:
+                print(f"列式快照库末尾存在不完整的数据块，已忽略: {self.path}")
+                break
+            self._apply_block(kind, view[start:end], start)
+            offset = end
+        self._valid_end = offset
+
+    def _apply_block(self, kind: bytes, payload: memoryview, start: int) -> None:
+        if kind == b"Z":
+            kind, payload = b"S", memoryview(zlib.decompress(payload))
+        if kind == b"S":
+            (count,) = struct.unpack_from("<I", payload, 0)
+            lengths, offset = _unpack_array("I", payload, 4, count)
+            for length in lengths:
+                text = str(payload[offset:offset + length], "utf-8")
+                self.string_ids[text] = len(self.strings)
+                self.strings.append(text)
+                offset += length
+        elif kind == b"P":
+            pairs, _ = _unpack_array("I", payload, 0, len(payload) // 4)
+            for index in range(0, len(pairs), 2):
+                key = (self.strings[pairs[index]], self.strings[pairs[index + 1]])
+                self.platform_ids[key] = len(self.platforms)
+                self.platforms.append(key)
+        elif kind in (b"T", b"D"):
+            time_id, timestamp, _, _ = _COLUMNAR_TICK.unpack_from(payload, 0)
+            self.ticks.append((self.strings[time_id], timestamp, start, len(payload), kind))
+
+    def tick_index(self) -> Dict[str, int]:
+        """批次时间 -> 批次序号，同一分钟写入多次时以最后一次为准"""
+        return {tick[0]: index for index, tick in enumerate(self.ticks)}
+
+    def _tick_directory(self, index: int) -> Tuple[Dict[int, Tuple], List[int]]:
+        """解析批次的平台目录，返回 ({平台编号: 该平台数据的位置信息}, 失败平台字符串编号)"""
+        cached = self._directory_cache.get(index)
+        if cached is not None:
+            return cached
+
+        _, _, start, length, kind = self.ticks[index]
+        payload = memoryview(self._buffer)[start:start + length]
+        _, _, platform_count, failed_count = _COLUMNAR_TICK.unpack_from(payload, 0)
+        offset = _COLUMNAR_TICK.size
+        platform_indexes, offset = _unpack_array("H", payload, offset, platform_count)
+        directory = {}
+        if kind == b"T":
+            row_counts, offset = _unpack_array("I", payload, offset, platform_count)
+            failed, offset = _unpack_array("I", payload, offset, failed_count)
+            for platform_index, rows in zip(platform_indexes, row_counts):
+                directory[platform_index] = (offset, rows)
+                offset += rows * _COLUMNAR_ROW_SIZE
+        else:
+            flags, offset = _unpack_array("H", payload, offset, platform_count)
+            row_counts, offset = _unpack_array("I", payload, offset, platform_count)
+            run_counts, offset = _unpack_array("I", payload, offset, platform_count)
+            entry_counts, offset = _unpack_array("I", payload, offset, platform_count)
+            failed, offset = _unpack_array("I", payload, offset, failed_count)
+            for platform_index, flag, rows, runs, entries in zip(
+                platform_indexes, flags, row_counts, run_counts, entry_counts
+            ):
+                directory[platform_index] = (offset, rows, flag, runs, entries)
+                offset += runs * 8 + (rows * 2 if flag else 0) + entries * 12
+
+        result = (directory, list(failed))
+        self._directory_cache[index] = result
+        return result
+
+    def _platform_rows(self, index: int, platform_index: int) -> Optional[Tuple[List[int], ...]]:
+        """某批次某平台的 (标题编号, 排名, URL 编号, MOBILE 编号) 四列，增量批次沿上一批次还原"""
+        key = (index, platform_index)
+        cached = self._rows_cache.get(key)
+        if cached is not None:
+            return cached
+
+        directory, _ = self._tick_directory(index)
+        entry = directory.get(platform_index)
+        if entry is None:
+            return None
+
+        _, _, start, _, kind = self.ticks[index]
+        payload = memoryview(self._buffer)[start:start + self.ticks[index][3]]
+        if kind == b"T":
+            offset, rows = entry
+            title_ids, offset = _unpack_array("I", payload, offset, rows)
+            ranks, offset = _unpack_array("H", payload, offset, rows)
+            url_ids, offset = _unpack_array("I", payload, offset, rows)
+            mobile_ids, _ = _unpack_array("I", payload, offset, rows)
+            result = (title_ids.tolist(), ranks.tolist(), url_ids.tolist(), mobile_ids.tolist())
+        else:
+            offset, rows, flag, run_count, entry_count = entry
+            runs, offset = _unpack_array("I", payload, offset, run_count * 2)
+            if flag:
+                ranks, offset = _unpack_array("H", payload, offset, rows)
+                ranks = ranks.tolist()
+            else:
+                ranks = list(range(1, rows + 1))
+            new_titles, offset = _unpack_array("I", payload, offset, entry_count)
+            new_urls, offset = _unpack_array("I", payload, offset, entry_count)
+            new_mobiles, _ = _unpack_array("I", payload, offset, entry_count)
+
+            base = None
+            title_ids, url_ids, mobile_ids = [], [], []
+            position = 0
+            for run_start, run_length in zip(runs[::2], runs[1::2]):
+                if run_start == self.NEW_ROWS:
+                    end = position + run_length
+                    title_ids.extend(new_titles[position:end])
+                    url_ids.extend(new_urls[position:end])
+                    mobile_ids.extend(new_mobiles[position:end])
+                    position = end
+                else:
+                    if base is None:
+                        base = self._platform_rows(index - 1, platform_index)
+                    end = run_start + run_length
+                    title_ids.extend(base[0][run_start:end])
+                    url_ids.extend(base[2][run_start:end])
+                    mobile_ids.extend(base[3][run_start:end])
+            result = (title_ids, ranks, url_ids, mobile_ids)
+
+        self._rows_cache[key] = result
+        return result
+
+    def read_tick(
+        self, index: int, platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, List[str]]:
+        """读取一个批次，返回(titles_by_id, id_to_name, failed_ids)
+
+        platform_ids 不为 None 时只还原这些平台；结果会被缓存共享，调用方不应原地修改
+        """
+        wanted = frozenset(platform_ids) if platform_ids is not None else None
+        cached = self._tick_cache.get((index, wanted))
+        if cached is not None:
+            return cached
+
+        directory, failed = self._tick_directory(index)
+        strings = self.strings
+        titles_by_id = {}
+        id_to_name = {}
+        for platform_index in directory:
+            source_id, name = self.platforms[platform_index]
+            if wanted is None or source_id in wanted:
+                title_ids, ranks, url_ids, mobile_ids = self._platform_rows(index, platform_index)
+                titles_by_id[source_id] = {
+                    strings[title_id]: {
+                        "ranks": [rank],
+                        "url": strings[url_id],
+                        "mobileUrl": strings[mobile_id],
+                    }
+                    for title_id, rank, url_id, mobile_id in zip(
+                        title_ids, ranks, url_ids, mobile_ids
+                    )
+                }
+                id_to_name[source_id] = name
+
+        result = (titles_by_id, id_to_name, [strings[item] for item in failed])
+        self._tick_cache[(index, wanted)] = result
+        return result
+
+    def read_snapshot(
+        self, index: int, platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict]:
+        """读取一个批次的 (titles_by_id, id_to_name)，与 parse_file_titles 的返回值相同"""
+        titles_by_id, id_to_name, _ = self.read_tick(index, platform_ids)
+        return titles_by_id, id_to_name
+
+    def _is_keyframe_due(self) -> bool:
+        """距上一个关键帧已满 KEYFRAME_INTERVAL 个批次（或还没有批次）时写关键帧"""
+        for distance, tick in enumerate(reversed(self.ticks), 1):
+            if tick[4] == b"T":
+                return distance >= self.KEYFRAME_INTERVAL
+        return True
+
+    def _encode_delta(
+        self, rows: Tuple[List[int], ...], base: Optional[Tuple[List[int], ...]]
+    ) -> Tuple[int, int, int, bytes]:
+        """把一个平台的四列编码为相对上一批次的增量，返回 (排名标志, 行段数, 新条目数, 数据)"""
+        title_ids, ranks, url_ids, mobile_ids = rows
+        base_positions = {}
+        if base is not None:
+            for position, row in enumerate(zip(base[0], base[2], base[3])):
+                base_positions.setdefault(row, position)
+
+        runs: List[List[int]] = []
+        new_rows = ([], [], [])
+        for row in zip(title_ids, url_ids, mobile_ids):
+            position = base_positions.get(row, self.NEW_ROWS)
+            if position == self.NEW_ROWS:
+                for column, value in zip(new_rows, row):
+                    column.append(value)
+                if runs and runs[-1][0] == self.NEW_ROWS:
+                    runs[-1][1] += 1
+                else:
+                    runs.append([self.NEW_ROWS, 1])
+            elif runs and runs[-1][0] != self.NEW_ROWS and runs[-1][0] + runs[-1][1] == position:
+                runs[-1][1] += 1
+            else:
+                runs.append([position, 1])
+
+        explicit_ranks = ranks != list(range(1, len(ranks) + 1))
+        data = _pack_array("I", [value for run in runs for value in run])
+        if explicit_ranks:
+            data += _pack_array("H", ranks)
+        data += b"".join(_pack_array("I", column) for column in new_rows)
+        return int(explicit_ranks), len(runs), len(new_rows[0]), data
+
+    def append_tick(
+        self,
+        time_info: str,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        failed_ids: Optional[List] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """追加一个批次，titles_by_id 应为 normalize_snapshot 整理后的结构"""
+        if self._file_signature() != self._signature:
+            self.load()
+
+        new_strings: List[str] = []
+
+        def intern(text: str) -> int:
+            string_id = self.string_ids.get(text)
+            if string_id is None:
+                string_id = len(self.strings)
+                self.strings.append(text)
+                self.string_ids[text] = string_id
+                new_strings.append(text)
+            return string_id
+
+        new_platforms: List[int] = []
+        platform_rows: Dict[int, Tuple[List[int], ...]] = {}
+        for source_id, titles in titles_by_id.items():
+            if not titles:
+                continue
+            key = (source_id, id_to_name.get(source_id) or source_id)
+            platform_index = self.platform_ids.get(key)
+            if platform_index is None:
+                platform_index = len(self.platforms)
+                self.platforms.append(key)
+                self.platform_ids[key] = platform_index
+                new_platforms.extend((intern(key[0]), intern(key[1])))
+
+            title_ids, ranks, url_ids, mobile_ids = [], [], [], []
+            for title, info in titles.items():
+                rank_list = info.get("ranks") or [1]
+                title_ids.append(intern(title))
+                ranks.append(min(max(int(rank_list[0]), 0), 0xFFFF))
+                url_ids.append(intern(info.get("url") or ""))
+                mobile_ids.append(intern(info.get("mobileUrl") or ""))
+            platform_rows[platform_index] = (title_ids, ranks, url_ids, mobile_ids)
+
+        failed_string_ids = [intern(str(item)) for item in failed_ids or []]
+        time_id = intern(time_info)
+        if timestamp is None:
+            timestamp = time.time()
+
+        platform_indexes = list(platform_rows)
+        tick_header = _COLUMNAR_TICK.pack(
+            time_id, timestamp, len(platform_indexes), len(failed_string_ids)
+        )
+        if self._is_keyframe_due():
+            kind = b"T"
+            tick_payload = b"".join(
+                [
+                    tick_header,
+                    _pack_array("H", platform_indexes),
+                    _pack_array("I", [len(rows[0]) for rows in platform_rows.values()]),
+                    _pack_array("I", failed_string_ids),
+                ]
+                + [
+                    _pack_array(typecode, column)
+                    for rows in platform_rows.values()
+                    for typecode, column in zip("IHII", rows)
+                ]
+            )
+        else:
+            kind = b"D"
+            previous = len(self.ticks) - 1
+            encoded = [
+                self._encode_delta(rows, self._platform_rows(previous, platform_index))
+                for platform_index, rows in platform_rows.items()
+            ]
+            tick_payload = b"".join(
+                [
+                    tick_header,
+                    _pack_array("H", platform_indexes),
+                    _pack_array("H", [item[0] for item in encoded]),
+                    _pack_array("I", [len(rows[0]) for rows in platform_rows.values()]),
+                    _pack_array("I", [item[1] for item in encoded]),
+                    _pack_array("I", [item[2] for item in encoded]),
+                    _pack_array("I", failed_string_ids),
+                ]
+                + [item[3] for item in encoded]
+            )
+
+        blocks = []
+        if new_strings:
+            encoded_strings = [text.encode("utf-8") for text in new_strings]
+            blocks.append(
+                (
+                    b"Z",
+                    zlib.compress(
+                        struct.pack("<I", len(encoded_strings))
+                        + _pack_array("I", [len(item) for item in encoded_strings])
+                        + b"".join(encoded_strings)
+                    ),
+                )
+            )
+        if new_platforms:
+            blocks.append((b"P", _pack_array("I", new_platforms)))
+        blocks.append((kind, tick_payload))
+
+        try:
+            self._write_blocks(blocks, time_info, timestamp)
+        except Exception:
+            # 内存中的字典已经更新，写入失败时按文件实际内容恢复
+            self.load()
+            raise
+
+        # 下一批次以本批次为基准编码增量，直接缓存本批次的各列，不必再解码
+        index = len(self.ticks) - 1
+        for platform_index, rows in platform_rows.items():
+            self._rows_cache[(index, platform_index)] = rows
+
+    def _write_blocks(
+        self, blocks: List[Tuple[bytes, bytes]], time_info: str, timestamp: float
+    ) -> None:
+        data = bytearray()
+        base = self._valid_end or len(_COLUMNAR_MAGIC)
+        tick_start = None
+        for kind, payload in blocks:
+            data += _COLUMNAR_BLOCK.pack(kind, len(payload), zlib.crc32(payload))
+            if kind in (b"T", b"D"):
+                tick_start = base + len(data)
+            data += payload
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "r+b" if self.path.exists() else "w+b") as f:
+            if not self._valid_end:
+                f.seek(0)
+                f.write(_COLUMNAR_MAGIC)
+            f.seek(base)
+            f.truncate()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._buffer = (self._buffer[:base] or _COLUMNAR_MAGIC) + bytes(data)
+        self._valid_end = len(self._buffer)
+        kind, payload = blocks[-1]
+        self.ticks.append((time_info, timestamp, tick_start, len(payload), kind))
+        self._signature = self._file_signature()
+
+
+# 列式快照库路径 -> ((mtime_ns, size), 快照库)，只保留最近读取的一天
+_columnar_store_cache: Dict[str, Tuple[Tuple[int, int], ColumnarDayStore]] = {}
+
+
+def get_columnar_store(
+    date_folder: Optional[str] = None, output_dir: str = "output"
+) -> Optional[ColumnarDayStore]:
+    """读取某天早期版本写入的整天列式快照库（snapshots.col），文件不存在时返回 None；
+    文件未变化时复用已加载的对象"""
+    path = Path(output_dir) / (date_folder or format_date_folder()) / ColumnarDayStore.FILE_NAME
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _columnar_store_cache.get(str(path))
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    store = ColumnarDayStore(path)
+    _columnar_store_cache.clear()
+    _columnar_store_cache[str(path)] = (signature, store)
+    return store
+
+
+class PartitionedDayStore:
+    """按平台分区的列式快照库（output/<日期>/snapshots/<平台ID>.col）
+
+    每个平台一个 ColumnarDayStore 文件，只保存该平台有标题的批次；失败平台只记录在快照清单中。
+    某批次包含哪些平台取自快照清单（见 write_snapshot），按平台过滤读取时只打开请求平台的分区，
+    其他平台的文件不会被读取；跨平台读取按清单中的平台顺序合并同一批次的各分区
+    """
+
+    DIR_NAME = "snapshots"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._partitions: Dict[str, ColumnarDayStore] = {}
+        # 平台 ID -> (已建索引的批次数, {批次时间: 批次序号})
+        self._tick_positions: Dict[str, Tuple[int, Dict[str, int]]] = {}
+
+    @classmethod
+    def for_date(
+        cls, date_folder: Optional[str] = None, output_dir: str = "output"
+    ) -> "PartitionedDayStore":
+        return cls(Path(output_dir) / (date_folder or format_date_folder()) / cls.DIR_NAME)
+
+    def partition_path(self, source_id: str) -> Path:
+        # 平台 ID 中的路径分隔符等字符转义后作为文件名
+        return self.path / f"{quote(source_id, safe='-_.')}.col"
+
+    def partition(self, source_id: str) -> Optional[ColumnarDayStore]:
+        """打开某平台的分区，文件不存在时返回 None；文件被其他进程改写后重新加载"""
+        store = self._partitions.get(source_id)
+        if store is None:
+            path = self.partition_path(source_id)
+            if not path.exists():
+                return None
+            store = self._partitions[source_id] = ColumnarDayStore(path)
+        elif store._file_signature() != store._signature:
+            store.load()
+        return store
+
+    def tick_position(self, source_id: str, time_info: str) -> Optional[int]:
+        """某平台分区中某批次的序号，分区不存在或没有该批次时返回 None"""
+        store = self.partition(source_id)
+        if store is None:
+            return None
+        indexed, positions = self._tick_positions.get(source_id, (0, {}))
+        if indexed != len(store.ticks):
+            positions = store.tick_index()
+            self._tick_positions[source_id] = (len(store.ticks), positions)
+        return positions.get(time_info)
+
+    def append_tick(
+        self,
+        time_info: str,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """把一个批次按平台拆分追加到各分区，titles_by_id 应为 normalize_snapshot 整理后的结构"""
+        if timestamp is None:
+            timestamp = time.time()
+        for source_id, titles in titles_by_id.items():
+            if not titles:
+                continue
+            store = self.partition(source_id)
+            if store is None:
+                store = self._partitions[source_id] = ColumnarDayStore(
+                    self.partition_path(source_id)
+                )
+            store.append_tick(
+                time_info,
+                {source_id: titles},
+                {source_id: id_to_name.get(source_id) or source_id},
+                [],
+                timestamp,
+            )
+
+    def read_snapshot(
+        self,
+        time_info: str,
+        source_ids: List[str],
+        platform_ids: Optional[List[str]] = None,
+    ) -> Optional[Tuple[Dict, Dict]]:
+        """读取一个批次的 (titles_by_id, id_to_name)
+
+        source_ids 为该批次包含的平台（快照清单中的顺序），只打开其中被请求的平台的分区；
+        有分区缺少该批次（如写入分区前进程被终止）时返回 None，由调用方改读 txt
+        """
+        titles_by_id = {}
+        id_to_name = {}
+        for source_id in source_ids:
+            if platform_ids is not None and source_id not in platform_ids:
+                continue
+            index = self.tick_position(source_id, time_info)
+            if index is None:
+                return None
+            titles, names = self._partitions[source_id].read_snapshot(index)
+            titles_by_id.update(titles)
+            id_to_name.update(names)
+        return titles_by_id, id_to_name
+
+
+# 分区目录路径 -> 分区快照库，只保留最近读取的一天
+_partitioned_store_cache: Dict[str, PartitionedDayStore] = {}
+
+
+def get_partitioned_store(
+    date_folder: Optional[str] = None, output_dir: str = "output"
+) -> PartitionedDayStore:
+    """获取某天的分区快照库，已打开的分区在文件未变化时复用"""
+    path = Path(output_dir) / (date_folder or format_date_folder()) / PartitionedDayStore.DIR_NAME
+    store = _partitioned_store_cache.get(str(path))
+    if store is None:
+        store = PartitionedDayStore(path)
+        _partitioned_store_cache.clear()
+        _partitioned_store_cache[str(path)] = store
+    return store
+
+
+def append_snapshot_to_store(
+    date_folder: str, time_info: str, titles_by_id: Dict, id_to_name: Dict
+) -> None:
+    """把一个批次追加到某天的分区快照库，titles_by_id 应为 normalize_snapshot 整理后的结构"""
+    get_partitioned_store(date_folder).append_tick(time_info, titles_by_id, id_to_name)
+
+
+def read_failed_ids(file_path: Path) -> List[str]:
+    """读取 txt 快照末尾的请求失败平台列表"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return parse_failed_ids(f.read())
+
+
+def parse_failed_ids(content: str) -> List[str]:
+    """解析 txt 快照内容末尾的请求失败平台列表"""
+    marker = "==== 以下ID请求失败 ===="
+    if marker not in content:
+        return []
+    return [line.strip() for line in content.split(marker, 1)[1].split("\n") if line.strip()]
+
+
+def _day_snapshot_sources(day_dir: Path) -> Dict[str, Callable[[], Tuple[Dict, Dict, List]]]:
+    """某天已有的批次：批次时间 -> 返回 (titles_by_id, id_to_name, failed_ids) 的读取函数
+
+    目录中的 txt 优先于压缩归档，都没有时读取早期版本的整天快照库 snapshots.col
+    """
+
+    def read_text(read_content: Callable[[], str]) -> Tuple[Dict, Dict, List]:
+        content = read_content()
+        titles_by_id, id_to_name = parse_snapshot_text(content)
+        return titles_by_id, id_to_name, parse_failed_ids(content)
+
+    sources = {}
+    legacy_path = day_dir / ColumnarDayStore.FILE_NAME
+    if legacy_path.exists():
+        legacy = ColumnarDayStore(legacy_path)
+        for time_info, index in legacy.tick_index().items():
+            sources[time_info] = partial(legacy.read_tick, index)
+    for stem, info in list_archived_snapshots(day_dir).items():
+        sources[stem] = partial(read_text, partial(read_archived_text, day_dir, info.filename))
+    txt_dir = day_dir / "txt"
+    if txt_dir.is_dir():
+        for file_path in txt_dir.iterdir():
+            if file_path.suffix == ".txt":
+                sources[file_path.stem] = partial(
+                    read_text, partial(file_path.read_text, encoding="utf-8")
+                )
+    return sources
+
+
+def convert_txt_history(output_dir: str = "output", overwrite: bool = False) -> int:
+    """把 output 中各天已有的快照转换为按平台分区的列式快照库，返回转换的天数
+
+    已有分区快照库的日期默认跳过，overwrite 为 True 时重新生成；txt 文件保持不变，
+    早期版本的整天快照库 snapshots.col 转换后删除。缺少快照清单的日期同时生成清单
+    """
+    converted = 0
+    for day_dir in sorted(Path(output_dir).iterdir()):
+        if not day_dir.is_dir():
+            continue
+        if ensure_snapshot_manifest(day_dir):
+            print(f"{day_dir.name}: 已生成快照清单")
+        partitions_dir = day_dir / PartitionedDayStore.DIR_NAME
+        legacy_path = day_dir / ColumnarDayStore.FILE_NAME
+        if partitions_dir.exists() and not legacy_path.exists() and not overwrite:
+            continue
+        sources = _day_snapshot_sources(day_dir)
+        if not sources:
+            continue
+
+        # 先写临时目录，完成后替换，转换中断不会留下不完整的分区
+        tmp_dir = day_dir / f"{PartitionedDayStore.DIR_NAME}.tmp"
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        store = PartitionedDayStore(tmp_dir)
+        for time_info in sorted(sources):
+            titles_by_id, id_to_name, _ = sources[time_info]()
+            timestamp = snapshot_timestamp(day_dir.name, time_info)
+            store.append_tick(
+                time_info,
+                titles_by_id,
+                id_to_name,
+                timestamp if timestamp is not None else time.time(),
+            )
+        tmp_dir.mkdir(exist_ok=True)
+        if partitions_dir.exists():
+            shutil.rmtree(partitions_dir)
+        os.replace(tmp_dir, partitions_dir)
+        if legacy_path.exists():
+            legacy_path.unlink()
+        _partitioned_store_cache.clear()
+        converted += 1
+        print(f"{day_dir.name}: {len(sources)} 个快照 -> {partitions_dir}")
+    return converted
+
+
+# === SQLite 归档 ===
+def archive_date(date_folder: str) -> str:
+    """日期目录名（2025年11月17日）转为归档使用的 2025-11-17"""
+    return datetime.strptime(date_folder, "%Y年%m月%d日").strftime("%Y-%m-%d")
+
+
+class NewsArchive:
+    """SQLite 新闻归档（默认 output/news.db），供 MCP 按日期、平台和标题做索引查询
+
+    titles / urls 保存去重后的标题和链接，ticks 每个批次一行（platforms 为快照中的平台顺序），
+    appearances 记录每个批次中每个平台每条标题的排名，seq 为该条在快照中的顺序
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS platforms (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS titles (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL UNIQUE,
+            search_text TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS urls (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS ticks (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            timestamp REAL,
+            platforms TEXT NOT NULL DEFAULT '',
+            UNIQUE (date, time)
+        );
+        CREATE TABLE IF NOT EXISTS appearances (
+            tick_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            title_id INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            url_id INTEGER,
+            mobile_url_id INTEGER,
+            seq INTEGER NOT NULL,
+            PRIMARY KEY (tick_id, platform, title_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_appearances_date_platform
+            ON appearances (date, platform);
+        CREATE INDEX IF NOT EXISTS idx_appearances_title
+            ON appearances (title_id, date);
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path or CONFIG["STORAGE"]["SQLITE"]["PATH"])
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        # WAL 模式下 MCP 读取和定时任务写入互不阻塞
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self._title_ids: Dict[str, int] = {}
+        self._url_ids: Dict[str, int] = {}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _lookup_ids(
+        self, table: str, column: str, values: set, cache: Dict[str, int], extra=None
+    ) -> None:
+        """写入缺失的标题或链接，并把编号补充到 cache"""
+        missing = [value for value in values if value not in cache]
+        if not missing:
+            return
+        if extra:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({column}, search_text) VALUES (?, ?)",
+                [(value, extra(value)) for value in missing],
+            )
+        else:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)",
+                [(value,) for value in missing],
+            )
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row_id, value in self.conn.execute(
+                f"SELECT id, {column} FROM {table} WHERE {column} IN ({placeholders})",
+                chunk,
+            ):
+                cache[value] = row_id
+
+    def archived_times(self, date_folder: str) -> set:
+        """某天已归档的批次时间"""
+        rows = self.conn.execute(
+            "SELECT time FROM ticks WHERE date = ?", (archive_date(date_folder),)
+        )
+        return {row[0] for row in rows}
+
+    def add_tick(
+        self,
+        date_folder: str,
+        time_info: str,
+        titles_by_id: Dict,
+        id_to_name: Dict,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """写入一个批次，titles_by_id 应为 normalize_snapshot 整理后的结构；同一批次重复写入时覆盖"""
+        date = archive_date(date_folder)
+        if timestamp is None:
+            timestamp = time.time()
+        platforms = ",".join(titles_by_id)
+
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM ticks WHERE date = ? AND time = ?", (date, time_info)
+            ).fetchone()
+            if row:
+                tick_id = row[0]
+                self.conn.execute("DELETE FROM appearances WHERE tick_id = ?", (tick_id,))
+                self.conn.execute(
+                    "UPDATE ticks SET timestamp = ?, platforms = ? WHERE id = ?",
+                    (timestamp, platforms, tick_id),
+                )
+            else:
+                tick_id = self.conn.execute(
+                    "INSERT INTO ticks (date, time, timestamp, platforms) VALUES (?, ?, ?, ?)",
+                    (date, time_info, timestamp, platforms),
+                ).lastrowid
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO platforms (id, name) VALUES (?, ?)",
+                [
+                    (source_id, id_to_name.get(source_id) or source_id)
+                    for source_id in titles_by_id
+                ],
+            )
+
+            titles = {title for data in titles_by_id.values() for title in data}
+            urls = {
+                info.get(key)
+                for data in titles_by_id.values()
+                for info in data.values()
+                for key in ("url", "mobileUrl")
+                if info.get(key)
+            }
+            self._lookup_ids("titles", "title", titles, self._title_ids, str.lower)
+            self._lookup_ids("urls", "url", urls, self._url_ids)
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO appearances "
+                "(tick_id, date, platform, title_id, rank, url_id, mobile_url_id, seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        tick_id,
+                        date,
+                        source_id,
+                        self._title_ids[title],
+                        (info.get("ranks") or [1])[0],
+                        self._url_ids.get(info.get("url")),
+                        self._url_ids.get(info.get("mobileUrl")),
+                        seq,
+                    )
+                    for seq, (source_id, title, info) in enumerate(
+                        (source_id, title, info)
+                        for source_id, data in titles_by_id.items()
+                        for title, info in data.items()
+                    )
+                ],
+            )
+
+    def backfill(self, overwrite: bool = False) -> int:
+        """把 output 中已有的快照导入归档，返回导入的批次数；已归档的批次默认跳过"""
+        imported = 0
+        for day_dir in sorted(Path("output").iterdir()):
+            try:
+                archive_date(day_dir.name)
+            except ValueError:
+                continue
+
+            existing = set() if overwrite else self.archived_times(day_dir.name)
+            day_imported = 0
+            for entry in list_day_snapshots(day_dir.name):
+                if entry.time_info in existing:
+                    continue
+                titles_by_id, id_to_name = entry.read(None)
+                self.add_tick(
+                    day_dir.name,
+                    entry.time_info,
+                    titles_by_id,
+                    id_to_name,
+                    snapshot_timestamp(day_dir.name, entry.time_info),
+                )
+                day_imported += 1
+
+            if day_imported:
+                print(f"{day_dir.name}: 导入 {day_imported} 个批次")
+            imported += day_imported
+        return imported
+
+
+def archive_snapshot(
+    results: Dict, id_to_name: Dict, failed_ids: List, time_info: str
+) -> None:
+    """把本批次抓取结果写入已启用的存储（列式快照库、SQLite 归档）
+
+    这些存储只用于加速读取，写入失败只打印日志，读取时会回退到 txt
+    """
+    storage = CONFIG["STORAGE"]
+    if not storage["COLUMNAR"] and not storage["SQLITE"]["ENABLED"]:
+        return
+
+    date_folder = format_date_folder()
+    titles_by_id, names = normalize_snapshot(results, id_to_name)
+
+    if storage["COLUMNAR"]:
+        try:
+            append_snapshot_to_store(date_folder, time_info, titles_by_id, names)
+        except Exception as e:
+            print(f"写入列式快照库失败: {e}")
+
+    if storage["SQLITE"]["ENABLED"]:
+        try:
+            archive = NewsArchive(storage["SQLITE"]["PATH"])
+            try:
+                archive.add_tick(date_folder, time_info, titles_by_id, names)
+            finally:
+                archive.close()
+        except Exception as e:
+            print(f"写入 SQLite 归档失败: {e}")
+
+
+# === 冷存储与保留策略 ===
+DAY_ARCHIVE_NAME = "archive.zip"
+STORAGE_MANIFEST_NAME = ".storage_manifest.json"
+# 可压缩归档的产物目录（相对日期目录）
+COMPACTABLE_DIRS = ("txt", "html")
+
+
+def list_archived_snapshots(day_dir: Path) -> Dict[str, zipfile.ZipInfo]:
+    """某天压缩归档中的 txt 快照：批次时间 -> 归档内的文件信息，未归档时返回空字典"""
+    archive_path = day_dir / DAY_ARCHIVE_NAME
+    if not archive_path.exists():
+        return {}
+    with zipfile.ZipFile(archive_path) as archive:
+        return {
+            Path(info.filename).stem: info
+            for info in archive.infolist()
+            if info.filename.startswith("txt/") and info.filename.endswith(".txt")
+        }
+
+
+def read_archived_text(day_dir: Path, member: str) -> str:
+    """读取某天压缩归档中的一个文件"""
+    with zipfile.ZipFile(day_dir / DAY_ARCHIVE_NAME) as archive:
+        return archive.read(member).decode("utf-8")
+
+
+def _rewrite_day_archive(
+    day_dir: Path, add_files: List[Path], drop_dirs: Tuple[str, ...] = ()
+) -> None:
+    """重写某天的压缩归档：加入 add_files（按 目录名/文件名 存放），去掉 drop_dirs 下的成员
+
+    先写临时文件再替换，中断不会损坏已有归档；结果为空时删除归档
+    """
+    archive_path = day_dir / DAY_ARCHIVE_NAME
+    tmp_path = archive_path.with_name(f"{archive_path.name}.tmp")
+    added = {f"{path.parent.name}/{path.name}" for path in add_files}
+    members = 0
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as new_archive:
+        if archive_path.exists():
+            with zipfile.ZipFile(archive_path) as old_archive:
+                for info in old_archive.infolist():
+                    if info.filename in added or info.filename.split("/", 1)[0] in drop_dirs:
+                        continue
+                    new_archive.writestr(info, old_archive.read(info))
+                    members += 1
+        for path in add_files:
+            new_archive.write(path, f"{path.parent.name}/{path.name}")
+            members += 1
+
+    if members:
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, archive_path)
+    else:
+        tmp_path.unlink()
+        if archive_path.exists():
+            archive_path.unlink()
+
+
+def compact_day(day_dir: Path) -> int:
+    """把某天的 txt/html 目录打包进 archive.zip 并删除原文件，返回打包的文件数"""
+    files = [
+        path
+        for name in COMPACTABLE_DIRS
+        if (day_dir / name).is_dir()
+        for path in sorted((day_dir / name).iterdir())
+        # 跳过写入中断留下的临时文件
+        if path.is_file() and path.suffix != ".tmp"
+    ]
+    if not files:
+        return 0
+
+    _rewrite_day_archive(day_dir, files)
+    for path in files:
+        path.unlink()
+    for name in COMPACTABLE_DIRS:
+        if (day_dir / name).is_dir() and not any((day_dir / name).iterdir()):
+            (day_dir / name).rmdir()
+    return len(files)
+
+
+def expire_day_artifacts(day_dir: Path, artifacts: List[str]) -> None:
+    """删除某天的指定产物（txt、html、columnar），都删除后移除整个日期目录"""
+    archived = tuple(name for name in artifacts if name in COMPACTABLE_DIRS)
+    for name in archived:
+        if (day_dir / name).is_dir():
+            shutil.rmtree(day_dir / name)
+    if archived and (day_dir / DAY_ARCHIVE_NAME).exists():
+        _rewrite_day_archive(day_dir, [], archived)
+    if "columnar" in artifacts:
+        if (day_dir / ColumnarDayStore.FILE_NAME).exists():
+            (day_dir / ColumnarDayStore.FILE_NAME).unlink()
+        if (day_dir / PartitionedDayStore.DIR_NAME).is_dir():
+            shutil.rmtree(day_dir / PartitionedDayStore.DIR_NAME)
+
+    # 快照和报告都已删除时，剩下的汇总、索引等派生文件也没有保留意义
+    remaining = [name for name in COMPACTABLE_DIRS if (day_dir / name).exists()]
+    if not remaining and not any(
+        (day_dir / name).exists()
+        for name in (DAY_ARCHIVE_NAME, ColumnarDayStore.FILE_NAME, PartitionedDayStore.DIR_NAME)
+    ):
+        shutil.rmtree(day_dir)
+
+
+def compact_output(output_dir: str = "output", force: bool = False) -> List[str]:
+    """按 storage.compaction / storage.retention 配置整理历史日期目录，返回有变动的日期
+
+    已结束的日期（早于 after_days 天前）打包为 archive.zip；
+    超过保留天数的产物按类型删除，0 表示永久保留；force 为 True 时忽略 compaction.enabled
+    """
+    compaction = CONFIG["STORAGE"]["COMPACTION"]
+    retention = CONFIG["STORAGE"]["RETENTION"]
+    today = get_beijing_time().date()
+    # 当天的目录仍在写入，至少保留一天
+    compact_after = max(int(compaction["AFTER_DAYS"]), 1)
+
+    changed = []
+    for day_dir in sorted(Path(output_dir).iterdir()):
+        if not day_dir.is_dir():
+            continue
+        try:
+            age = (today - datetime.strptime(day_dir.name, "%Y年%m月%d日").date()).days
+        except ValueError:
+            continue
+
+        try:
+            expired = [
+                artifact.lower()
+                for artifact, days in retention.items()
+                if days and age > int(days)
+            ]
+            if expired:
+                expire_day_artifacts(day_dir, expired)
+                if not day_dir.exists():
+                    print(f"{day_dir.name}: 已超过保留期限，删除")
+                    changed.append(day_dir.name)
+                    continue
+
+            packed = 0
+            if (compaction["ENABLED"] or force) and age >= compact_after:
+                packed = compact_day(day_dir)
+                if packed:
+                    print(f"{day_dir.name}: {packed} 个文件已压缩归档")
+            if expired or packed:
+                changed.append(day_dir.name)
+        except Exception as e:
+            print(f"{day_dir.name}: 整理失败: {e}")
+    return changed
+
+
+def _day_storage_signature(day_dir: Path) -> List:
+    """日期目录的变化标识，只取内容相关的值（不含修改时间，checkout 后不变）：
+
+    快照清单的 CRC32 和大小，以及目录下每个文件的大小、每个子目录的文件数和总大小
+    """
+    manifest_path = day_dir / SNAPSHOT_MANIFEST_NAME
+    try:
+        content = manifest_path.read_bytes()
+        signature: List = [zlib.crc32(content), len(content)]
+    except OSError:
+        signature = [0, 0]
+    try:
+        entries = sorted(os.scandir(day_dir), key=lambda entry: entry.name)
+    except OSError:
+        return signature
+    for entry in entries:
+        if entry.is_file():
+            signature.append([entry.name, 1, entry.stat().st_size])
+        elif entry.is_dir():
+            files = [child.stat().st_size for child in os.scandir(entry.path) if child.is_file()]
+            signature.append([entry.name, len(files), sum(files)])
+    return signature
+
+
+def _day_storage_stats(day_dir: Path) -> Dict:
+    """统计某天各类产物的文件数和字节数"""
+    artifacts: Dict[str, int] = {}
+    files = 0
+    for path in day_dir.rglob("*"):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(day_dir)
+        if relative.parts[0] == PartitionedDayStore.DIR_NAME:
+            artifact = "columnar"
+        elif len(relative.parts) > 1:
+            artifact = relative.parts[0]
+        elif path.name == DAY_ARCHIVE_NAME:
+            artifact = "archive"
+        elif path.name == ColumnarDayStore.FILE_NAME:
+            artifact = "columnar"
+        else:
+            artifact = "index"
+        artifacts[artifact] = artifacts.get(artifact, 0) + path.stat().st_size
+        files += 1
+    return {
+        "signature": _day_storage_signature(day_dir),
+        "bytes": sum(artifacts.values()),
+        "files": files,
+        "artifacts": artifacts,
+        "compacted": (day_dir / DAY_ARCHIVE_NAME).exists(),
+    }
+
+
+def update_storage_manifest(
+    date_folders: Optional[List[str]] = None, output_dir: str = "output"
+) -> None:
+    """更新 output/.storage_manifest.json 中各日期的存储统计
+
+    date_folders 中的日期以及变化标识不一致、尚未记录的日期重新统计，已删除的日期移除；
+    MCP 的系统状态查询读取该清单，不必遍历所有文件
+    """
+    output_path = Path(output_dir)
+    manifest_path = output_path / STORAGE_MANIFEST_NAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            days = json.load(f).get("days", {})
+    except (OSError, ValueError):
+        days = {}
+
+    refresh = set(date_folders or [])
+    updated = {}
+    for day_dir in sorted(output_path.iterdir()) if output_path.exists() else []:
+        if not day_dir.is_dir() or not re.match(r"\d{4}年\d{2}月\d{2}日$", day_dir.name):
+            continue
+        entry = days.get(day_dir.name)
+        if (
+            entry is None
+            or day_dir.name in refresh
+            or entry.get("signature") != _day_storage_signature(day_dir)
+        ):
+            entry = _day_storage_stats(day_dir)
+        updated[day_dir.name] = entry
+
+    if updated == days and manifest_path.exists():
+        return
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"updated_at": get_beijing_time().strftime("%Y-%m-%d %H:%M:%S"), "days": updated},
+            f,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    os.replace(tmp_path, manifest_path)
+
+
+def maintain_storage() -> None:
+    """每次运行结束后整理历史日期目录并更新存储清单，失败不影响本次运行"""
+    try:
+        changed = compact_output()
+        update_storage_manifest([format_date_folder(), *changed])
+    except Exception as e:
+        print(f"整理存储失败: {e}")
+
+
+# === 数据处理 ===
+SNAPSHOT_MANIFEST_NAME = ".snapshots.json"
+SNAPSHOT_MANIFEST_LOCK_NAME = ".snapshots.lock"
+# mkstemp 创建的文件权限为 0600，改为与 open() 写入的文件一致（启动时读取一次 umask）
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+SNAPSHOT_MANIFEST_MODE = 0o666 & ~_UMASK
+SNAPSHOT_MANIFEST_VERSION = 1
+
+
+def format_snapshot_text(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
+    """把抓取结果格式化为 txt 快照内容"""
+    lines = []
+    for id_value, title_data in results.items():
+        # id | name 或 id
+        name = id_to_name.get(id_value)
+        if name and name != id_value:
+            lines.append(f"{id_value} | {name}\n")
+        else:
+            lines.append(f"{id_value}\n")
+
+        # 按排名排序标题
+        sorted_titles = []
+        for title, info in title_data.items():
+            cleaned_title = clean_title(title)
+            if isinstance(info, list):
+                ranks = info
+                url = ""
+                mobile_url = ""
+            else:
+                ranks = info.get("ranks", [])
+                url = info.get("url", "")
+                mobile_url = info.get("mobileUrl", "")
+
+            rank = ranks[0] if ranks else 1
+            sorted_titles.append((rank, cleaned_title, url, mobile_url))
+
+        sorted_titles.sort(key=lambda x: x[0])
+
+        for rank, cleaned_title, url, mobile_url in sorted_titles:
+            line = f"{rank}. {cleaned_title}"
+
+            if url:
+                line += f" [URL:{url}]"
+            if mobile_url:
+                line += f" [MOBILE:{mobile_url}]"
+            lines.append(line + "\n")
+
+        lines.append("\n")
+
+    if failed_ids:
+        lines.append("==== 以下ID请求失败 ====\n")
+        for id_value in failed_ids:
+            lines.append(f"{id_value}\n")
+
+    return "".join(lines)
+
+
+def _snapshot_manifest_entry(
+    content: bytes, titles_by_id: Dict, failed_ids: List, saved_at: float
+) -> Dict:
+    return {
+        "crc32": zlib.crc32(content),
+        "size": len(content),
+        "platforms": {source_id: len(titles) for source_id, titles in titles_by_id.items()},
+        "failed": list(failed_ids),
+        "saved_at": saved_at,
+    }
+
+
+def read_snapshot_manifest(day_dir: Path) -> Optional[Dict[str, Dict]]:
+    """读取某天的快照清单 {批次时间: {crc32, size, platforms, failed, saved_at}}（按时间排序）
+
+    清单不存在（清单出现之前写入的日期）或无法解析时返回 None
+    """
+    try:
+        with open(day_dir / SNAPSHOT_MANIFEST_NAME, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != SNAPSHOT_MANIFEST_VERSION:
+        return None
+    return data.get("ticks", {})
+
+
+@contextmanager
+def _snapshot_manifest_lock(day_dir: Path):
+    """快照清单读改写期间持有的进程间锁（定时任务、常驻模式和 MCP 触发的抓取可能同时写入同一天）
+
+    没有 fcntl 的平台（Windows）不加锁，丢失的登记由 list_day_snapshots 和下一次写入补上
+    """
+    if fcntl is None:
+        yield
+        return
+    day_dir.mkdir(parents=True, exist_ok=True)
+    with open(day_dir / SNAPSHOT_MANIFEST_LOCK_NAME, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _write_snapshot_manifest(day_dir: Path, ticks: Dict[str, Dict]) -> None:
+    """写入快照清单，每次使用独立的临时文件再重命名，调用方需持有 _snapshot_manifest_lock"""
+    fd, tmp_name = tempfile.mkstemp(dir=day_dir, prefix=".snapshots.", suffix=".tmp")
+    try:
+        os.chmod(tmp_name, SNAPSHOT_MANIFEST_MODE)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": SNAPSHOT_MANIFEST_VERSION, "ticks": dict(sorted(ticks.items()))},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, day_dir / SNAPSHOT_MANIFEST_NAME)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _unlisted_txt_snapshots(day_dir: Path, ticks: Dict[str, Dict]) -> List[Path]:
+    """txt 目录中已写入但未登记到清单的快照（并发写入时丢失的登记）"""
+    txt_dir = day_dir / "txt"
+    if not txt_dir.is_dir():
+        return []
+    return sorted(
+        file_path
+        for file_path in txt_dir.iterdir()
+        if file_path.suffix == ".txt" and file_path.stem not in ticks
+    )
+
+
+def _scan_snapshot_manifest(day_dir: Path) -> Dict[str, Dict]:
+    """由目录中已有的快照（txt、压缩归档、早期版本的整天快照库）生成清单内容"""
+    ticks = {}
+    for time_info, read_source in _day_snapshot_sources(day_dir).items():
+        titles_by_id, id_to_name, failed_ids = read_source()
+        timestamp = snapshot_timestamp(day_dir.name, time_info)
+        ticks[time_info] = _snapshot_manifest_entry(
+            format_snapshot_text(titles_by_id, id_to_name, failed_ids).encode("utf-8"),
+            titles_by_id,
+            failed_ids,
+            timestamp if timestamp is not None else time.time(),
+        )
+    return ticks
+
+
+def ensure_snapshot_manifest(day_dir: Path) -> bool:
+    """某天没有快照清单时由已有的 txt 快照生成，返回是否新生成了清单"""
+    if read_snapshot_manifest(day_dir) is not None:
+        return False
+    with _snapshot_manifest_lock(day_dir):
+        if read_snapshot_manifest(day_dir) is not None:
+            return False
+        ticks = _scan_snapshot_manifest(day_dir)
+        if not ticks:
+            return False
+        _write_snapshot_manifest(day_dir, ticks)
+    return True
+
+
+def write_snapshot(
+    day_dir: Path, time_info: str, results: Dict, id_to_name: Dict, failed_ids: List
+) -> Path:
+    """写入一个批次的 txt 快照并登记到当天的快照清单，返回快照路径
+
+    先写同目录下的临时文件并落盘，再重命名为正式文件，进程中途被终止不会留下残缺的快照；
+    清单的读改写在进程间锁内完成，同时登记之前未登记到清单的 txt 快照。当天还没有清单时先由已有的快照生成
+    """
+    content = format_snapshot_text(results, id_to_name, failed_ids).encode("utf-8")
+    txt_dir = day_dir / "txt"
+    txt_dir.mkdir(parents=True, exist_ok=True)
+    file_path = txt_dir / f"{time_info}.txt"
+    tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+    with _snapshot_manifest_lock(day_dir):
+        ticks = read_snapshot_manifest(day_dir)
+        if ticks is None:
+            ticks = _scan_snapshot_manifest(day_dir)
+        ticks[time_info] = _snapshot_manifest_entry(content, results, failed_ids, time.time())
+        for unlisted in _unlisted_txt_snapshots(day_dir, ticks):
+            unlisted_content = unlisted.read_bytes()
+            text = unlisted_content.decode("utf-8")
+            ticks[unlisted.stem] = _snapshot_manifest_entry(
+                unlisted_content,
+                parse_snapshot_text(text)[0],
+                parse_failed_ids(text),
+                unlisted.stat().st_mtime,
+            )
+        _write_snapshot_manifest(day_dir, ticks)
+    return file_path
+
+
+def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
+    """保存标题到当天的 txt 快照（原子写入并登记到快照清单，见 write_snapshot）"""
+    day_dir = Path("output") / format_date_folder()
+    return str(write_snapshot(day_dir, format_time_filename(), results, id_to_name, failed_ids))
+
+
+class WordGroupMatcher:
+    """频率词组的多模式匹配器
+
+    把各词组的必须词、普通词和过滤词（转为小写）编译为一个 Aho-Corasick 自动机，每个标题只扫描一遍
+    就能得到命中的过滤词和词组，耗时随标题长度增长而与词数无关；匹配结果与逐词判断
+    word.lower() in title.lower() 完全一致（空词视为总是命中）
+    """
+
+    def __init__(self, word_groups: List[Dict], filter_words: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        pattern_ids: Dict[str, int] = {}
+
+        def add_word(word: str) -> int:
+            word = word.lower()
+            pattern_id = pattern_ids.get(word)
+            if pattern_id is None:
+                pattern_id = pattern_ids[word] = len(pattern_ids)
+                if word:
+                    self._insert(word, pattern_id)
+            return pattern_id
+
+        self._filter_ids = frozenset(add_word(word) for word in filter_words)
+        # 每个词组的 (必须词编号, 普通词编号)
+        self._groups: List[Tuple[frozenset, frozenset]] = [
+            (
+                frozenset(add_word(word) for word in group["required"]),
+                frozenset(add_word(word) for word in group["normal"]),
+            )
+            for group in word_groups
+        ]
+        self._empty_ids = frozenset([pattern_ids[""]]) if "" in pattern_ids else frozenset()
+
+        # 词编号 -> 用到该词的词组；没有任何词的词组对所有标题都成立
+        self._pattern_groups: List[List[int]] = [[] for _ in pattern_ids]
+        self._always_groups: List[int] = []
+        for index, (required, normal) in enumerate(self._groups):
+            if not required and not normal:
+                self._always_groups.append(index)
+            for pattern_id in required | normal:
+                self._pattern_groups[pattern_id].append(index)
+
+        self._build_fail_links()
+
+    def _insert(self, word: str, pattern_id: int) -> None:
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(pattern_id)
+
+    def _build_fail_links(self) -> None:
+        """按广度优先计算失配跳转，并把失配状态上结束的词并入各状态的输出"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+    def hits(self, title_lower: str) -> set:
+        """扫描小写标题，返回命中的词编号"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        hits = set(self._empty_ids)
+        state = 0
+        for char in title_lower:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+        return hits
+
+    def first_group(self, title: str) -> Optional[int]:
+        """标题命中的第一个词组的序号；命中过滤词或没有词组匹配时返回 None"""
+        hits = self.hits(title.lower())
+        if not self._filter_ids.isdisjoint(hits):
+            return None
+
+        candidates = set(self._always_groups)
+        for pattern_id in hits:
+            candidates.update(self._pattern_groups[pattern_id])
+        for index in sorted(candidates):
+            required, normal = self._groups[index]
+            if required <= hits and (not normal or not normal.isdisjoint(hits)):
+                return index
+        return None
+
+
+# id(word_groups), id(filter_words) -> (word_groups, filter_words, 匹配器)，同时持有列表保证 id 不被复用
+_word_group_matchers: Dict[Tuple[int, int], Tuple[List[Dict], List[str], WordGroupMatcher]] = {}
+
+
+def get_word_group_matcher(
+    word_groups: List[Dict], filter_words: List[str]
+) -> WordGroupMatcher:
+    """获取词组规则的匹配器，同一组规则对象只编译一次（load_frequency_words 加载时已预先编译）"""
+    key = (id(word_groups), id(filter_words))
+    cached = _word_group_matchers.get(key)
+    if cached is not None:
+        return cached[2]
+
+    matcher = WordGroupMatcher(word_groups, filter_words)
+    if len(_word_group_matchers) >= 8:
+        _word_group_matchers.clear()
+    _word_group_matchers[key] = (word_groups, filter_words, matcher)
+    return matcher
+
+
+# 频率词文件路径 -> ((mtime_ns, size), 解析结果)
+_frequency_words_cache: Dict[str, Tuple[Tuple[int, int], Tuple[List[Dict], List[str]]]] = {}
+
+
+def load_frequency_words(
+    frequency_file: Optional[str] = None,
+) -> Tuple[List[Dict], List[str]]:
+    """加载频率词配置"""
+    if frequency_file is None:
+        frequency_file = os.environ.get(
+            "FREQUENCY_WORDS_PATH", "config/frequency_words.txt"
+        )
+
+    frequency_path = Path(frequency_file)
     if not frequency_path.exists():
         raise FileNotFoundError(f"频率词文件 {frequency_file} 不存在")
 
-    with open(frequency_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    # 文件未变化时直接复用上次的解析结果（常驻模式下每个批次都会调用）
+    stat = frequency_path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _frequency_words_cache.get(str(frequency_path))
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(frequency_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
+
+    processed_groups = []
+    filter_words = []
+
+    for group in word_groups:
+        words = [word.strip() for word in group.split("\n") if word.strip()]
+
+        group_required_words = []
+        group_normal_words = []
+        group_filter_words = []
+
+        for word in words:
+            if word.startswith("!"):
+                filter_words.append(word[1:])
+                group_filter_words.append(word[1:])
+            elif word.startswith("+"):
+                group_required_words.append(word[1:])
+            else:
+                group_normal_words.append(word)
+
+        if group_required_words or group_normal_words:
+            if group_normal_words:
+                group_key = " ".join(group_normal_words)
+            else:
+                group_key = " ".join(group_required_words)
+
+            processed_groups.append(
+                {
+                    "required": group_required_words,
+                    "normal": group_normal_words,
+                    "group_key": group_key,
+                }
+            )
+
+    _frequency_words_cache[str(frequency_path)] = (
+        signature,
+        (processed_groups, filter_words),
+    )
+    # 预先编译匹配器，之后按同一组规则匹配时直接复用
+    get_word_group_matcher(processed_groups, filter_words)
+    return processed_groups, filter_words
+
+
+# 快照文件路径 -> ((mtime_ns, size), 解析结果)，只保留同一目录（当天）的文件
+_parsed_file_cache: Dict[str, Tuple[Tuple[int, int], Tuple[Dict, Dict]]] = {}
+
+
+def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
+    """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)
+
+    结果按文件的修改时间和大小缓存，已落盘的快照不会重复解析；
+    返回值为共享对象，调用方不应原地修改
+    """
+    stat = file_path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cache_key = str(file_path)
+    cached = _parsed_file_cache.get(cache_key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    result = _parse_file_titles_uncached(file_path)
+
+    # 切换到新目录（跨天）时丢弃旧缓存，避免常驻进程内存持续增长
+    if _parsed_file_cache:
+        cached_dir = Path(next(iter(_parsed_file_cache))).parent
+        if cached_dir != file_path.parent:
+            _parsed_file_cache.clear()
+    _parsed_file_cache[cache_key] = (signature, result)
+    return result
+
+
+def _parse_file_titles_uncached(file_path: Path) -> Tuple[Dict, Dict]:
+    """逐行解析txt快照文件"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return parse_snapshot_text(f.read())
+
+
+def parse_snapshot_text(content: str) -> Tuple[Dict, Dict]:
+    """解析txt快照内容，返回(titles_by_id, id_to_name)"""
+    titles_by_id = {}
+    id_to_name = {}
+
+    sections = content.split("\n\n")
+
+    for section in sections:
+        if not section.strip() or "==== 以下ID请求失败 ====" in section:
+            continue
+
+        lines = section.strip().split("\n")
+        if len(lines) < 2:
+            continue
+
+        # id | name 或 id
+        header_line = lines[0].strip()
+        if " | " in header_line:
+            parts = header_line.split(" | ", 1)
+            source_id = parts[0].strip()
+            name = parts[1].strip()
+            id_to_name[source_id] = name
+        else:
+            source_id = header_line
+            id_to_name[source_id] = source_id
+
+        titles_by_id[source_id] = {}
+
+        for line in lines[1:]:
+            if line.strip():
+                try:
+                    title_part = line.strip()
+                    rank = None
+
+                    # 提取排名
+                    if ". " in title_part and title_part.split(". ")[0].isdigit():
+                        rank_str, title_part = title_part.split(". ", 1)
+                        rank = int(rank_str)
+
+                    # 提取 MOBILE URL
+                    mobile_url = ""
+                    if " [MOBILE:" in title_part:
+                        title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
+                        if mobile_part.endswith("]"):
+                            mobile_url = mobile_part[:-1]
+
+                    # 提取 URL
+                    url = ""
+                    if " [URL:" in title_part:
+                        title_part, url_part = title_part.rsplit(" [URL:", 1)
+                        if url_part.endswith("]"):
+                            url = url_part[:-1]
+
+                    title = clean_title(title_part.strip())
+                    ranks = [rank] if rank is not None else [1]
+
+                    titles_by_id[source_id][title] = {
+                        "ranks": ranks,
+                        "url": url,
+                        "mobileUrl": mobile_url,
+                    }
+
+                except Exception as e:
+                    print(f"解析标题行出错: {line}, 错误: {e}")
+
+    return titles_by_id, id_to_name
+
+
+class SnapshotEntry(NamedTuple):
+    """某天的一个批次快照"""
+
+    time_info: str
+    # 读取函数，接受 platform_ids，返回 (titles_by_id, id_to_name)
+    read: Callable[[Optional[List[str]]], Tuple[Dict, Dict]]
+    # 内容标识，批次被改写后随之变化
+    signature: Tuple
+
+
+def list_day_snapshots(date_folder: Optional[str] = None) -> List[SnapshotEntry]:
+    """按时间顺序列出某天的批次快照
+
+    批次取自当天的快照清单（见 write_snapshot），清单出现之前写入的日期扫描 txt 目录和压缩归档；
+    有按平台分区的快照库时从分区读取，只打开请求平台的分区文件；早期版本的整天快照库中已有的批次
+    从该文件读取；其余批次解析 txt，已压缩归档的 txt 从 archive.zip 中读取
+    """
+    date_folder = date_folder or format_date_folder()
+    day_dir = Path("output") / date_folder
+    txt_dir = day_dir / "txt"
+    store = get_columnar_store(date_folder)
+    store_ticks = store.tick_index() if store else {}
+
+    manifest = read_snapshot_manifest(day_dir)
+    if manifest is not None:
+        partitioned = get_partitioned_store(date_folder)
+        if not partitioned.path.is_dir():
+            partitioned = None
+        entries = []
+        archived = None
+        for time_info, info in manifest.items():
+            if time_info in store_ticks:
+                index = store_ticks[time_info]
+                entries.append(
+                    SnapshotEntry(
+                        time_info,
+                        partial(store.read_snapshot, index),
+                        ("col", store.ticks[index][1]),
+                    )
+                )
+                continue
+            if partitioned is not None:
+                source_ids = [
+                    source_id for source_id, count in info["platforms"].items() if count
+                ]
+                entries.append(
+                    SnapshotEntry(
+                        time_info,
+                        partial(
+                            _read_partitioned_snapshot, partitioned, day_dir, time_info, source_ids
+                        ),
+                        ("col", info["crc32"], info["size"]),
+                    )
+                )
+                continue
+            file_path = txt_dir / f"{time_info}.txt"
+            if file_path.exists():
+                entries.append(
+                    SnapshotEntry(
+                        time_info,
+                        partial(_read_txt_snapshot, file_path),
+                        ("txt", info["crc32"], info["size"]),
+                    )
+                )
+                continue
+            if archived is None:
+                archived = list_archived_snapshots(day_dir)
+            if time_info in archived:
+                member = archived[time_info]
+                entries.append(
+                    SnapshotEntry(
+                        time_info,
+                        partial(_read_archived_snapshot, day_dir, member.filename),
+                        ("zip", member.CRC, member.file_size),
+                    )
+                )
+
+        # 清单未登记的 txt（并发写入时丢失的登记）照常读取，下一次写入快照时补登到清单
+        unlisted = _unlisted_txt_snapshots(day_dir, manifest)
+        if unlisted:
+            for file_path in unlisted:
+                stat = file_path.stat()
+                entries.append(
+                    SnapshotEntry(
+                        file_path.stem,
+                        partial(_read_txt_snapshot, file_path),
+                        ("txt", stat.st_mtime_ns, stat.st_size),
+                    )
+                )
+            entries.sort(key=lambda entry: entry.time_info)
+        return entries
+
+    entries = {}
+    for time_info, info in list_archived_snapshots(day_dir).items():
+        entries[time_info] = SnapshotEntry(
+            time_info,
+            partial(_read_archived_snapshot, day_dir, info.filename),
+            ("zip", info.CRC, info.file_size),
+        )
+    if txt_dir.exists():
+        for file_path in txt_dir.iterdir():
+            if file_path.suffix == ".txt":
+                stat = file_path.stat()
+                entries[file_path.stem] = SnapshotEntry(
+                    file_path.stem,
+                    partial(_read_txt_snapshot, file_path),
+                    ("txt", stat.st_mtime_ns, stat.st_size),
+                )
 
-    word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
+    for time_info, index in store_ticks.items():
+        entries[time_info] = SnapshotEntry(
+            time_info,
+            partial(store.read_snapshot, index),
+            ("col", store.ticks[index][1]),
+        )
 
-    processed_groups = []
-    filter_words = []
+    return [entries[time_info] for time_info in sorted(entries)]
+
+
+def _read_txt_snapshot(
+    file_path: Path, platform_ids: Optional[List[str]] = None
+) -> Tuple[Dict, Dict]:
+    titles_by_id, id_to_name = parse_file_titles(file_path)
+    if platform_ids is None:
+        return titles_by_id, id_to_name
+
+    filtered_titles_by_id = {}
+    filtered_id_to_name = {}
+    for source_id, title_data in titles_by_id.items():
+        if source_id in platform_ids:
+            filtered_titles_by_id[source_id] = title_data
+            if source_id in id_to_name:
+                filtered_id_to_name[source_id] = id_to_name[source_id]
+    return filtered_titles_by_id, filtered_id_to_name
+
+
+def _read_archived_snapshot(
+    day_dir: Path, member: str, platform_ids: Optional[List[str]] = None
+) -> Tuple[Dict, Dict]:
+    titles_by_id, id_to_name = parse_snapshot_text(read_archived_text(day_dir, member))
+    if platform_ids is None:
+        return titles_by_id, id_to_name
+    wanted = set(platform_ids)
+    return (
+        {key: value for key, value in titles_by_id.items() if key in wanted},
+        {key: value for key, value in id_to_name.items() if key in wanted},
+    )
 
-    for group in word_groups:
-        words = [word.strip() for word in group.split("\n") if word.strip()]
 
-        group_required_words = []
-        group_normal_words = []
-        group_filter_words = []
+def _read_partitioned_snapshot(
+    store: PartitionedDayStore,
+    day_dir: Path,
+    time_info: str,
+    source_ids: List[str],
+    platform_ids: Optional[List[str]] = None,
+) -> Tuple[Dict, Dict]:
+    """从分区快照库读取一个批次，分区缺少该批次时改读 txt（或压缩归档中的 txt）"""
+    result = store.read_snapshot(time_info, source_ids, platform_ids)
+    if result is not None:
+        return result
+    file_path = day_dir / "txt" / f"{time_info}.txt"
+    if file_path.exists():
+        return _read_txt_snapshot(file_path, platform_ids)
+    member = list_archived_snapshots(day_dir).get(time_info)
+    if member is None:
+        raise FileNotFoundError(f"{day_dir.name} {time_info} 的快照不存在")
+    return _read_archived_snapshot(day_dir, member.filename, platform_ids)
 
-        for word in words:
-            if word.startswith("!"):
-                filter_words.append(word[1:])
-                group_filter_words.append(word[1:])
-            elif word.startswith("+"):
-                group_required_words.append(word[1:])
-            else:
-                group_normal_words.append(word)
 
-        if group_required_words or group_normal_words:
-            if group_normal_words:
-                group_key = " ".join(group_normal_words)
-            else:
-                group_key = " ".join(group_required_words)
+def read_all_today_titles(
+    current_platform_ids: Optional[List[str]] = None,
+    snapshots: Optional[List[SnapshotEntry]] = None,
+) -> Tuple[Dict, Dict, Dict]:
+    """读取当天所有批次快照的汇总结果，支持按当前监控平台过滤
 
-            processed_groups.append(
-                {
-                    "required": group_required_words,
-                    "normal": group_normal_words,
-                    "group_key": group_key,
-                }
-            )
+    汇总结果按批次增量维护（见 DailyAggregate），每次只合并新增的批次；
+    all_results 和 title_info 为汇总表的只读视图。snapshots 为已列出的当天批次，不传时重新列出
+    """
+    aggregate = get_daily_aggregate()
+    if aggregate.update(snapshots if snapshots is not None else list_day_snapshots()):
+        aggregate.save()
+    return aggregate.view(current_platform_ids)
 
-    return processed_groups, filter_words
 
+def detect_latest_new_titles(
+    current_platform_ids: Optional[List[str]] = None,
+    unchanged_ids: Optional[List[str]] = None,
+    snapshots: Optional[List[SnapshotEntry]] = None,
+) -> Dict:
+    """检测当日最新批次的新增标题，支持按当前监控平台过滤
 
-def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
-    """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)"""
-    titles_by_id = {}
-    id_to_name = {}
+    已出现标题按批次增量记录（见 SeenTitleIndex），无需重新读取历史批次；
+    unchanged_ids 为响应指纹与上一批次相同的平台，这些平台的标题都已在历史中出现过，直接跳过；
+    snapshots 为已列出的当天批次，不传时重新列出
+    """
+    if snapshots is None:
+        snapshots = list_day_snapshots()
+    if len(snapshots) < 2:
+        return {}
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-        sections = content.split("\n\n")
+    seen_index = get_seen_title_index()
+    if seen_index.update(snapshots):
+        seen_index.save()
 
-        for section in sections:
-            if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                continue
+    # 读取最新批次（按当前平台列表过滤）
+    latest = snapshots[-1]
+    latest_titles, _ = latest.read(current_platform_ids)
 
-            lines = section.strip().split("\n")
-            if len(lines) < 2:
-                continue
+    # 只遍历最新批次：首次出现于最新批次的标题即为新增
+    new_titles = {}
+    for source_id, latest_source_titles in latest_titles.items():
+        if unchanged_ids and source_id in unchanged_ids:
+            continue
+        source_new_titles = {
+            title: title_data
+            for title, title_data in latest_source_titles.items()
+            if seen_index.first_seen_time(source_id, title) == latest.time_info
+        }
+        if source_new_titles:
+            new_titles[source_id] = source_new_titles
 
-            # id | name 或 id
-            header_line = lines[0].strip()
-            if " | " in header_line:
-                parts = header_line.split(" | ", 1)
-                source_id = parts[0].strip()
-                name = parts[1].strip()
-                id_to_name[source_id] = name
-            else:
-                source_id = header_line
-                id_to_name[source_id] = source_id
-
-            titles_by_id[source_id] = {}
-
-            for line in lines[1:]:
-                if line.strip():
-                    try:
-                        title_part = line.strip()
-                        rank = None
-
-                        # 提取排名
-                        if ". " in title_part and title_part.split(". ")[0].isdigit():
-                            rank_str, title_part = title_part.split(". ", 1)
-                            rank = int(rank_str)
-
-                        # 提取 MOBILE URL
-                        mobile_url = ""
-                        if " [MOBILE:" in title_part:
-                            title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                            if mobile_part.endswith("]"):
-                                mobile_url = mobile_part[:-1]
-
-                        # 提取 URL
-                        url = ""
-                        if " [URL:" in title_part:
-                            title_part, url_part = title_part.rsplit(" [URL:", 1)
-                            if url_part.endswith("]"):
-                                url = url_part[:-1]
-
-                        title = clean_title(title_part.strip())
-                        ranks = [rank] if rank is not None else [1]
-
-                        titles_by_id[source_id][title] = {
-                            "ranks": ranks,
-                            "url": url,
-                            "mobileUrl": mobile_url,
-                        }
+    return new_titles
 
-                    except Exception as e:
-                        print(f"解析标题行出错: {line}, 错误: {e}")
 
-    return titles_by_id, id_to_name
+# === 当日汇总 ===
+NO_RANK = 0xFFFFFFFF  # 排名链表的结束标记
 
 
-def read_all_today_titles(
-    current_platform_ids: Optional[List[str]] = None,
-) -> Tuple[Dict, Dict, Dict]:
-    """读取当天所有标题文件，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+class TextPool:
+    """只追加的 UTF-8 字符串池，内容拼接保存在一个 bytearray 中，按编号取回；编号 0 为空字符串"""
 
-    if not txt_dir.exists():
-        return {}, {}, {}
+    __slots__ = ("data", "offsets")
 
-    all_results = {}
-    final_id_to_name = {}
-    title_info = {}
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("I", [0, 0])
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
+    def add(self, text: str) -> int:
+        if not text:
+            return 0
+        self.data += text.encode("utf-8")
+        self.offsets.append(len(self.data))
+        return len(self.offsets) - 2
 
-    for file_path in files:
-        time_info = file_path.stem
+    def __getitem__(self, text_id: int) -> str:
+        return self.data[self.offsets[text_id]:self.offsets[text_id + 1]].decode("utf-8")
 
-        titles_by_id, file_id_to_name = parse_file_titles(file_path)
 
-        if current_platform_ids is not None:
-            filtered_titles_by_id = {}
-            filtered_id_to_name = {}
+class _PlatformColumns:
+    """单个平台的标题列，按首次出现的顺序每个标题一行
 
-            for source_id, title_data in titles_by_id.items():
-                if source_id in current_platform_ids:
-                    filtered_titles_by_id[source_id] = title_data
-                    if source_id in file_id_to_name:
-                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
+    每行的排名以链表形式存放在平台共用的 rank_values / rank_next 中，行内记录首尾位置
+    """
+
+    __slots__ = (
+        "rows", "title_ids", "url_ids", "mobile_ids", "first_ticks", "last_ticks",
+        "counts", "rank_heads", "rank_tails", "rank_values", "rank_next",
+    )
+
+    def __init__(self):
+        self.rows: Dict[int, int] = {}  # 标题编号 -> 行号
+        self.title_ids = array("I")
+        self.url_ids = array("I")
+        self.mobile_ids = array("I")
+        self.first_ticks = array("H")  # 首次出现的批次编号
+        self.last_ticks = array("H")  # 最后出现的批次编号
+        self.counts = array("H")  # 出现的批次数
+        self.rank_heads = array("I")
+        self.rank_tails = array("I")
+        self.rank_values = array("H")
+        self.rank_next = array("I")
+
+    def add_row(
+        self, title_id: int, url_id: int, mobile_id: int, first_tick: int, last_tick: int, count: int
+    ) -> int:
+        row = self.rows[title_id] = len(self.title_ids)
+        self.title_ids.append(title_id)
+        self.url_ids.append(url_id)
+        self.mobile_ids.append(mobile_id)
+        self.first_ticks.append(first_tick)
+        self.last_ticks.append(last_tick)
+        self.counts.append(count)
+        self.rank_heads.append(NO_RANK)
+        self.rank_tails.append(NO_RANK)
+        return row
+
+    def ranks(self, row: int) -> List[int]:
+        ranks = []
+        position = self.rank_heads[row]
+        while position != NO_RANK:
+            ranks.append(self.rank_values[position])
+            position = self.rank_next[position]
+        return ranks
+
+    def merge_ranks(self, row: int, ranks: List[int]) -> None:
+        """按出现顺序追加该行尚未出现过的排名"""
+        if not ranks:
+            return
+        existing = self.ranks(row)
+        for rank in ranks:
+            if rank in existing:
+                continue
+            existing.append(rank)
+            position = len(self.rank_values)
+            self.rank_values.append(rank)
+            self.rank_next.append(NO_RANK)
+            tail = self.rank_tails[row]
+            if tail == NO_RANK:
+                self.rank_heads[row] = position
+            else:
+                self.rank_next[tail] = position
+            self.rank_tails[row] = position
 
-            titles_by_id = filtered_titles_by_id
-            file_id_to_name = filtered_id_to_name
 
-        final_id_to_name.update(file_id_to_name)
+class DayTitleTable:
+    """当天各平台标题的紧凑表示
 
+    标题驻留为整数编号（跨平台共享），链接保存在 UTF-8 字符串池中（移动端链接与链接相同时共用），
+    批次时间、出现次数和排名按列存放在 array 中；合并规则与逐批汇总一致：排名按出现顺序去重追加，
+    链接取首个非空值。通过 results_view / info_view 以只读映射的方式按需还原为字典
+    """
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self._title_ids: Dict[str, int] = {}
+        self.urls = TextPool()
+        self.times: List[str] = []
+        self._time_ids: Dict[str, int] = {}
+        self.platforms: Dict[str, _PlatformColumns] = {}
+
+    def title_id(self, title: str) -> int:
+        title_id = self._title_ids.get(title)
+        if title_id is None:
+            title_id = self._title_ids[title] = len(self.titles)
+            self.titles.append(title)
+        return title_id
+
+    def tick(self, time_info: str) -> int:
+        tick_id = self._time_ids.get(time_info)
+        if tick_id is None:
+            tick_id = self._time_ids[time_info] = len(self.times)
+            self.times.append(time_info)
+        return tick_id
+
+    def _url_ids(self, url: str, mobile_url: str) -> Tuple[int, int]:
+        url_id = self.urls.add(url)
+        mobile_id = url_id if mobile_url == url else self.urls.add(mobile_url)
+        return url_id, mobile_id
+
+    def _columns(self, source_id: str) -> _PlatformColumns:
+        columns = self.platforms.get(source_id)
+        if columns is None:
+            columns = self.platforms[source_id] = _PlatformColumns()
+        return columns
+
+    def add_record(
+        self,
+        source_id: str,
+        title: str,
+        first_time: str,
+        last_time: str,
+        count: int,
+        ranks: List[int],
+        url: str,
+        mobile_url: str,
+    ) -> None:
+        """追加一行已汇总的标题（读取持久化的汇总时使用）"""
+        columns = self._columns(source_id)
+        row = columns.add_row(
+            self.title_id(title),
+            *self._url_ids(url or "", mobile_url or ""),
+            self.tick(first_time),
+            self.tick(last_time),
+            count,
+        )
+        columns.merge_ranks(row, ranks)
+
+    def add_snapshot(self, time_info: str, titles_by_id: Dict) -> None:
+        """合并一个批次的快照"""
+        tick_id = self.tick(time_info)
         for source_id, title_data in titles_by_id.items():
-            process_source_data(
-                source_id, title_data, time_info, all_results, title_info
-            )
+            columns = self._columns(source_id)
+            for title, data in title_data.items():
+                ranks = data.get("ranks", [])
+                url = data.get("url", "") or ""
+                mobile_url = data.get("mobileUrl", "") or ""
+                title_id = self.title_id(title)
+                row = columns.rows.get(title_id)
+                if row is None:
+                    row = columns.add_row(
+                        title_id, *self._url_ids(url, mobile_url), tick_id, tick_id, 1
+                    )
+                    columns.merge_ranks(row, ranks)
+                    continue
+
+                columns.merge_ranks(row, ranks)
+                columns.last_ticks[row] = tick_id
+                columns.counts[row] += 1
+                if not columns.url_ids[row] and url:
+                    columns.url_ids[row] = self.urls.add(url)
+                if not columns.mobile_ids[row] and mobile_url:
+                    columns.mobile_ids[row] = self.urls.add(mobile_url)
+
+    def result_entry(self, columns: _PlatformColumns, row: int) -> Dict:
+        """还原为 {ranks, url, mobileUrl}"""
+        return {
+            "ranks": columns.ranks(row),
+            "url": self.urls[columns.url_ids[row]],
+            "mobileUrl": self.urls[columns.mobile_ids[row]],
+        }
 
-    return all_results, final_id_to_name, title_info
+    def info_entry(self, columns: _PlatformColumns, row: int) -> Dict:
+        """还原为 {first_time, last_time, count, ranks, url, mobileUrl}"""
+        return {
+            "first_time": self.times[columns.first_ticks[row]],
+            "last_time": self.times[columns.last_ticks[row]],
+            "count": columns.counts[row],
+            "ranks": columns.ranks(row),
+            "url": self.urls[columns.url_ids[row]],
+            "mobileUrl": self.urls[columns.mobile_ids[row]],
+        }
 
+    def results_view(self, platform_ids: Optional[List[str]] = None) -> "DayTitleView":
+        """{platform_id: {title: {ranks, url, mobileUrl}}} 的只读视图"""
+        return DayTitleView(self, self.result_entry, platform_ids)
 
-def process_source_data(
-    source_id: str,
-    title_data: Dict,
-    time_info: str,
-    all_results: Dict,
-    title_info: Dict,
-) -> None:
-    """处理来源数据，合并重复标题"""
-    if source_id not in all_results:
-        all_results[source_id] = title_data
-
-        if source_id not in title_info:
-            title_info[source_id] = {}
-
-        for title, data in title_data.items():
-            ranks = data.get("ranks", [])
-            url = data.get("url", "")
-            mobile_url = data.get("mobileUrl", "")
-
-            title_info[source_id][title] = {
-                "first_time": time_info,
-                "last_time": time_info,
-                "count": 1,
-                "ranks": ranks,
-                "url": url,
-                "mobileUrl": mobile_url,
-            }
-    else:
-        for title, data in title_data.items():
-            ranks = data.get("ranks", [])
-            url = data.get("url", "")
-            mobile_url = data.get("mobileUrl", "")
-
-            if title not in all_results[source_id]:
-                all_results[source_id][title] = {
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
+    def info_view(self, platform_ids: Optional[List[str]] = None) -> "DayTitleView":
+        """{platform_id: {title: {first_time, last_time, count, ranks, url, mobileUrl}}} 的只读视图"""
+        return DayTitleView(self, self.info_entry, platform_ids)
+
+
+class PlatformTitleView(Mapping):
+    """单个平台 {title: 字典} 的只读视图，访问时才还原字典"""
+
+    __slots__ = ("_table", "_columns", "_entry")
+
+    def __init__(self, table: DayTitleTable, columns: _PlatformColumns, entry: Callable):
+        self._table = table
+        self._columns = columns
+        self._entry = entry
+
+    def __getitem__(self, title: str) -> Dict:
+        title_id = self._table._title_ids.get(title)
+        row = self._columns.rows.get(title_id) if title_id is not None else None
+        if row is None:
+            raise KeyError(title)
+        return self._entry(self._columns, row)
+
+    def __contains__(self, title) -> bool:
+        title_id = self._table._title_ids.get(title)
+        return title_id is not None and title_id in self._columns.rows
+
+    def __iter__(self):
+        titles = self._table.titles
+        return (titles[title_id] for title_id in self._columns.title_ids)
+
+    def __len__(self) -> int:
+        return len(self._columns.title_ids)
+
+    def items(self):
+        titles = self._table.titles
+        entry = self._entry
+        columns = self._columns
+        return (
+            (titles[title_id], entry(columns, row))
+            for row, title_id in enumerate(columns.title_ids)
+        )
+
+
+class DayTitleView(Mapping):
+    """{platform_id: PlatformTitleView} 的只读视图，platform_ids 不为 None 时只包含这些平台"""
+
+    def __init__(
+        self,
+        table: DayTitleTable,
+        entry: Callable,
+        platform_ids: Optional[List[str]] = None,
+    ):
+        self._table = table
+        self._entry = entry
+        self._wanted = set(platform_ids) if platform_ids is not None else None
+
+    def _includes(self, source_id: str) -> bool:
+        return source_id in self._table.platforms and (
+            self._wanted is None or source_id in self._wanted
+        )
+
+    def __getitem__(self, source_id: str) -> PlatformTitleView:
+        if not self._includes(source_id):
+            raise KeyError(source_id)
+        return PlatformTitleView(self._table, self._table.platforms[source_id], self._entry)
+
+    def __contains__(self, source_id) -> bool:
+        return self._includes(source_id)
+
+    def __iter__(self):
+        return (source_id for source_id in self._table.platforms if self._includes(source_id))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def count_at(self, time_info: str) -> int:
+        """视图内最后出现时间为 time_info 的标题数"""
+        tick_id = self._table._time_ids.get(time_info)
+        if tick_id is None:
+            return 0
+        return sum(self._table.platforms[source_id].last_ticks.count(tick_id) for source_id in self)
+
+    def latest_time(self) -> Optional[str]:
+        """视图内各标题最后出现时间的最大值"""
+        times = self._table.times
+        latest = None
+        for source_id in self:
+            for tick_id in set(self._table.platforms[source_id].last_ticks):
+                if latest is None or times[tick_id] > latest:
+                    latest = times[tick_id]
+        return latest
+
+
+class DailyAggregate:
+    """当天各平台标题的累计汇总（首次/最后出现时间、出现次数、合并后的排名和链接）
+
+    保存在 output/<日期>/.aggregate.json，ticks 记录已合并批次的时间和内容标识，作为高水位：
+    每次只合并之后新增的批次；已合并的批次被改写或插入了更早的批次时整体重建
+    """
+
+    FILE_NAME = ".aggregate.json"
+    VERSION = 1
+
+    def __init__(self, date_folder: Optional[str] = None):
+        self.date_folder = date_folder or format_date_folder()
+        self.path = Path("output") / self.date_folder / self.FILE_NAME
+        self._file_signature = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.ticks: List[List] = []
+        self.id_to_name: Dict[str, str] = {}
+        self.table = DayTitleTable()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def is_stale(self) -> bool:
+        """磁盘上的文件是否被其他进程更新过"""
+        return self._stat() != self._file_signature
+
+    def load(self) -> None:
+        """读取磁盘上的汇总，文件不存在或格式不符时从空汇总开始"""
+        self.reset()
+        self._file_signature = self._stat()
+        if self._file_signature is None:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            for source_id, titles in data["platforms"].items():
+                for title, record in titles.items():
+                    self.table.add_record(source_id, title, *record)
+            self.id_to_name = data["id_to_name"]
+            self.ticks = data["ticks"]
+        except Exception as e:
+            print(f"读取当日汇总失败，将重新汇总: {e}")
+            self.reset()
+
+    def save(self) -> None:
+        data = {
+            "version": self.VERSION,
+            "ticks": self.ticks,
+            "id_to_name": self.id_to_name,
+            "platforms": {
+                source_id: {
+                    title: [
+                        info["first_time"],
+                        info["last_time"],
+                        info["count"],
+                        info["ranks"],
+                        info["url"],
+                        info["mobileUrl"],
+                    ]
+                    for title, info in titles.items()
                 }
+                for source_id, titles in self.table.info_view().items()
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, self.path)
+            self._file_signature = self._stat()
+        except Exception as e:
+            print(f"保存当日汇总失败: {e}")
+
+    def update(self, snapshots: List[SnapshotEntry]) -> int:
+        """合并高水位之后的批次，返回新合并的批次数"""
+        signatures = [[entry.time_info, *entry.signature] for entry in snapshots]
+        processed = len(self.ticks)
+        if self.ticks != signatures[:processed]:
+            print("当日已汇总的快照有变动，重新汇总")
+            self.reset()
+            processed = 0
+
+        for entry in snapshots[processed:]:
+            titles_by_id, id_to_name = entry.read(None)
+            self.id_to_name.update(id_to_name)
+            self.table.add_snapshot(entry.time_info, titles_by_id)
+
+        self.ticks = signatures
+        return len(snapshots) - processed
+
+    def view(
+        self, platform_ids: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """返回 (all_results, id_to_name, title_info)，platform_ids 不为 None 时只保留这些平台
+
+        all_results 和 title_info 是汇总表的只读视图（见 DayTitleTable），按需还原为字典
+        """
+        if platform_ids is None:
+            id_to_name = dict(self.id_to_name)
+        else:
+            wanted = set(platform_ids)
+            id_to_name = {key: value for key, value in self.id_to_name.items() if key in wanted}
+        return (
+            self.table.results_view(platform_ids),
+            id_to_name,
+            self.table.info_view(platform_ids),
+        )
+
+
+_daily_aggregate: Optional[DailyAggregate] = None
+
+
+def get_daily_aggregate(date_folder: Optional[str] = None) -> DailyAggregate:
+    """获取某天的汇总，同一进程内复用，磁盘文件被其他进程更新时重新读取"""
+    global _daily_aggregate
+    date_folder = date_folder or format_date_folder()
+    if _daily_aggregate is None or _daily_aggregate.date_folder != date_folder:
+        _daily_aggregate = DailyAggregate(date_folder)
+        _daily_aggregate.load()
+    elif _daily_aggregate.is_stale():
+        _daily_aggregate.load()
+    return _daily_aggregate
+
+
+class SeenTitleIndex:
+    """当天各平台已出现过的标题及其首次出现的批次，用于单次遍历最新批次检测新增标题
+
+    保存在 output/<日期>/.seen_titles.log，每个批次追加一行 JSON：
+    {"time": 批次时间, "signature": 内容标识, "new": {平台ID: [本批次首次出现的标题]}}。
+    与 DailyAggregate 相同按高水位只追加之后新增的批次，已记录的批次被改写时整体重写；
+    MCP 服务读取同一文件查询某批次之后的新增标题
+    """
+
+    FILE_NAME = ".seen_titles.log"
+
+    def __init__(self, date_folder: Optional[str] = None):
+        self.date_folder = date_folder or format_date_folder()
+        self.path = Path("output") / self.date_folder / self.FILE_NAME
+        self._file_signature = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.ticks: List[List] = []
+        self.records: List[Dict] = []
+        self.first_seen: Dict[str, Dict[str, str]] = {}
+        # 待追加到文件的记录；_rewrite 为 True 时整体重写
+        self._pending: List[Dict] = []
+        self._rewrite = False
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def is_stale(self) -> bool:
+        """磁盘上的文件是否被其他进程更新过"""
+        return self._stat() != self._file_signature
+
+    def _apply(self, record: Dict) -> None:
+        for source_id, titles in record["new"].items():
+            seen = self.first_seen.setdefault(source_id, {})
+            for title in titles:
+                seen.setdefault(title, record["time"])
+        self.ticks.append([record["time"], *record["signature"]])
+        self.records.append(record)
+
+    def load(self) -> None:
+        """读取磁盘上的索引，末尾不完整的行（写入中断）丢弃，下次保存时整体重写"""
+        self.reset()
+        self._file_signature = self._stat()
+        if self._file_signature is None:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        self._rewrite = True
+                        break
+                    self._apply(json.loads(line))
+        except Exception as e:
+            print(f"读取已出现标题索引失败，将重新建立: {e}")
+            self.reset()
+            self._rewrite = True
+
+    def save(self) -> None:
+        if not self._pending and not self._rewrite:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self._rewrite:
+                tmp_file = self.path.with_suffix(".tmp")
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    for record in self.records:
+                        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                os.replace(tmp_file, self.path)
             else:
-                existing_data = all_results[source_id][title]
-                existing_ranks = existing_data.get("ranks", [])
-                existing_url = existing_data.get("url", "")
-                existing_mobile_url = existing_data.get("mobileUrl", "")
-
-                merged_ranks = existing_ranks.copy()
-                for rank in ranks:
-                    if rank not in merged_ranks:
-                        merged_ranks.append(rank)
-
-                all_results[source_id][title] = {
-                    "ranks": merged_ranks,
-                    "url": existing_url or url,
-                    "mobileUrl": existing_mobile_url or mobile_url,
-                }
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for record in self._pending:
+                        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._pending = []
+            self._rewrite = False
+            self._file_signature = self._stat()
+        except Exception as e:
+            print(f"保存已出现标题索引失败: {e}")
+
+    def update(self, snapshots: List[SnapshotEntry]) -> int:
+        """记录高水位之后的批次，返回新记录的批次数"""
+        signatures = [[entry.time_info, *entry.signature] for entry in snapshots]
+        processed = len(self.ticks)
+        if self.ticks != signatures[:processed]:
+            print("当日已记录的快照有变动，重建已出现标题索引")
+            self.reset()
+            self._rewrite = True
+            processed = 0
+
+        for entry in snapshots[processed:]:
+            titles_by_id, _ = entry.read(None)
+            new = {}
+            for source_id, title_data in titles_by_id.items():
+                seen = self.first_seen.get(source_id, {})
+                titles = [title for title in title_data if title not in seen]
+                if titles:
+                    new[source_id] = titles
+            record = {"time": entry.time_info, "signature": list(entry.signature), "new": new}
+            self._apply(record)
+            self._pending.append(record)
 
-                title_info[source_id][title]["last_time"] = time_info
-                title_info[source_id][title]["ranks"] = merged_ranks
-                title_info[source_id][title]["count"] += 1
-                if not title_info[source_id][title].get("url"):
-                    title_info[source_id][title]["url"] = url
-                if not title_info[source_id][title].get("mobileUrl"):
-                    title_info[source_id][title]["mobileUrl"] = mobile_url
+        return len(snapshots) - processed
 
+    def first_seen_time(self, source_id: str, title: str) -> Optional[str]:
+        """标题当天首次出现的批次时间，未出现过返回 None"""
+        return self.first_seen.get(source_id, {}).get(title)
 
-def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
-    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
 
-    if not txt_dir.exists():
-        return {}
+_seen_title_index: Optional[SeenTitleIndex] = None
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    if len(files) < 2:
-        return {}
 
-    # 解析最新文件
-    latest_file = files[-1]
-    latest_titles, _ = parse_file_titles(latest_file)
-
-    # 如果指定了当前平台列表，过滤最新文件数据
-    if current_platform_ids is not None:
-        filtered_latest_titles = {}
-        for source_id, title_data in latest_titles.items():
-            if source_id in current_platform_ids:
-                filtered_latest_titles[source_id] = title_data
-        latest_titles = filtered_latest_titles
-
-    # 汇总历史标题（按平台过滤）
-    historical_titles = {}
-    for file_path in files[:-1]:
-        historical_data, _ = parse_file_titles(file_path)
-
-        # 过滤历史数据
-        if current_platform_ids is not None:
-            filtered_historical_data = {}
-            for source_id, title_data in historical_data.items():
-                if source_id in current_platform_ids:
-                    filtered_historical_data[source_id] = title_data
-            historical_data = filtered_historical_data
-
-        for source_id, titles_data in historical_data.items():
-            if source_id not in historical_titles:
-                historical_titles[source_id] = set()
-            for title in titles_data.keys():
-                historical_titles[source_id].add(title)
-
-    # 找出新增标题
-    new_titles = {}
-    for source_id, latest_source_titles in latest_titles.items():
-        historical_set = historical_titles.get(source_id, set())
-        source_new_titles = {}
+def get_seen_title_index(date_folder: Optional[str] = None) -> SeenTitleIndex:
+    """获取某天的已出现标题索引，同一进程内复用，磁盘文件被其他进程更新时重新读取"""
+    global _seen_title_index
+    date_folder = date_folder or format_date_folder()
+    if _seen_title_index is None or _seen_title_index.date_folder != date_folder:
+        _seen_title_index = SeenTitleIndex(date_folder)
+        _seen_title_index.load()
+    elif _seen_title_index.is_stale():
+        _seen_title_index.load()
+    return _seen_title_index
 
-        for title, title_data in latest_source_titles.items():
-            if title not in historical_set:
-                source_new_titles[title] = title_data
 
-        if source_new_titles:
-            new_titles[source_id] = source_new_titles
+# 未配置频率词时使用的虚拟词组，包含所有新闻
+ALL_NEWS_WORD_GROUPS: List[Dict] = [{"required": [], "normal": [], "group_key": "全部新闻"}]
 
-    return new_titles
+
+class WordGroupIndex:
+    """当天各平台标题所属的频率词组和排序权重，随当日汇总（DailyAggregate）按批次增量维护
+
+    保存在 output/<日期>/.group_index.json。rules 为频率词、排名阈值和权重配置的标识，变化时整体重建；
+    ticks 与当日汇总相同作为高水位。每合并一个新批次，只为首次出现的标题做词组匹配，
+    只重算本批次出现过（排名和出现次数有变化）的标题的权重；未匹配任何词组的标题也会记录，不再重复匹配
+    """
+
+    FILE_NAME = ".group_index.json"
+    VERSION = 1
+
+    def __init__(self, date_folder: Optional[str] = None):
+        self.date_folder = date_folder or format_date_folder()
+        self.path = Path("output") / self.date_folder / self.FILE_NAME
+        self._file_signature = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.rules = ""
+        self.ticks: List[List] = []
+        # 词组名 -> 平台ID -> 标题 -> [权重, 最后出现时间]，同一平台内按标题首次出现的顺序
+        self.groups: Dict[str, Dict[str, Dict[str, List]]] = {}
+        # 平台ID -> 标题 -> 所属词组名，未匹配任何词组为 None
+        self.assigned: Dict[str, Dict[str, Optional[str]]] = {}
+
+    @staticmethod
+    def rules_key(word_groups: List[Dict], filter_words: List[str], rank_threshold: int) -> str:
+        payload = json.dumps(
+            [word_groups, filter_words, rank_threshold, CONFIG["WEIGHT_CONFIG"]],
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def is_stale(self) -> bool:
+        """磁盘上的文件是否被其他进程更新过"""
+        return self._stat() != self._file_signature
+
+    def load(self) -> None:
+        """读取磁盘上的索引，文件不存在或格式不符时从空索引开始"""
+        self.reset()
+        self._file_signature = self._stat()
+        if self._file_signature is None:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            for group_key, platforms in data["groups"].items():
+                for source_id, titles in platforms.items():
+                    assigned = self.assigned.setdefault(source_id, {})
+                    for title in titles:
+                        assigned[title] = group_key
+            for source_id, titles in data["unmatched"].items():
+                assigned = self.assigned.setdefault(source_id, {})
+                for title in titles:
+                    assigned[title] = None
+            self.groups = data["groups"]
+            self.rules = data["rules"]
+            self.ticks = data["ticks"]
+        except Exception as e:
+            print(f"读取词组索引失败，将重新建立: {e}")
+            self.reset()
+
+    def save(self) -> None:
+        data = {
+            "version": self.VERSION,
+            "rules": self.rules,
+            "ticks": self.ticks,
+            "groups": self.groups,
+            "unmatched": {
+                source_id: [title for title, group_key in assigned.items() if group_key is None]
+                for source_id, assigned in self.assigned.items()
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_file, self.path)
+            self._file_signature = self._stat()
+        except Exception as e:
+            print(f"保存词组索引失败: {e}")
+
+    def update(
+        self,
+        aggregate: DailyAggregate,
+        word_groups: List[Dict],
+        filter_words: List[str],
+        rank_threshold: int,
+    ) -> int:
+        """按当日汇总中高水位之后合并的批次更新索引，返回新处理的批次数"""
+        rules = self.rules_key(word_groups, filter_words, rank_threshold)
+        processed = len(self.ticks)
+        if rules != self.rules or self.ticks != aggregate.ticks[:processed]:
+            if self.ticks:
+                print("频率词配置或当日汇总有变动，重建词组索引")
+            self.reset()
+            self.rules = rules
+            processed = 0
+        if processed == len(aggregate.ticks):
+            return 0
+
+        table = aggregate.table
+        # 新批次中出现过的标题，最后出现的批次必然是其中之一
+        new_ticks = {
+            table._time_ids[tick[0]]
+            for tick in aggregate.ticks[processed:]
+            if tick[0] in table._time_ids
+        }
+        matcher = get_word_group_matcher(word_groups, filter_words)
+        # 需要重算权重的标题 (词组名, 平台ID, 标题, 最后出现时间)，权重最后按列批量计算
+        touched = []
+        rank_values: List[int] = []
+        rank_offsets = [0]
+        counts = []
+        for source_id, columns in table.platforms.items():
+            assigned = self.assigned.setdefault(source_id, {})
+            for row, last_tick in enumerate(columns.last_ticks):
+                if last_tick not in new_ticks:
+                    continue
+                title = table.titles[columns.title_ids[row]]
+                if title in assigned:
+                    group_key = assigned[title]
+                else:
+                    group_index = matcher.first_group(title)
+                    group_key = assigned[title] = (
+                        word_groups[group_index]["group_key"] if group_index is not None else None
+                    )
+                if group_key is None:
+                    continue
+                touched.append((group_key, source_id, title, table.times[last_tick]))
+                rank_values.extend(columns.ranks(row) or [99])
+                rank_offsets.append(len(rank_values))
+                counts.append(columns.counts[row])
+
+        weights = calculate_news_weights(rank_values, rank_offsets, counts, rank_threshold)
+        for (group_key, source_id, title, last_time), weight in zip(touched, weights):
+            self.groups.setdefault(group_key, {}).setdefault(source_id, {})[title] = [
+                weight,
+                last_time,
+            ]
+
+        self.ticks = [list(tick) for tick in aggregate.ticks]
+        return len(aggregate.ticks) - processed
+
+    def matched_titles(self, group_key: str, source_id: str) -> Dict[str, List]:
+        """某平台匹配该词组的标题 -> [权重, 最后出现时间]，按标题首次出现的顺序"""
+        return self.groups.get(group_key, {}).get(source_id, {})
+
+
+_word_group_index: Optional[WordGroupIndex] = None
+
+
+def get_word_group_index(date_folder: Optional[str] = None) -> WordGroupIndex:
+    """获取某天的词组索引，同一进程内复用，磁盘文件被其他进程更新时重新读取"""
+    global _word_group_index
+    date_folder = date_folder or format_date_folder()
+    if _word_group_index is None or _word_group_index.date_folder != date_folder:
+        _word_group_index = WordGroupIndex(date_folder)
+        _word_group_index.load()
+    elif _word_group_index.is_stale():
+        _word_group_index.load()
+    return _word_group_index
+
+
+def read_word_group_index(
+    word_groups: List[Dict],
+    filter_words: List[str],
+    rank_threshold: int = CONFIG["RANK_THRESHOLD"],
+) -> WordGroupIndex:
+    """按当日汇总增量更新词组索引并返回，需在 read_all_today_titles 合并当天批次之后调用"""
+    if not word_groups:
+        word_groups, filter_words = ALL_NEWS_WORD_GROUPS, []
+    index = get_word_group_index()
+    if index.update(get_daily_aggregate(), word_groups, filter_words, rank_threshold):
+        index.save()
+    return index
 
 
 # === 统计和分析 ===
@@ -1290,44 +4641,124 @@ def calculate_news_weight(
     return total_weight
 
 
-def matches_word_groups(
-    title: str, word_groups: List[Dict], filter_words: List[str]
-) -> bool:
-    """检查标题是否匹配词组规则"""
-    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
-    if not word_groups:
-        return True
+# 少于该条数时 NumPy 的转换开销大于收益，按纯 Python 计算
+NUMPY_MIN_BATCH = 256
 
-    title_lower = title.lower()
 
-    # 过滤词检查
-    if any(filter_word.lower() in title_lower for filter_word in filter_words):
-        return False
+def news_weight_columns(news_items: Iterable[Dict]) -> Tuple[List[int], List[int], List[int]]:
+    """把新闻数据转为批量计算权重的列 (rank_values, rank_offsets, counts)
 
-    # 词组匹配检查
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
+    第 i 条的排名为 rank_values[rank_offsets[i]:rank_offsets[i + 1]]，出现次数缺省为排名个数
+    """
+    rank_values: List[int] = []
+    rank_offsets = [0]
+    counts = []
+    for news in news_items:
+        ranks = news.get("ranks", [])
+        rank_values.extend(ranks)
+        rank_offsets.append(len(rank_values))
+        counts.append(news.get("count", len(ranks)))
+    return rank_values, rank_offsets, counts
+
+
+def calculate_news_weights(
+    rank_values: Sequence[int],
+    rank_offsets: Sequence[int],
+    counts: Sequence[int],
+    rank_threshold: int = CONFIG["RANK_THRESHOLD"],
+) -> List[float]:
+    """批量计算新闻权重，结果与逐条调用 calculate_news_weight 相同
 
-        # 必须词检查
-        if required_words:
-            all_required_present = all(
-                req_word.lower() in title_lower for req_word in required_words
+    排名按列传入（见 news_weight_columns），排名、频次、热度三项权重一次算出；
+    安装了 NumPy 且条数较多时整列向量化计算，否则按纯 Python 逐条计算
+    """
+    weight_config = CONFIG["WEIGHT_CONFIG"]
+    rank_factor = weight_config["RANK_WEIGHT"]
+    frequency_factor = weight_config["FREQUENCY_WEIGHT"]
+    hotness_factor = weight_config["HOTNESS_WEIGHT"]
+
+    if np is not None and len(counts) >= NUMPY_MIN_BATCH:
+        values = np.asarray(rank_values, dtype=np.int64)
+        offsets = np.asarray(rank_offsets, dtype=np.int64)
+        lengths = np.diff(offsets)
+        present = lengths > 0
+        weights = np.zeros(len(lengths))
+        if present.any():
+            # 去掉没有排名的条目后，各段的起点依次相接，可以直接按段求和
+            starts = offsets[:-1][present]
+            rank_sums = np.add.reduceat(11 - np.minimum(values, 10), starts)
+            high_rank_counts = np.add.reduceat((values <= rank_threshold).astype(np.int64), starts)
+            lengths = lengths[present]
+            frequency = np.minimum(np.asarray(counts, dtype=np.int64)[present], 10) * 10
+            weights[present] = (
+                rank_sums / lengths * rank_factor
+                + frequency * frequency_factor
+                + high_rank_counts / lengths * 100 * hotness_factor
             )
-            if not all_required_present:
-                continue
+        return weights.tolist()
+
+    weights = []
+    for index, count in enumerate(counts):
+        start = rank_offsets[index]
+        end = rank_offsets[index + 1]
+        if start == end:
+            weights.append(0.0)
+            continue
+        rank_sum = 0
+        high_rank_count = 0
+        for rank in rank_values[start:end]:
+            rank_sum += 11 - (rank if rank < 10 else 10)
+            if rank <= rank_threshold:
+                high_rank_count += 1
+        length = end - start
+        weights.append(
+            rank_sum / length * rank_factor
+            + min(count, 10) * 10 * frequency_factor
+            + high_rank_count / length * 100 * hotness_factor
+        )
+    return weights
 
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(
-                normal_word.lower() in title_lower for normal_word in normal_words
-            )
-            if not any_normal_present:
-                continue
 
+class TopTitles:
+    """按排序键保留一个词组中前 limit 条标题的有界堆，limit 为 0 时保留全部
+
+    排序键为 (-权重, 最高排名, -出现次数)，完全相同时先加入的在前，
+    结果与对全部标题稳定排序后取前 limit 条相同；堆顶为当前保留的最后一条，新标题更靠前时替换它
+    """
+
+    __slots__ = ("limit", "_heap", "_added")
+
+    def __init__(self, limit: int = 0):
+        self.limit = limit
+        self._heap: List[Tuple] = []
+        self._added = 0
+
+    def add(self, weight: float, entry: Dict) -> None:
+        ranks = entry["ranks"]
+        # 各项取反，元组越小越靠后；加入顺序唯一，比较不会用到 entry
+        item = (weight, -(min(ranks) if ranks else 999), entry["count"], -self._added, entry)
+        self._added += 1
+        if not self.limit:
+            self._heap.append(item)
+        elif len(self._heap) < self.limit:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def titles(self) -> List[Dict]:
+        """按排序键排好的保留标题"""
+        return [item[-1] for item in sorted(self._heap, reverse=True)]
+
+
+def matches_word_groups(
+    title: str, word_groups: List[Dict], filter_words: List[str]
+) -> bool:
+    """检查标题是否匹配词组规则（见 WordGroupMatcher）"""
+    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
+    if not word_groups:
         return True
 
-    return False
+    return get_word_group_matcher(word_groups, filter_words).first_group(title) is not None
 
 
 def format_time_display(first_time: str, last_time: str) -> str:
@@ -1389,18 +4820,35 @@ def count_word_frequency(
     rank_threshold: int = CONFIG["RANK_THRESHOLD"],
     new_titles: Optional[Dict] = None,
     mode: str = "daily",
+    is_first_today: Optional[bool] = None,
+    group_index: Optional[WordGroupIndex] = None,
+    max_titles_per_group: Optional[int] = None,
 ) -> Tuple[List[Dict], int]:
-    """统计词频，支持必须词、频率词、过滤词，并标记新增标题"""
+    """统计词频，支持必须词、频率词、过滤词，并标记新增标题
+
+    is_first_today 为是否当天第一次爬取，不传时读取当天的快照清单判断；
+    group_index 为与 results 对应的当日汇总词组索引（见 read_word_group_index），
+    传入时 daily / current 模式直接按索引取各词组匹配的标题和权重，不再逐条匹配；
+    max_titles_per_group 为每个词组保留的标题数（见 TopTitles），不传时读取配置，0 为不限制，
+    count 仍为匹配的总条数
+    """
+    if max_titles_per_group is None:
+        max_titles_per_group = CONFIG["MAX_TITLES_PER_GROUP"]
 
-    # 如果没有配置词组，创建一个包含所有新闻的虚拟词组
+    # 如果没有配置词组，使用包含所有新闻的虚拟词组
     if not word_groups:
         print("频率词配置为空，将显示所有新闻")
-        word_groups = [{"required": [], "normal": [], "group_key": "全部新闻"}]
+        word_groups = ALL_NEWS_WORD_GROUPS
         filter_words = []  # 清空过滤词，显示所有新闻
 
-    is_first_today = is_first_crawl_today()
+    if not isinstance(title_info, DayTitleView):
+        group_index = None
+
+    if is_first_today is None:
+        is_first_today = is_first_crawl_today()
 
     # 确定处理的数据源和新增标记逻辑
+    latest_time = None
     if mode == "incremental":
         if is_first_today:
             # 增量模式 + 当天第一次：处理所有新闻，都标记为新增
@@ -1413,25 +4861,34 @@ def count_word_frequency(
     elif mode == "current":
         # current 模式：只处理当前时间批次的新闻，但统计信息来自全部历史
         if title_info:
-            latest_time = None
-            for source_titles in title_info.values():
-                for title_data in source_titles.values():
-                    last_time = title_data.get("last_time", "")
-                    if last_time:
-                        if latest_time is None or last_time > latest_time:
-                            latest_time = last_time
+            if isinstance(title_info, DayTitleView):
+                latest_time = title_info.latest_time()
+            else:
+                latest_time = None
+                for source_titles in title_info.values():
+                    for title_data in source_titles.values():
+                        last_time = title_data.get("last_time", "")
+                        if last_time:
+                            if latest_time is None or last_time > latest_time:
+                                latest_time = last_time
 
             # 只处理 last_time 等于最新时间的新闻
-            if latest_time:
+            if latest_time and group_index is not None:
+                # 按词组索引筛选，无需逐条比较
+                results_to_process = results
+                print(
+                    f"当前榜单模式：最新时间 {latest_time}，筛选出 {title_info.count_at(latest_time)} 条当前榜单新闻"
+                )
+            elif latest_time:
                 results_to_process = {}
                 for source_id, source_titles in results.items():
                     if source_id in title_info:
+                        source_info = title_info[source_id]
                         filtered_titles = {}
                         for title, title_data in source_titles.items():
-                            if title in title_info[source_id]:
-                                info = title_info[source_id][title]
-                                if info.get("last_time") == latest_time:
-                                    filtered_titles[title] = title_data
+                            info = source_info.get(title)
+                            if info and info.get("last_time") == latest_time:
+                                filtered_titles[title] = title_data
                         if filtered_titles:
                             results_to_process[source_id] = filtered_titles
 
@@ -1467,145 +4924,124 @@ def count_word_frequency(
 
     for group in word_groups:
         group_key = group["group_key"]
-        word_stats[group_key] = {"count": 0, "titles": {}}
-
-    for source_id, titles_data in results_to_process.items():
-        total_titles += len(titles_data)
-
-        if source_id not in processed_titles:
-            processed_titles[source_id] = {}
+        word_stats[group_key] = {"count": 0, "titles": TopTitles(max_titles_per_group)}
+    unweighted: List[Tuple[str, Dict]] = []  # 待计算权重的 (词组名, 标题数据)，按匹配顺序
+
+    def add_title(
+        group_key: str, source_id: str, title: str, title_data: Dict, weight: Optional[float] = None
+    ) -> None:
+        """把匹配的标题加入词组统计，weight 为 None 时在匹配完成后批量计算排序权重再加入"""
+        nonlocal matched_new_count
+
+        # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
+        if (mode == "incremental" and all_news_are_new) or (
+            mode == "current" and is_first_today
+        ):
+            matched_new_count += 1
+
+        source_ranks = title_data.get("ranks", [])
+        source_url = title_data.get("url", "")
+        source_mobile_url = title_data.get("mobileUrl", "")
+
+        word_stats[group_key]["count"] += 1
+
+        first_time = ""
+        last_time = ""
+        count_info = 1
+        ranks = source_ranks if source_ranks else []
+        url = source_url
+        mobile_url = source_mobile_url
+
+        # 从统计信息中获取完整数据（current 模式下为全部历史）
+        info = (
+            title_info[source_id].get(title)
+            if title_info and source_id in title_info
+            else None
+        )
+        if info:
+            first_time = info.get("first_time", "")
+            last_time = info.get("last_time", "")
+            count_info = info.get("count", 1)
+            if "ranks" in info and info["ranks"]:
+                ranks = info["ranks"]
+            url = info.get("url", source_url)
+            mobile_url = info.get("mobileUrl", source_mobile_url)
 
-        for title, title_data in titles_data.items():
-            if title in processed_titles.get(source_id, {}):
-                continue
+        if not ranks:
+            ranks = [99]
 
-            # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words
-            )
+        time_display = format_time_display(first_time, last_time)
 
-            if not matches_frequency_words:
-                continue
+        source_name = id_to_name.get(source_id, source_id)
 
-            # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
-            if (mode == "incremental" and all_news_are_new) or (
-                mode == "current" and is_first_today
-            ):
-                matched_new_count += 1
-
-            source_ranks = title_data.get("ranks", [])
-            source_url = title_data.get("url", "")
-            source_mobile_url = title_data.get("mobileUrl", "")
-
-            # 找到匹配的词组
-            title_lower = title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑
-                    if required_words:
-                        all_required_present = all(
-                            req_word.lower() in title_lower
-                            for req_word in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            normal_word.lower() in title_lower
-                            for normal_word in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-
-                first_time = ""
-                last_time = ""
-                count_info = 1
-                ranks = source_ranks if source_ranks else []
-                url = source_url
-                mobile_url = source_mobile_url
-
-                # 对于 current 模式，从历史统计信息中获取完整数据
-                if (
-                    mode == "current"
-                    and title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-                elif (
-                    title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
+        # 判断是否为新增
+        is_new = False
+        if all_news_are_new:
+            # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
+            is_new = True
+        elif new_titles and source_id in new_titles:
+            # 检查是否在新增列表中
+            new_titles_for_source = new_titles[source_id]
+            is_new = title in new_titles_for_source
+
+        entry = {
+            "title": title,
+            "source_name": source_name,
+            "first_time": first_time,
+            "last_time": last_time,
+            "time_display": time_display,
+            "count": count_info,
+            "ranks": ranks,
+            "rank_threshold": rank_threshold,
+            "url": url,
+            "mobileUrl": mobile_url,
+            "is_new": is_new,
+        }
+        if weight is None:
+            unweighted.append((group_key, entry))
+        else:
+            word_stats[group_key]["titles"].add(weight, entry)
 
-                if not ranks:
-                    ranks = [99]
+    if group_index is not None and mode != "incremental":
+        # 当日汇总：各词组匹配的标题和权重已在索引中，current 模式只取最后出现于最新批次的标题
+        latest_only = latest_time if mode == "current" else None
+        if latest_only:
+            total_titles = title_info.count_at(latest_only)
+        else:
+            total_titles = sum(len(titles_data) for titles_data in results.values())
+        for group_key in word_stats:
+            for source_id in results:
+                for title, (weight, last_time) in group_index.matched_titles(
+                    group_key, source_id
+                ).items():
+                    if latest_only and last_time != latest_only:
+                        continue
+                    add_title(group_key, source_id, title, {}, weight)
+    else:
+        matcher = get_word_group_matcher(word_groups, filter_words)
+        for source_id, titles_data in results_to_process.items():
+            total_titles += len(titles_data)
 
-                time_display = format_time_display(first_time, last_time)
+            if source_id not in processed_titles:
+                processed_titles[source_id] = {}
 
-                source_name = id_to_name.get(source_id, source_id)
+            for title, title_data in titles_data.items():
+                if title in processed_titles.get(source_id, {}):
+                    continue
 
-                # 判断是否为新增
-                is_new = False
-                if all_news_are_new:
-                    # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
-                    is_new = True
-                elif new_titles and source_id in new_titles:
-                    # 检查是否在新增列表中
-                    new_titles_for_source = new_titles[source_id]
-                    is_new = title in new_titles_for_source
-
-                word_stats[group_key]["titles"][source_id].append(
-                    {
-                        "title": title,
-                        "source_name": source_name,
-                        "first_time": first_time,
-                        "last_time": last_time,
-                        "time_display": time_display,
-                        "count": count_info,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "is_new": is_new,
-                    }
-                )
+                # 一次扫描同时完成过滤词检查和词组匹配，取第一个匹配的词组
+                matched_group = matcher.first_group(title)
+                if matched_group is None:
+                    continue
 
-                if source_id not in processed_titles:
-                    processed_titles[source_id] = {}
+                add_title(word_groups[matched_group]["group_key"], source_id, title, title_data)
                 processed_titles[source_id][title] = True
 
-                break
+    weights = calculate_news_weights(
+        *news_weight_columns(entry for _, entry in unweighted), rank_threshold
+    )
+    for (group_key, entry), weight in zip(unweighted, weights):
+        word_stats[group_key]["titles"].add(weight, entry)
 
     # 最后统一打印汇总信息
     if mode == "incremental":
@@ -1636,7 +5072,7 @@ def count_word_frequency(
             else:
                 print("增量模式：未检测到新增新闻")
     elif mode == "current":
-        total_input_news = sum(len(titles) for titles in results_to_process.values())
+        total_input_news = total_titles
         if is_first_today:
             filter_status = (
                 "全部显示"
@@ -1659,25 +5095,11 @@ def count_word_frequency(
 
     stats = []
     for group_key, data in word_stats.items():
-        all_titles = []
-        for source_id, title_list in data["titles"].items():
-            all_titles.extend(title_list)
-
-        # 按权重排序
-        sorted_titles = sorted(
-            all_titles,
-            key=lambda x: (
-                -calculate_news_weight(x, rank_threshold),
-                min(x["ranks"]) if x["ranks"] else 999,
-                -x["count"],
-            ),
-        )
-
         stats.append(
             {
                 "word": group_key,
                 "count": data["count"],
-                "titles": sorted_titles,
+                "titles": data["titles"].titles(),
                 "percentage": (
                     round(data["count"] / total_titles * 100, 2)
                     if total_titles > 0
@@ -1697,8 +5119,9 @@ def prepare_report_data(
     new_titles: Optional[Dict] = None,
     id_to_name: Optional[Dict] = None,
     mode: str = "daily",
+    frequency_words: Optional[Tuple[List[Dict], List[str]]] = None,
 ) -> Dict:
-    """准备报告数据"""
+    """准备报告数据，frequency_words 为已加载的 (word_groups, filter_words)，不传时重新加载"""
     processed_new_titles = []
 
     # 在增量模式下隐藏新增新闻区域
@@ -1708,7 +5131,7 @@ def prepare_report_data(
     if not hide_new_section:
         filtered_new_titles = {}
         if new_titles and id_to_name:
-            word_groups, filter_words = load_frequency_words()
+            word_groups, filter_words = frequency_words or load_frequency_words()
             for source_id, titles_data in new_titles.items():
                 filtered_titles = {}
                 for title, title_data in titles_data.items():
@@ -1775,6 +5198,8 @@ def prepare_report_data(
                 "count": stat["count"],
                 "percentage": stat.get("percentage", 0),
                 "titles": processed_titles,
+                # 超出 max_titles_per_group 未展示的条数
+                "more_count": stat["count"] - len(processed_titles),
             }
         )
 
@@ -1788,6 +5213,11 @@ def prepare_report_data(
     }
 
 
+def format_more_titles(more_count: int) -> str:
+    """词组内超出展示条数（max_titles_per_group）的标题只显示条数"""
+    return f"  … 另有 {more_count} 条\n"
+
+
 def format_title_for_platform(
     platform: str, title_data: Dict, show_source: bool = True
 ) -> str:
@@ -1954,6 +5384,7 @@ def generate_html_report(
     mode: str = "daily",
     is_daily_summary: bool = False,
     update_info: Optional[Dict] = None,
+    frequency_words: Optional[Tuple[List[Dict], List[str]]] = None,
 ) -> str:
     """生成HTML报告"""
     if is_daily_summary:
@@ -1968,7 +5399,9 @@ def generate_html_report(
 
     file_path = get_output_path("html", filename)
 
-    report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode)
+    report_data = prepare_report_data(
+        stats, failed_ids, new_titles, id_to_name, mode, frequency_words
+    )
 
     html_content = render_html_content(
         report_data, total_titles, is_daily_summary, mode, update_info
@@ -2157,6 +5590,12 @@ def render_html_content(
                 border-bottom: none;
             }
             
+            .news-more {
+                padding: 12px 0 4px;
+                color: #999;
+                font-size: 13px;
+            }
+            
             .news-item.new::after {
                 content: "NEW";
                 position: absolute;
@@ -2457,7 +5896,7 @@ def render_html_content(
     html += f"{total_titles} 条"
 
     # 计算筛选后的热点新闻数量
-    hot_news_count = sum(len(stat["titles"]) for stat in report_data["stats"])
+    hot_news_count = sum(stat["count"] for stat in report_data["stats"])
 
     html += """</span>
                     </div>
@@ -2593,6 +6032,11 @@ def render_html_content(
                         </div>
                     </div>"""
 
+            more_count = stat.get("more_count", 0)
+            if more_count > 0:
+                html += f"""
+                    <div class="news-more">… 另有 {more_count} 条</div>"""
+
             html += """
                 </div>"""
 
@@ -3027,6 +6471,9 @@ def render_feishu_content(
             if j < len(stat["titles"]):
                 text_content += "\n"
 
+        if stat.get("more_count", 0) > 0:
+            text_content += "\n" + format_more_titles(stat["more_count"])
+
         if i < len(report_data["stats"]) - 1:
             text_content += f"\n{CONFIG['FEISHU_MESSAGE_SEPARATOR']}\n\n"
 
@@ -3088,7 +6535,7 @@ def render_dingtalk_content(
     text_content = ""
 
     total_titles = sum(
-        len(stat["titles"]) for stat in report_data["stats"] if stat["count"] > 0
+        stat["count"] for stat in report_data["stats"] if stat["count"] > 0
     )
     now = get_beijing_time()
 
@@ -3125,6 +6572,9 @@ def render_dingtalk_content(
                 if j < len(stat["titles"]):
                     text_content += "\n"
 
+            if stat.get("more_count", 0) > 0:
+                text_content += "\n" + format_more_titles(stat["more_count"])
+
             if i < len(report_data["stats"]) - 1:
                 text_content += f"\n---\n\n"
 
@@ -3195,7 +6645,7 @@ def split_content_into_batches(
     batches = []
 
     total_titles = sum(
-        len(stat["titles"]) for stat in report_data["stats"] if stat["count"] > 0
+        stat["count"] for stat in report_data["stats"] if stat["count"] > 0
     )
     now = get_beijing_time()
 
@@ -3435,6 +6885,22 @@ def split_content_into_batches(
                     current_batch = test_content
                     current_batch_has_content = True
 
+            # 未展示的条数
+            if stat.get("more_count", 0) > 0:
+                more_line = "\n" + format_more_titles(stat["more_count"])
+                test_content = current_batch + more_line
+                if (
+                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
+                    >= max_bytes
+                ):
+                    if current_batch_has_content:
+                        batches.append(current_batch + base_footer)
+                    current_batch = base_header + stats_header + word_header + more_line
+                    current_batch_has_content = True
+                else:
+                    current_batch = test_content
+                    current_batch_has_content = True
+
             # 词组间分隔符
             if i < len(report_data["stats"]) - 1:
                 separator = ""
@@ -3651,6 +7117,7 @@ def send_to_notifications(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     html_file_path: Optional[str] = None,
+    frequency_words: Optional[Tuple[List[Dict], List[str]]] = None,
 ) -> Dict[str, bool]:
     """发送数据到多个通知平台"""
     results = {}
@@ -3674,7 +7141,9 @@ def send_to_notifications(
             else:
                 print(f"推送窗口控制：今天首次推送")
 
-    report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode)
+    report_data = prepare_report_data(
+        stats, failed_ids, new_titles, id_to_name, mode, frequency_words
+    )
 
     feishu_url = CONFIG["FEISHU_WEBHOOK_URL"]
     dingtalk_url = CONFIG["DINGTALK_WEBHOOK_URL"]
@@ -3772,9 +7241,7 @@ def send_to_feishu(
 ) -> bool:
     """发送到飞书（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    http_client = get_http_client(proxy_url)
 
     # 获取分批内容，使用飞书专用的批次大小
     batches = split_content_into_batches(
@@ -3807,7 +7274,7 @@ def send_to_feishu(
                 batch_content = batch_header + batch_content
 
         total_titles = sum(
-            len(stat["titles"]) for stat in report_data["stats"] if stat["count"] > 0
+            stat["count"] for stat in report_data["stats"] if stat["count"] > 0
         )
         now = get_beijing_time()
 
@@ -3822,8 +7289,8 @@ def send_to_feishu(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = http_client.post(
+                webhook_url, headers=headers, json=payload, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3862,9 +7329,7 @@ def send_to_dingtalk(
 ) -> bool:
     """发送到钉钉（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    http_client = get_http_client(proxy_url)
 
     # 获取分批内容，使用钉钉专用的批次大小
     batches = split_content_into_batches(
@@ -3905,8 +7370,8 @@ def send_to_dingtalk(
         }
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = http_client.post(
+                webhook_url, headers=headers, json=payload, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -3943,9 +7408,7 @@ def send_to_wework(
 ) -> bool:
     """发送到企业微信（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    http_client = get_http_client(proxy_url)
 
     # 获取分批内容
     batches = split_content_into_batches(report_data, "wework", update_info, mode=mode)
@@ -3967,8 +7430,8 @@ def send_to_wework(
         payload = {"msgtype": "markdown", "markdown": {"content": batch_content}}
 
         try:
-            response = requests.post(
-                webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
+            response = http_client.post(
+                webhook_url, headers=headers, json=payload, timeout=30
             )
             if response.status_code == 200:
                 result = response.json()
@@ -4008,9 +7471,7 @@ def send_to_telegram(
     headers = {"Content-Type": "application/json"}
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    http_client = get_http_client(proxy_url)
 
     # 获取分批内容
     batches = split_content_into_batches(
@@ -4039,9 +7500,7 @@ def send_to_telegram(
         }
 
         try:
-            response = requests.post(
-                url, headers=headers, json=payload, proxies=proxies, timeout=30
-            )
+            response = http_client.post(url, headers=headers, json=payload, timeout=30)
             if response.status_code == 200:
                 result = response.json()
                 if result.get("ok"):
@@ -4245,9 +7704,7 @@ def send_to_ntfy(
         base_url = f"https://{base_url}"
     url = f"{base_url}/{topic}"
 
-    proxies = None
-    if proxy_url:
-        proxies = {"http": proxy_url, "https": proxy_url}
+    http_client = get_http_client(proxy_url)
 
     # 获取分批内容，使用ntfy专用的4KB限制
     batches = split_content_into_batches(
@@ -4288,11 +7745,10 @@ def send_to_ntfy(
             )
 
         try:
-            response = requests.post(
+            response = http_client.post(
                 url,
                 headers=current_headers,
                 data=batch_content.encode("utf-8"),
-                proxies=proxies,
                 timeout=30,
             )
 
@@ -4309,11 +7765,10 @@ def send_to_ntfy(
                 )
                 time.sleep(10)  # 等待10秒后重试
                 # 重试一次
-                retry_response = requests.post(
+                retry_response = http_client.post(
                     url,
                     headers=current_headers,
                     data=batch_content.encode("utf-8"),
-                    proxies=proxies,
                     timeout=30,
                 )
                 if retry_response.status_code == 200:
@@ -4358,6 +7813,137 @@ def send_to_ntfy(
 
 
 # === 主分析器 ===
+class AnalysisContext:
+    """单个批次的分析上下文
+
+    当天的批次列表、新增标题、当日汇总、词组索引、频率词配置和是否当天第一次爬取在一个批次内只加载和推导一次；
+    词频统计按 (数据范围, 模式) 缓存，实时报告、汇总报告和通知共用同一份结果
+    """
+
+    def __init__(
+        self,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        time_info: str,
+        unchanged_ids: Optional[List[str]] = None,
+        rank_threshold: int = CONFIG["RANK_THRESHOLD"],
+    ):
+        self.results = results
+        self.id_to_name = id_to_name
+        self.failed_ids = failed_ids
+        self.time_info = time_info
+        self.unchanged_ids = unchanged_ids or []
+        self.rank_threshold = rank_threshold
+        self.current_platform_ids = [platform["id"] for platform in CONFIG["PLATFORMS"]]
+        # 键 -> 已推导的结果，结果可能为 None，用字典区分"未加载"
+        self._loaded: Dict[str, object] = {}
+        self._word_stats: Dict[Tuple[str, str], Tuple[List[Dict], int]] = {}
+
+    def _load(self, key: str, loader: Callable[[], object]):
+        if key not in self._loaded:
+            self._loaded[key] = loader()
+        return self._loaded[key]
+
+    def snapshots(self) -> List[SnapshotEntry]:
+        """当天的批次快照（含本批次）"""
+        return self._load("snapshots", list_day_snapshots)
+
+    def new_titles(self) -> Dict:
+        """本批次的新增标题（已按当前监控平台过滤）"""
+        return self._load(
+            "new_titles",
+            lambda: detect_latest_new_titles(
+                self.current_platform_ids, self.unchanged_ids, self.snapshots()
+            ),
+        )
+
+    def frequency_words(self) -> Tuple[List[Dict], List[str]]:
+        """频率词配置 (word_groups, filter_words)"""
+        return self._load("frequency_words", load_frequency_words)
+
+    def is_first_today(self) -> bool:
+        return self._load("is_first_today", is_first_crawl_today)
+
+    def daily_data(self) -> Optional[Tuple[Dict, Dict, Dict]]:
+        """当日汇总 (all_results, id_to_name, title_info)，按当前监控平台过滤；没有数据或读取失败时为 None"""
+        return self._load("daily_data", self._load_daily_data)
+
+    def _load_daily_data(self) -> Optional[Tuple[Dict, Dict, Dict]]:
+        try:
+            print(f"当前监控平台: {self.current_platform_ids}")
+
+            all_results, id_to_name, title_info = read_all_today_titles(
+                self.current_platform_ids, self.snapshots()
+            )
+
+            if not all_results:
+                print("没有找到当天的数据")
+                return None
+
+            total_titles = sum(len(titles) for titles in all_results.values())
+            print(f"读取到 {total_titles} 个标题（已按当前监控平台过滤）")
+            return all_results, id_to_name, title_info
+        except Exception as e:
+            print(f"数据加载失败: {e}")
+            return None
+
+    def group_index(self) -> WordGroupIndex:
+        """当日汇总的词组索引（需已有当日汇总）"""
+
+        def load() -> WordGroupIndex:
+            word_groups, filter_words = self.frequency_words()
+            return read_word_group_index(word_groups, filter_words, self.rank_threshold)
+
+        return self._load("group_index", load)
+
+    def scope_id_to_name(self, scope: str) -> Dict:
+        """数据范围对应的平台名称："tick" 为本批次，"day" 为当日汇总"""
+        if scope == "tick":
+            return self.id_to_name
+        return self.daily_data()[1]
+
+    def word_stats(self, scope: str, mode: str) -> Tuple[List[Dict], int]:
+        """
+        统计词频，同一批次内相同的数据范围和模式只统计一次
+
+        Args:
+            scope: "tick" 为本批次抓取结果，"day" 为当日汇总（需已有数据）
+            mode: 统计模式（daily / current / incremental）
+
+        Returns:
+            count_word_frequency 的结果 (stats, total_titles)，调用方不应原地修改
+        """
+        key = (scope, mode)
+        if key not in self._word_stats:
+            if scope == "tick":
+                table = DayTitleTable()
+                table.add_snapshot(self.time_info, self.results)
+                data_source, id_to_name, title_info = (
+                    self.results,
+                    self.id_to_name,
+                    table.info_view(),
+                )
+                group_index = None
+            else:
+                data_source, id_to_name, title_info = self.daily_data()
+                group_index = self.group_index()
+            word_groups, filter_words = self.frequency_words()
+            self._word_stats[key] = count_word_frequency(
+                data_source,
+                word_groups,
+                filter_words,
+                id_to_name,
+                title_info,
+                self.rank_threshold,
+                self.new_titles(),
+                mode=mode,
+                is_first_today=self.is_first_today(),
+                group_index=group_index,
+            )
+        return self._word_stats[key]
+
+
 class NewsAnalyzer:
     """新闻分析器"""
 
@@ -4401,11 +7987,35 @@ class NewsAnalyzer:
         self.update_info = None
         self.proxy_url = None
         self._setup_proxy()
-        self.data_fetcher = DataFetcher(self.proxy_url)
+        self.data_fetcher = self._create_data_fetcher()
 
         if self.is_github_actions:
             self._check_version_update()
 
+    def _create_data_fetcher(self) -> DataFetcher:
+        """按当前配置创建数据获取器"""
+        # 定时抓取每轮都请求上游，只把响应写入缓存供 MCP trigger_crawl 复用
+        fetch_cache = None
+        if CONFIG["FETCH_CACHE"]["ENABLED"]:
+            fetch_cache = FetchCache(ttl=CONFIG["FETCH_CACHE"]["TTL"], write_only=True)
+        return DataFetcher(
+            self.proxy_url,
+            CONFIG["MAX_CONCURRENCY"],
+            CONFIG["PER_HOST_CONCURRENCY"],
+            CONFIG["PER_HOST_INTERVAL"],
+            CONFIG["HEDGE_AFTER"],
+            fetch_cache=fetch_cache,
+        )
+
+    def reload_config(self) -> None:
+        """配置文件变更后刷新分析器设置（常驻模式使用），数据获取器按新配置重建"""
+        self.request_interval = CONFIG["REQUEST_INTERVAL"]
+        self.report_mode = CONFIG["REPORT_MODE"]
+        self.rank_threshold = CONFIG["RANK_THRESHOLD"]
+        self.proxy_url = None
+        self._setup_proxy()
+        self.data_fetcher = self._create_data_fetcher()
+
     def _detect_docker_environment(self) -> bool:
         """检测是否运行在 Docker 容器中"""
         try:
@@ -4487,100 +8097,31 @@ class NewsAnalyzer:
             )
             return has_matched_news or has_new_news
 
-    def _load_analysis_data(
-        self,
-    ) -> Optional[Tuple[Dict, Dict, Dict, Dict, List, List]]:
-        """统一的数据加载和预处理，使用当前监控平台列表过滤历史数据"""
-        try:
-            # 获取当前配置的监控平台ID列表
-            current_platform_ids = []
-            for platform in CONFIG["PLATFORMS"]:
-                current_platform_ids.append(platform["id"])
-
-            print(f"当前监控平台: {current_platform_ids}")
-
-            all_results, id_to_name, title_info = read_all_today_titles(
-                current_platform_ids
-            )
-
-            if not all_results:
-                print("没有找到当天的数据")
-                return None
-
-            total_titles = sum(len(titles) for titles in all_results.values())
-            print(f"读取到 {total_titles} 个标题（已按当前监控平台过滤）")
-
-            new_titles = detect_latest_new_titles(current_platform_ids)
-            word_groups, filter_words = load_frequency_words()
-
-            return (
-                all_results,
-                id_to_name,
-                title_info,
-                new_titles,
-                word_groups,
-                filter_words,
-            )
-        except Exception as e:
-            print(f"数据加载失败: {e}")
-            return None
-
-    def _prepare_current_title_info(self, results: Dict, time_info: str) -> Dict:
-        """从当前抓取结果构建标题信息"""
-        title_info = {}
-        for source_id, titles_data in results.items():
-            title_info[source_id] = {}
-            for title, title_data in titles_data.items():
-                ranks = title_data.get("ranks", [])
-                url = title_data.get("url", "")
-                mobile_url = title_data.get("mobileUrl", "")
-
-                title_info[source_id][title] = {
-                    "first_time": time_info,
-                    "last_time": time_info,
-                    "count": 1,
-                    "ranks": ranks,
-                    "url": url,
-                    "mobileUrl": mobile_url,
-                }
-        return title_info
-
     def _run_analysis_pipeline(
         self,
-        data_source: Dict,
+        context: "AnalysisContext",
+        scope: str,
         mode: str,
-        title_info: Dict,
-        new_titles: Dict,
-        word_groups: List[Dict],
-        filter_words: List[str],
-        id_to_name: Dict,
         failed_ids: Optional[List] = None,
         is_daily_summary: bool = False,
     ) -> Tuple[List[Dict], str]:
-        """统一的分析流水线：数据处理 → 统计计算 → HTML生成"""
+        """统一的分析流水线：统计计算（同一批次内复用）→ HTML生成
 
-        # 统计计算
-        stats, total_titles = count_word_frequency(
-            data_source,
-            word_groups,
-            filter_words,
-            id_to_name,
-            title_info,
-            self.rank_threshold,
-            new_titles,
-            mode=mode,
-        )
+        scope 为 "tick"（本批次抓取结果）或 "day"（当天全部批次的汇总）
+        """
+        stats, total_titles = context.word_stats(scope, mode)
 
         # HTML生成
         html_file = generate_html_report(
             stats,
             total_titles,
             failed_ids=failed_ids,
-            new_titles=new_titles,
-            id_to_name=id_to_name,
+            new_titles=context.new_titles(),
+            id_to_name=context.scope_id_to_name(scope),
             mode=mode,
             is_daily_summary=is_daily_summary,
             update_info=self.update_info if CONFIG["SHOW_VERSION_UPDATE"] else None,
+            frequency_words=context.frequency_words(),
         )
 
         return stats, html_file
@@ -4594,6 +8135,7 @@ class NewsAnalyzer:
         new_titles: Optional[Dict] = None,
         id_to_name: Optional[Dict] = None,
         html_file_path: Optional[str] = None,
+        frequency_words: Optional[Tuple[List[Dict], List[str]]] = None,
     ) -> bool:
         """统一的通知发送逻辑，包含所有判断条件"""
         has_notification = self._has_notification_configured()
@@ -4613,6 +8155,7 @@ class NewsAnalyzer:
                 self.proxy_url,
                 mode=mode,
                 html_file_path=html_file_path,
+                frequency_words=frequency_words,
             )
             return True
         elif CONFIG["ENABLE_NOTIFICATION"] and not has_notification:
@@ -4636,32 +8179,23 @@ class NewsAnalyzer:
 
         return False
 
-    def _generate_summary_report(self, mode_strategy: Dict) -> Optional[str]:
+    def _generate_summary_report(
+        self, mode_strategy: Dict, context: "AnalysisContext"
+    ) -> Optional[str]:
         """生成汇总报告（带通知）"""
         summary_type = (
             "当前榜单汇总" if mode_strategy["summary_mode"] == "current" else "当日汇总"
         )
         print(f"生成{summary_type}报告...")
 
-        # 加载分析数据
-        analysis_data = self._load_analysis_data()
-        if not analysis_data:
+        # 当日汇总数据（本批次内只加载一次）
+        daily_data = context.daily_data()
+        if not daily_data:
             return None
 
-        all_results, id_to_name, title_info, new_titles, word_groups, filter_words = (
-            analysis_data
-        )
-
         # 运行分析流水线
         stats, html_file = self._run_analysis_pipeline(
-            all_results,
-            mode_strategy["summary_mode"],
-            title_info,
-            new_titles,
-            word_groups,
-            filter_words,
-            id_to_name,
-            is_daily_summary=True,
+            context, "day", mode_strategy["summary_mode"], is_daily_summary=True
         )
 
         print(f"{summary_type}报告已生成: {html_file}")
@@ -4672,37 +8206,28 @@ class NewsAnalyzer:
             mode_strategy["summary_report_type"],
             mode_strategy["summary_mode"],
             failed_ids=[],
-            new_titles=new_titles,
-            id_to_name=id_to_name,
+            new_titles=context.new_titles(),
+            id_to_name=daily_data[1],
             html_file_path=html_file,
+            frequency_words=context.frequency_words(),
         )
 
         return html_file
 
-    def _generate_summary_html(self, mode: str = "daily") -> Optional[str]:
+    def _generate_summary_html(
+        self, context: "AnalysisContext", mode: str = "daily"
+    ) -> Optional[str]:
         """生成汇总HTML"""
         summary_type = "当前榜单汇总" if mode == "current" else "当日汇总"
         print(f"生成{summary_type}HTML...")
 
-        # 加载分析数据
-        analysis_data = self._load_analysis_data()
-        if not analysis_data:
+        # 当日汇总数据（本批次内只加载一次）
+        if not context.daily_data():
             return None
 
-        all_results, id_to_name, title_info, new_titles, word_groups, filter_words = (
-            analysis_data
-        )
-
-        # 运行分析流水线
+        # 运行分析流水线（current 模式下与实时报告的统计结果相同，直接复用）
         _, html_file = self._run_analysis_pipeline(
-            all_results,
-            mode,
-            title_info,
-            new_titles,
-            word_groups,
-            filter_words,
-            id_to_name,
-            is_daily_summary=True,
+            context, "day", mode, is_daily_summary=True
         )
 
         print(f"{summary_type}HTML已生成: {html_file}")
@@ -4729,8 +8254,13 @@ class NewsAnalyzer:
         print(f"报告模式: {self.report_mode}")
         print(f"运行模式: {mode_strategy['description']}")
 
-    def _crawl_data(self) -> Tuple[Dict, Dict, List]:
-        """执行数据爬取"""
+    def _crawl_data(
+        self, crawl_deadline: Optional[float] = None, force_refresh: bool = False
+    ) -> Tuple[Dict, Dict, List, str]:
+        """执行数据爬取并保存本批次快照，返回 (results, id_to_name, failed_ids, 批次时间)
+
+        crawl_deadline 为抓取总时限（秒），force_refresh 时忽略抓取缓存
+        """
         ids = []
         for platform in CONFIG["PLATFORMS"]:
             if "name" in platform:
@@ -4741,109 +8271,102 @@ class NewsAnalyzer:
         print(
             f"配置的监控平台: {[p.get('name', p['id']) for p in CONFIG['PLATFORMS']]}"
         )
-        print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
+        if self.data_fetcher.max_concurrency > 1:
+            print(
+                f"开始爬取数据，最大并发 {self.data_fetcher.max_concurrency}，"
+                f"同域名请求间隔 {self.data_fetcher.per_host_interval} 毫秒"
+            )
+        else:
+            print(f"开始爬取数据，请求间隔 {self.request_interval} 毫秒")
+        if crawl_deadline:
+            print(f"抓取总时限 {crawl_deadline} 秒，超时未返回的平台将记为失败")
         ensure_directory_exists("output")
 
         results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
-            ids, self.request_interval
+            ids,
+            self.request_interval,
+            deadline=crawl_deadline,
+            force_refresh=force_refresh,
         )
 
         title_file = save_titles_to_file(results, id_to_name, failed_ids)
         print(f"标题已保存到: {title_file}")
+        time_info = Path(title_file).stem
+
+        archive_snapshot(results, id_to_name, failed_ids, time_info)
         
         # ========== 新增：生成全部新闻页面 ==========
-        try:
-            generate_all_news_html(results, id_to_name)
-        except Exception as e:
-            print(f"生成全部新闻报告失败: {e}")
+        all_news_path = Path("output") / format_date_folder() / "html" / "all_news.html"
+        if (
+            results
+            and set(results) == set(self.data_fetcher.unchanged_ids)
+            and all_news_path.exists()
+        ):
+            print("所有平台数据与上一批次相同，跳过全部新闻页面生成")
+        else:
+            try:
+                generate_all_news_html(results, id_to_name)
+            except Exception as e:
+                print(f"生成全部新闻报告失败: {e}")
         # ========== 新增结束 ==========
 
-        return results, id_to_name, failed_ids
+        return results, id_to_name, failed_ids, time_info
 
     def _execute_mode_strategy(
-        self, mode_strategy: Dict, results: Dict, id_to_name: Dict, failed_ids: List
+        self, mode_strategy: Dict, context: "AnalysisContext"
     ) -> Optional[str]:
-        """执行模式特定逻辑"""
-        # 获取当前监控平台ID列表
-        current_platform_ids = [platform["id"] for platform in CONFIG["PLATFORMS"]]
-
-        new_titles = detect_latest_new_titles(current_platform_ids)
-        time_info = Path(save_titles_to_file(results, id_to_name, failed_ids)).stem
-        word_groups, filter_words = load_frequency_words()
-
+        """执行模式特定逻辑，context 为本批次的分析上下文（快照已在抓取后保存）"""
         # current模式下，实时推送需要使用完整的历史数据来保证统计信息的完整性
         if self.report_mode == "current":
-            # 加载完整的历史数据（已按当前平台过滤）
-            analysis_data = self._load_analysis_data()
-            if analysis_data:
-                (
-                    all_results,
-                    historical_id_to_name,
-                    historical_title_info,
-                    historical_new_titles,
-                    _,
-                    _,
-                ) = analysis_data
+            # 完整的历史数据（已按当前平台过滤）
+            daily_data = context.daily_data()
+            if daily_data:
+                all_results, historical_id_to_name, _ = daily_data
 
                 print(
                     f"current模式：使用过滤后的历史数据，包含平台：{list(all_results.keys())}"
                 )
 
                 stats, html_file = self._run_analysis_pipeline(
-                    all_results,
-                    self.report_mode,
-                    historical_title_info,
-                    historical_new_titles,
-                    word_groups,
-                    filter_words,
-                    historical_id_to_name,
-                    failed_ids=failed_ids,
+                    context, "day", self.report_mode, failed_ids=context.failed_ids
                 )
 
-                combined_id_to_name = {**historical_id_to_name, **id_to_name}
+                combined_id_to_name = {**historical_id_to_name, **context.id_to_name}
 
                 print(f"HTML报告已生成: {html_file}")
 
                 # 发送实时通知（使用完整历史数据的统计结果）
-                summary_html = None
                 if mode_strategy["should_send_realtime"]:
                     self._send_notification_if_needed(
                         stats,
                         mode_strategy["realtime_report_type"],
                         self.report_mode,
-                        failed_ids=failed_ids,
-                        new_titles=historical_new_titles,
+                        failed_ids=context.failed_ids,
+                        new_titles=context.new_titles(),
                         id_to_name=combined_id_to_name,
                         html_file_path=html_file,
+                        frequency_words=context.frequency_words(),
                     )
             else:
                 print("❌ 严重错误：无法读取刚保存的数据文件")
                 raise RuntimeError("数据一致性检查失败：保存后立即读取失败")
         else:
-            title_info = self._prepare_current_title_info(results, time_info)
             stats, html_file = self._run_analysis_pipeline(
-                results,
-                self.report_mode,
-                title_info,
-                new_titles,
-                word_groups,
-                filter_words,
-                id_to_name,
-                failed_ids=failed_ids,
+                context, "tick", self.report_mode, failed_ids=context.failed_ids
             )
             print(f"HTML报告已生成: {html_file}")
 
             # 发送实时通知（如果需要）
-            summary_html = None
             if mode_strategy["should_send_realtime"]:
                 self._send_notification_if_needed(
                     stats,
                     mode_strategy["realtime_report_type"],
                     self.report_mode,
-                    failed_ids=failed_ids,
-                    new_titles=new_titles,
-                    id_to_name=id_to_name,
+                    failed_ids=context.failed_ids,
+                    new_titles=context.new_titles(),
+                    id_to_name=context.id_to_name,
                     html_file_path=html_file,
+                    frequency_words=context.frequency_words(),
                 )
 
         # 生成汇总报告（如果需要）
@@ -4852,11 +8375,11 @@ class NewsAnalyzer:
             if mode_strategy["should_send_realtime"]:
                 # 如果已经发送了实时通知，汇总只生成HTML不发送通知
                 summary_html = self._generate_summary_html(
-                    mode_strategy["summary_mode"]
+                    context, mode_strategy["summary_mode"]
                 )
             else:
                 # daily模式：直接生成汇总报告并发送通知
-                summary_html = self._generate_summary_report(mode_strategy)
+                summary_html = self._generate_summary_report(mode_strategy, context)
 
         # 打开浏览器（仅在非容器环境）
         if self._should_open_browser() and html_file:
@@ -4876,26 +8399,294 @@ class NewsAnalyzer:
 
         return summary_html
 
-    def run(self) -> None:
-        """执行分析流程"""
+    def run(
+        self, crawl_deadline: Optional[float] = None, force_refresh: bool = False
+    ) -> None:
+        """执行分析流程，crawl_deadline 为抓取总时限（秒），默认读取配置；
+        force_refresh 为 True 时忽略抓取缓存"""
+        if crawl_deadline is None:
+            crawl_deadline = CONFIG["CRAWL_DEADLINE"]
+
         try:
             self._initialize_and_check_config()
 
             mode_strategy = self._get_mode_strategy()
 
-            results, id_to_name, failed_ids = self._crawl_data()
+            results, id_to_name, failed_ids, time_info = self._crawl_data(
+                crawl_deadline, force_refresh
+            )
+
+            context = AnalysisContext(
+                results,
+                id_to_name,
+                failed_ids,
+                time_info,
+                self.data_fetcher.unchanged_ids,
+                self.rank_threshold,
+            )
+            self._execute_mode_strategy(mode_strategy, context)
+
+            self.data_fetcher.print_crawl_summary()
 
-            self._execute_mode_strategy(mode_strategy, results, id_to_name, failed_ids)
+            maintain_storage()
 
         except Exception as e:
             print(f"分析流程执行出错: {e}")
             raise
 
 
+# === 常驻调度 ===
+class CronSchedule:
+    """cron 表达式解析（分 时 日 月 周，与 supercronic 一致使用本地时间）
+
+    支持 *、*/n、a-b、a-b/n、逗号列表、月份/星期英文缩写以及 @hourly 等别名
+    """
+
+    ALIASES = {
+        "@yearly": "0 0 1 1 *",
+        "@annually": "0 0 1 1 *",
+        "@monthly": "0 0 1 * *",
+        "@weekly": "0 0 * * 0",
+        "@daily": "0 0 * * *",
+        "@midnight": "0 0 * * *",
+        "@hourly": "0 * * * *",
+    }
+    MONTH_NAMES = {
+        name: index + 1
+        for index, name in enumerate(
+            ["JAN", "FEB", "MAR", "APR", "MAY", "JUN",
+             "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+        )
+    }
+    WEEKDAY_NAMES = {
+        name: index
+        for index, name in enumerate(["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"])
+    }
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = self.ALIASES.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式需要 5 个字段: {expression}")
+
+        self.minutes = self._parse_field(fields[0], 0, 59)
+        self.hours = self._parse_field(fields[1], 0, 23)
+        self.days = self._parse_field(fields[2], 1, 31)
+        self.months = self._parse_field(fields[3], 1, 12, self.MONTH_NAMES)
+        # 0 和 7 都表示周日
+        weekdays = self._parse_field(fields[4], 0, 7, self.WEEKDAY_NAMES)
+        self.weekdays = {day % 7 for day in weekdays}
+        # 日和周都有限制时满足其一即可（标准 cron 语义）
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(
+        field: str, low: int, high: int, names: Optional[Dict[str, int]] = None
+    ) -> set:
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/", 1)
+                step = int(step_str)
+                if step <= 0:
+                    raise ValueError(f"cron 步长必须为正数: {field}")
+
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_str, end_str = part.split("-", 1)
+                start = CronSchedule._parse_value(start_str, names)
+                end = CronSchedule._parse_value(end_str, names)
+            else:
+                start = CronSchedule._parse_value(part, names)
+                # "5/10" 表示从 5 开始每 10 个单位
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"cron 字段超出范围: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    @staticmethod
+    def _parse_value(value: str, names: Optional[Dict[str, int]]) -> int:
+        if names and value.upper() in names:
+            return names[value.upper()]
+        return int(value)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # Python weekday(): 周一为 0，cron 中周日为 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """返回严格晚于 moment 的下一个触发时间（精确到分钟）"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # 最多向后查找 5 年，覆盖 2 月 29 日这类低频表达式
+        limit = candidate + timedelta(days=366 * 5)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (
+                    candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)
+                ).replace(day=1)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(f"cron 表达式没有可执行时间: {self.expression}")
+
+
+def get_config_mtime() -> Optional[int]:
+    """配置文件修改时间，用于常驻模式判断是否需要重新加载"""
+    config_path = Path(os.environ.get("CONFIG_PATH", "config/config.yaml"))
+    try:
+        return config_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def reload_config() -> bool:
+    """重新加载配置文件并原地更新 CONFIG，失败时保留原配置"""
+    try:
+        new_config = load_config()
+    except Exception as e:
+        print(f"重新加载配置失败，继续使用原配置: {e}")
+        return False
+
+    http_keys = ("HTTP_POOL_SIZE", "CONNECT_TIMEOUT", "READ_TIMEOUT", "PER_HOST_CONCURRENCY")
+    http_changed = any(CONFIG.get(key) != new_config.get(key) for key in http_keys)
+
+    CONFIG.clear()
+    CONFIG.update(new_config)
+
+    if http_changed:
+        close_http_clients()
+    return True
+
+
+def run_daemon(cron_expression: str, immediate_run: bool = False) -> None:
+    """常驻模式：进程内按 cron 表达式调度，批次之间保留解析缓存、连接池和平台状态"""
+    schedule = CronSchedule(cron_expression)
+
+    # 作为容器 PID 1 运行时需要显式处理 SIGTERM，否则 docker stop 要等到超时强杀
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    analyzer = NewsAnalyzer()
+    config_mtime = get_config_mtime()
+    print(f"常驻模式启动，调度表达式: {cron_expression}")
+
+    def run_tick() -> None:
+        nonlocal config_mtime
+        current_mtime = get_config_mtime()
+        if current_mtime != config_mtime:
+            print("检测到配置文件变更，重新加载配置")
+            if reload_config():
+                analyzer.reload_config()
+            config_mtime = current_mtime
+
+        start_time = time.monotonic()
+        start_cpu = time.process_time()
+        try:
+            analyzer.run()
+        except Exception as e:
+            # 单个批次失败不影响后续调度
+            print(f"本次执行失败: {e}")
+        print(
+            f"本次执行耗时 {time.monotonic() - start_time:.2f} 秒"
+            f"（CPU {time.process_time() - start_cpu:.2f} 秒）"
+        )
+
+    if immediate_run:
+        print("启动时立即执行一次")
+        run_tick()
+
+    while True:
+        next_time = schedule.next_after(datetime.now())
+        print(f"下次执行时间: {next_time.strftime('%Y-%m-%d %H:%M')}")
+
+        # 分段休眠并重新计算剩余时间，系统时间被调整时也能按时触发
+        while True:
+            remaining = (next_time - datetime.now()).total_seconds()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 60))
+
+        run_tick()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 热点新闻分析")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="常驻模式，按 CRON_SCHEDULE 在进程内定时执行",
+    )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="忽略抓取缓存，所有平台都重新请求",
+    )
+    parser.add_argument(
+        "--convert-history",
+        action="store_true",
+        help="把 output 中已有的 txt 快照和整天快照库转换为按平台分区的列式快照库（并为缺少快照清单的日期生成清单）后退出",
+    )
+    parser.add_argument(
+        "--backfill-archive",
+        action="store_true",
+        help="把 output 中已有的快照导入 SQLite 归档后退出",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="立即把已结束日期的 txt/html 打包为 archive.zip 并执行保留策略后退出",
+    )
+    args = parser.parse_args()
+
     try:
+        if args.convert_history:
+            converted = convert_txt_history()
+            update_storage_manifest()
+            print(f"已转换 {converted} 天的快照")
+            return
+
+        if args.compact:
+            changed = compact_output(force=True)
+            update_storage_manifest(changed)
+            print(f"已整理 {len(changed)} 天的数据")
+            return
+
+        if args.backfill_archive:
+            archive = NewsArchive()
+            try:
+                imported = archive.backfill()
+            finally:
+                archive.close()
+            print(f"已导入 {imported} 个批次到 {archive.db_path}")
+            return
+
+        if args.daemon:
+            run_daemon(
+                os.environ.get("CRON_SCHEDULE") or "*/30 * * * *",
+                os.environ.get("IMMEDIATE_RUN", "").strip().lower() == "true",
+            )
+            return
+
         analyzer = NewsAnalyzer()
-        analyzer.run()
+        analyzer.run(force_refresh=args.force_refresh)
     except FileNotFoundError as e:
         print(f"❌ 配置文件错误: {e}")
         print("\n请确保以下文件存在:")
@@ -149,6 +149,42 @@ async def get_news_by_date(
 
 
 
+@mcp.tool
+async def get_new_news_since(
+    since_time: Optional[str] = None,
+    date_query: Optional[str] = None,
+    platforms: Optional[List[str]] = None,
+    limit: int = 50,
+    include_url: bool = False
+) -> str:
+    """
+    获取某个爬取批次之后新上榜的新闻（当天首次出现），用于回答"X点之后有什么新消息"
+
+    Args:
+        since_time: 批次时间，如 "09:30"
+            - 指定时：返回该时间之后各批次中首次出现的新闻
+            - 不指定时：只返回最新一批新增的新闻
+        date_query: 日期查询，格式同 get_news_by_date，默认"今天"
+        platforms: 平台ID列表，如 ['zhihu', 'weibo', 'douyin']
+                   - 不指定时：使用 config.yaml 中配置的所有平台
+        limit: 返回条数限制，默认50，最大1000
+        include_url: 是否包含URL链接，默认False（节省token）
+
+    Returns:
+        JSON格式的新增新闻列表，每条包含首次出现的批次时间(first_seen)和当时的排名，
+        按首次出现时间倒序排列；ticks 为覆盖的批次列表
+    """
+    tools = _get_tools()
+    result = tools['data'].get_new_titles_since(
+        since_time=since_time,
+        date_query=date_query,
+        platforms=platforms,
+        limit=limit,
+        include_url=include_url
+    )
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
 # ==================== 高级数据分析工具 ====================
 
 @mcp.tool
@@ -528,7 +564,8 @@ async def get_system_status() -> str:
 async def trigger_crawl(
     platforms: Optional[List[str]] = None,
     save_to_local: bool = False,
-    include_url: bool = False
+    include_url: bool = False,
+    force_refresh: bool = False
 ) -> str:
     """
     手动触发一次爬取任务（可选持久化）
@@ -541,11 +578,15 @@ async def trigger_crawl(
                    - 注意：失败的平台会在返回结果的 failed_platforms 字段中列出
         save_to_local: 是否保存到本地 output 目录，默认 False
         include_url: 是否包含URL链接，默认False（节省token）
+        force_refresh: 是否强制重新请求上游，默认False
+                       - 默认会复用几分钟内（config.yaml 中 crawler.fetch_cache.ttl）抓取过的结果，毫秒级返回
+                       - 需要确保拿到最新数据时设为 True
 
     Returns:
         JSON格式的任务状态信息，包含：
         - platforms: 成功爬取的平台列表
         - failed_platforms: 失败的平台列表（如有）
+        - cached_platforms: 直接复用抓取缓存的平台列表
         - total_news: 爬取的新闻总数
         - data: 新闻数据
 
@@ -553,9 +594,10 @@ async def trigger_crawl(
         - 临时爬取: trigger_crawl(platforms=['zhihu'])
         - 爬取并保存: trigger_crawl(platforms=['weibo'], save_to_local=True)
         - 使用默认平台: trigger_crawl()  # 爬取config.yaml中配置的所有平台
+        - 强制刷新: trigger_crawl(platforms=['zhihu'], force_refresh=True)
     """
     tools = _get_tools()
-    result = tools['system'].trigger_crawl(platforms=platforms, save_to_local=save_to_local, include_url=include_url)
+    result = tools['system'].trigger_crawl(platforms=platforms, save_to_local=save_to_local, include_url=include_url, force_refresh=force_refresh)
     return json.dumps(result, ensure_ascii=False, indent=2)
 
 
@@ -605,22 +647,23 @@ def run_server(
     print("    1. get_latest_news        - 获取最新新闻")
     print("    2. get_news_by_date       - 按日期查询新闻（支持自然语言）")
     print("    3. get_trending_topics    - 获取趋势话题")
+    print("    4. get_new_news_since     - 某批次之后新上榜的新闻")
     print()
     print("    === 智能检索工具 ===")
-    print("    4. search_news                  - 统一新闻搜索（关键词/模糊/实体）")
-    print("    5. search_related_news_history  - 历史相关新闻检索")
+    print("    5. search_news                  - 统一新闻搜索（关键词/模糊/实体）")
+    print("    6. search_related_news_history  - 历史相关新闻检索")
     print()
     print("    === 高级数据分析 ===")
-    print("    6. analyze_topic_trend      - 统一话题趋势分析（热度/生命周期/爆火/预测）")
-    print("    7. analyze_data_insights    - 统一数据洞察分析（平台对比/活跃度/关键词共现）")
-    print("    8. analyze_sentiment        - 情感倾向分析")
-    print("    9. find_similar_news        - 相似新闻查找")
-    print("    10. generate_summary_report - 每日/每周摘要生成")
+    print("    7. analyze_topic_trend      - 统一话题趋势分析（热度/生命周期/爆火/预测）")
+    print("    8. analyze_data_insights    - 统一数据洞察分析（平台对比/活跃度/关键词共现）")
+    print("    9. analyze_sentiment        - 情感倾向分析")
+    print("    10. find_similar_news       - 相似新闻查找")
+    print("    11. generate_summary_report - 每日/每周摘要生成")
     print()
     print("    === 配置与系统管理 ===")
-    print("    11. get_current_config      - 获取当前系统配置")
-    print("    12. get_system_status       - 获取系统运行状态")
-    print("    13. trigger_crawl           - 手动触发爬取任务")
+    print("    12. get_current_config      - 获取当前系统配置")
+    print("    13. get_system_status       - 获取系统运行状态")
+    print("    14. trigger_crawl           - 手动触发爬取任务")
     print("=" * 60)
     print()
 
@@ -0,0 +1,160 @@
+"""
+SQLite 归档查询服务
+
+读取 main.py 写入的 SQLite 新闻归档（config.yaml 中 storage.sqlite，默认 output/news.db），
+按日期、平台和标题索引查询，避免逐日解析快照文件。
+"""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+
+class ArchiveService:
+    """SQLite 归档查询服务类"""
+
+    def __init__(self, db_path: Path):
+        """
+        初始化归档查询服务
+
+        Args:
+            db_path: 归档文件路径
+        """
+        self.db_path = Path(db_path)
+
+    @classmethod
+    def from_config(cls, project_root: Path, config_data: Dict) -> Optional["ArchiveService"]:
+        """
+        按配置创建归档查询服务
+
+        Args:
+            project_root: 项目根目录
+            config_data: config.yaml 解析结果
+
+        Returns:
+            未启用归档或归档文件不存在时返回 None
+        """
+        sqlite_config = (config_data.get("storage") or {}).get("sqlite") or {}
+        if not sqlite_config.get("enabled", False):
+            return None
+
+        db_path = Path(sqlite_config.get("path", "output/news.db"))
+        if not db_path.is_absolute():
+            db_path = project_root / db_path
+        if not db_path.exists():
+            return None
+        return cls(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # 只读打开，不影响定时任务写入
+        return sqlite3.connect(f"{self.db_path.as_uri()}?mode=ro", uri=True)
+
+    def archived_times(self, start_date: str, end_date: str) -> Dict[str, Set[str]]:
+        """
+        查询日期范围内已归档的批次
+
+        Args:
+            start_date: 开始日期 YYYY-MM-DD
+            end_date: 结束日期 YYYY-MM-DD
+
+        Returns:
+            {日期: {批次时间}}
+        """
+        result: Dict[str, Set[str]] = {}
+        with closing(self._connect()) as conn:
+            for date, time_info in conn.execute(
+                "SELECT date, time FROM ticks WHERE date BETWEEN ? AND ?",
+                (start_date, end_date),
+            ):
+                result.setdefault(date, set()).add(time_info)
+        return result
+
+    def query_titles(
+        self,
+        dates: List[str],
+        platforms: Optional[List[str]] = None,
+        keyword: Optional[str] = None
+    ) -> Dict[str, Dict]:
+        """
+        按日期查询标题，结构与 ParserService.read_all_titles_for_date 的 all_titles 相同
+
+        Args:
+            dates: 日期列表 YYYY-MM-DD
+            platforms: 平台ID列表，None表示所有平台
+            keyword: 关键词，不为空时只返回标题包含该词的新闻（不区分大小写）
+
+        Returns:
+            {日期: {platform_id: {title: {ranks, url, mobileUrl}}}}，
+            标题顺序与逐个解析快照文件合并的结果一致，ranks 按批次时间顺序排列，
+            链接取首次出现时的值
+        """
+        if not dates:
+            return {}
+
+        conditions = [f"a.date IN ({','.join('?' * len(dates))})"]
+        params: List = list(dates)
+        if platforms:
+            conditions.append(f"a.platform IN ({','.join('?' * len(platforms))})")
+            params.extend(platforms)
+        if keyword:
+            # 先在去重后的标题表中筛选，再通过 (title_id, date) 索引取出现记录
+            conditions.append(
+                "a.title_id IN (SELECT id FROM titles WHERE instr(search_text, ?) > 0)"
+            )
+            params.append(keyword.lower())
+
+        sql = f"""
+            SELECT a.date, a.platform, t.title, a.rank, u.url, m.url
+            FROM appearances a
+            JOIN ticks k ON k.id = a.tick_id
+            JOIN titles t ON t.id = a.title_id
+            LEFT JOIN urls u ON u.id = a.url_id
+            LEFT JOIN urls m ON m.id = a.mobile_url_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY a.date, k.time, a.seq
+        """
+
+        result: Dict[str, Dict] = {}
+        with closing(self._connect()) as conn:
+            for date, platform_id, title, rank, url, mobile_url in conn.execute(sql, params):
+                titles = result.setdefault(date, {}).setdefault(platform_id, {})
+                info = titles.get(title)
+                if info is None:
+                    titles[title] = {
+                        "ranks": [rank],
+                        "url": url or "",
+                        "mobileUrl": mobile_url or "",
+                    }
+                else:
+                    info["ranks"].append(rank)
+
+            # 平台按当天首次出现的顺序排列（按关键词过滤后，各平台首条匹配的先后不代表快照顺序）
+            platform_order: Dict[str, Dict[str, None]] = {}
+            for date, platforms_text in conn.execute(
+                f"SELECT date, platforms FROM ticks WHERE date IN ({','.join('?' * len(dates))}) "
+                "ORDER BY date, time",
+                dates,
+            ):
+                order = platform_order.setdefault(date, {})
+                for platform_id in filter(None, platforms_text.split(",")):
+                    order.setdefault(platform_id, None)
+
+        for date, platforms_data in result.items():
+            order = list(platform_order.get(date, {})) + list(platforms_data)
+            result[date] = {
+                platform_id: platforms_data[platform_id]
+                for platform_id in dict.fromkeys(order)
+                if platform_id in platforms_data
+            }
+        return result
+
+    def get_platform_names(self) -> Dict[str, str]:
+        """
+        获取平台名称
+
+        Returns:
+            {platform_id: platform_name}
+        """
+        with closing(self._connect()) as conn:
+            return dict(conn.execute("SELECT id, name FROM platforms"))
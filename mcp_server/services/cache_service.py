@@ -5,6 +5,7 @@
 """
 
 import time
+from collections import OrderedDict
 from typing import Any, Optional
 from threading import Lock
 
@@ -12,11 +13,17 @@ from threading import Lock
 class CacheService:
     """缓存服务类"""
 
-    def __init__(self):
-        """初始化缓存服务"""
-        self._cache = {}
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        初始化缓存服务
+
+        Args:
+            max_entries: 最多保留的条目数，超出时淘汰最久未使用的条目；None表示不限制
+        """
+        self._cache = OrderedDict()
         self._timestamps = {}
         self._lock = Lock()
+        self.max_entries = max_entries
 
     def get(self, key: str, ttl: int = 900) -> Optional[Any]:
         """
@@ -33,6 +40,7 @@ class CacheService:
             if key in self._cache:
                 # 检查是否过期
                 if time.time() - self._timestamps[key] < ttl:
+                    self._cache.move_to_end(key)
                     return self._cache[key]
                 else:
                     # 已过期，删除缓存
@@ -50,7 +58,12 @@ class CacheService:
         """
         with self._lock:
             self._cache[key] = value
+            self._cache.move_to_end(key)
             self._timestamps[key] = time.time()
+            if self.max_entries is not None:
+                while len(self._cache) > self.max_entries:
+                    oldest_key, _ = self._cache.popitem(last=False)
+                    del self._timestamps[oldest_key]
 
     def delete(self, key: str) -> bool:
         """
@@ -134,3 +147,21 @@ def get_cache() -> CacheService:
     if _global_cache is None:
         _global_cache = CacheService()
     return _global_cache
+
+
+# 按日读取结果的缓存，容量有限，多天查询时只保留最近使用的若干天
+DAY_CACHE_MAX_ENTRIES = 16
+_day_cache = None
+
+
+def get_day_cache() -> CacheService:
+    """
+    获取按日读取结果的缓存实例
+
+    Returns:
+        容量为 DAY_CACHE_MAX_ENTRIES 的缓存服务实例
+    """
+    global _day_cache
+    if _day_cache is None:
+        _day_cache = CacheService(max_entries=DAY_CACHE_MAX_ENTRIES)
+    return _day_cache
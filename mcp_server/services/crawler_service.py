@@ -0,0 +1,78 @@
+"""
+爬虫引擎服务
+
+复用 main.py 中的数据源适配器和并发抓取引擎（DataFetcher），
+MCP 工具与定时任务使用同一套抓取、重试、限流和熔断逻辑。
+"""
+
+import contextlib
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from threading import Lock
+from types import ModuleType
+from typing import Optional
+
+from ..utils.errors import CrawlTaskError
+
+
+_engine: Optional[ModuleType] = None
+_engine_config_mtime: Optional[int] = None
+_engine_lock = Lock()
+
+
+def get_crawler_engine(project_root: Path) -> ModuleType:
+    """
+    获取爬虫引擎模块（即 main.py，只加载一次）
+
+    main.py 在导入和抓取时会打印日志，这里统一重定向到 stderr，
+    避免污染 stdio 传输模式下的协议输出。配置文件修改后会自动重新加载。
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        main.py 模块对象
+
+    Raises:
+        CrawlTaskError: main.py 不存在或加载失败
+    """
+    global _engine, _engine_config_mtime
+
+    with _engine_lock:
+        if _engine is None:
+            main_path = project_root / "main.py"
+            if not main_path.exists():
+                raise CrawlTaskError(
+                    "爬虫主程序不存在",
+                    suggestion=f"请确保文件存在: {main_path}"
+                )
+
+            # main.py 通过 CONFIG_PATH 定位配置，MCP 服务的工作目录不一定是项目根目录
+            os.environ.setdefault(
+                "CONFIG_PATH", str(project_root / "config" / "config.yaml")
+            )
+
+            spec = importlib.util.spec_from_file_location("trendradar_main", main_path)
+            module = importlib.util.module_from_spec(spec)
+            try:
+                with contextlib.redirect_stdout(sys.stderr):
+                    spec.loader.exec_module(module)
+            except Exception as e:
+                raise CrawlTaskError(
+                    f"加载爬虫引擎失败: {e}",
+                    suggestion="请检查 config/config.yaml 是否正确"
+                )
+
+            _engine = module
+            _engine_config_mtime = module.get_config_mtime()
+
+        else:
+            config_mtime = _engine.get_config_mtime()
+            if config_mtime != _engine_config_mtime:
+                with contextlib.redirect_stdout(sys.stderr):
+                    _engine.reload_config()
+                _engine_config_mtime = config_mtime
+
+        return _engine
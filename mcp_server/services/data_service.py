@@ -4,13 +4,22 @@
 提供统一的数据查询接口,封装数据访问逻辑。
 """
 
+import os
 import re
+import zlib
 from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from .archive_service import ArchiveService
 from .cache_service import get_cache
-from .parser_service import ParserService
+from .parser_service import (
+    COLUMNAR_FILE_NAME,
+    DAY_ARCHIVE_NAME,
+    PARTITIONS_DIR_NAME,
+    SNAPSHOT_MANIFEST_NAME,
+    ParserService,
+)
 from ..utils.errors import DataNotFoundError
 
 
@@ -27,6 +36,91 @@ class DataService:
         self.parser = ParserService(project_root)
         self.cache = get_cache()
 
+    def _get_archive(self) -> Optional[ArchiveService]:
+        """按当前配置获取 SQLite 归档，未启用或不存在时返回 None"""
+        try:
+            config_data = self.parser.parse_yaml_config()
+        except Exception:
+            return None
+        return ArchiveService.from_config(self.parser.project_root, config_data or {})
+
+    def iter_titles_by_date(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        platforms: Optional[List[str]] = None,
+        keyword: Optional[str] = None
+    ) -> Iterator[Tuple[datetime, Dict, Dict]]:
+        """
+        按日期依次返回每天的标题数据
+
+        已完整归档到 SQLite 的日期通过索引一次查询取回，其余日期逐日解析快照文件。
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            platforms: 平台ID列表，None表示所有平台
+            keyword: 关键词，不为空时只返回标题包含该词的新闻（不区分大小写）
+
+        Returns:
+            (日期, all_titles, id_to_name) 迭代器，没有数据的日期返回空字典
+        """
+        dates = []
+        current_date = start_date
+        while current_date <= end_date:
+            dates.append(current_date)
+            current_date += timedelta(days=1)
+        if not dates:
+            return
+
+        # 归档中的批次覆盖了当天全部 txt 快照时才使用归档，避免归档启用前的数据缺失
+        archived = {}
+        id_to_name = {}
+        archive = self._get_archive()
+        if archive:
+            try:
+                archived_times = archive.archived_times(
+                    dates[0].strftime("%Y-%m-%d"), dates[-1].strftime("%Y-%m-%d")
+                )
+                covered = []
+                for date in dates:
+                    date_str = date.strftime("%Y-%m-%d")
+                    times = archived_times.get(date_str)
+                    if not times:
+                        continue
+                    snapshot_times = self.parser.list_txt_snapshot_times(
+                        self.parser.project_root / "output"
+                        / self.parser.get_date_folder_name(date)
+                    )
+                    if snapshot_times <= times:
+                        covered.append(date_str)
+
+                if covered:
+                    archived = archive.query_titles(covered, platforms, keyword)
+                    archived.update({date_str: archived.get(date_str, {}) for date_str in covered})
+                    id_to_name = archive.get_platform_names()
+            except Exception as e:
+                print(f"Warning: 查询 SQLite 归档失败，改为读取快照文件: {e}")
+                archived = {}
+
+        for date in dates:
+            date_str = date.strftime("%Y-%m-%d")
+            if date_str in archived:
+                yield date, archived[date_str], id_to_name
+                continue
+
+            try:
+                all_titles, file_id_to_name, _ = self.parser.read_all_titles_for_date(
+                    date=date,
+                    platform_ids=platforms,
+                    keyword=keyword
+                )
+            except DataNotFoundError:
+                yield date, {}, {}
+                continue
+
+            yield date, all_titles, file_id_to_name
+
     def get_latest_news(
         self,
         platforms: Optional[List[str]] = None,
@@ -181,6 +275,85 @@ class DataService:
 
         return result
 
+    def get_new_titles_since(
+        self,
+        since_time: Optional[str] = None,
+        target_date: Optional[datetime] = None,
+        platforms: Optional[List[str]] = None,
+        limit: int = 50,
+        include_url: bool = False
+    ) -> Dict:
+        """
+        获取某批次之后当天首次出现的新闻
+
+        Args:
+            since_time: 批次时间（如 "09时30分"），返回之后各批次首次出现的新闻；
+                        None表示只返回最新一批新增的新闻
+            target_date: 目标日期，None表示今天
+            platforms: 平台ID列表,None表示所有平台
+            limit: 返回条数限制
+            include_url: 是否包含URL链接,默认False(节省token)
+
+        Returns:
+            包含新增新闻列表和批次信息的字典，新闻按首次出现时间倒序、排名正序排列
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.parser.get_date_folder_name(target_date)
+        day_dir = self.parser.project_root / "output" / date_folder
+        snapshots = self.parser.list_snapshots(day_dir) if day_dir.exists() else []
+        if not snapshots:
+            raise DataNotFoundError(
+                f"{date_folder} 没有数据文件",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+
+        ticks = self.parser.list_new_titles_by_tick(day_dir, snapshots)
+        if since_time is None:
+            since_time = ticks[-2][0] if len(ticks) > 1 else ""
+
+        news_list = []
+        covered_ticks = []
+        for (time_info, new), (_, read_snapshot, _) in zip(ticks, snapshots):
+            if time_info <= since_time:
+                continue
+            covered_ticks.append(time_info)
+            if platforms:
+                new = {platform_id: titles for platform_id, titles in new.items() if platform_id in platforms}
+            if not new:
+                continue
+
+            # 只读取有新增标题的批次，取首次出现时的排名和链接
+            titles_by_id, id_to_name = read_snapshot(list(new))
+            for platform_id, titles in new.items():
+                platform_titles = titles_by_id.get(platform_id, {})
+                for title in titles:
+                    info = platform_titles.get(title, {})
+                    news_item = {
+                        "title": title,
+                        "platform": platform_id,
+                        "platform_name": id_to_name.get(platform_id, platform_id),
+                        "rank": info["ranks"][0] if info.get("ranks") else 0,
+                        "first_seen": time_info,
+                    }
+                    if include_url:
+                        news_item["url"] = info.get("url", "")
+                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+                    news_list.append(news_item)
+
+        news_list.sort(key=lambda x: x["rank"])
+        news_list.sort(key=lambda x: x["first_seen"], reverse=True)
+
+        return {
+            "news": news_list[:limit],
+            "total": len(news_list),
+            "date": (target_date or datetime.now()).strftime("%Y-%m-%d"),
+            "since": since_time or None,
+            "ticks": covered_ticks,
+            "latest_tick": ticks[-1][0],
+        }
+
     def search_news_by_keyword(
         self,
         keyword: str,
@@ -214,44 +387,32 @@ class DataService:
         results = []
         platform_distribution = Counter()
 
-        # 遍历日期范围
-        current_date = start_date
-        while current_date <= end_date:
-            try:
-                all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
-                    date=current_date,
-                    platform_ids=platforms
-                )
-
-                # 搜索包含关键词的标题
-                for platform_id, titles in all_titles.items():
-                    platform_name = id_to_name.get(platform_id, platform_id)
-
-                    for title, info in titles.items():
-                        if keyword.lower() in title.lower():
-                            # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                            results.append({
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
-                                "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            platform_distribution[platform_id] += 1
-
-            except DataNotFoundError:
-                # 该日期没有数据,继续下一天
-                pass
-
-            # 下一天
-            current_date += timedelta(days=1)
+        # 遍历日期范围（已归档的日期走 SQLite 索引查询）
+        for current_date, all_titles, id_to_name in self.iter_titles_by_date(
+            start_date, end_date, platforms, keyword
+        ):
+            # 搜索包含关键词的标题
+            for platform_id, titles in all_titles.items():
+                platform_name = id_to_name.get(platform_id, platform_id)
+
+                for title, info in titles.items():
+                    if keyword.lower() in title.lower():
+                        # 计算平均排名
+                        avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+
+                        results.append({
+                            "title": title,
+                            "platform": platform_id,
+                            "platform_name": platform_name,
+                            "ranks": info["ranks"],
+                            "count": len(info["ranks"]),
+                            "avg_rank": round(avg_rank, 2),
+                            "url": info.get("url", ""),
+                            "mobileUrl": info.get("mobileUrl", ""),
+                            "date": current_date.strftime("%Y-%m-%d")
+                        })
+
+                        platform_distribution[platform_id] += 1
 
         if not results:
             raise DataNotFoundError(
@@ -535,6 +696,51 @@ class DataService:
 
         return (min(available_dates), max(available_dates))
 
+    @staticmethod
+    def _day_storage_signature(day_dir) -> List:
+        """日期目录的变化标识，与 main.py 写入存储清单时的计算方式一致（只取内容相关的值）"""
+        try:
+            content = (day_dir / SNAPSHOT_MANIFEST_NAME).read_bytes()
+            signature: List = [zlib.crc32(content), len(content)]
+        except OSError:
+            signature = [0, 0]
+        try:
+            entries = sorted(os.scandir(day_dir), key=lambda entry: entry.name)
+        except OSError:
+            return signature
+        for entry in entries:
+            if entry.is_file():
+                signature.append([entry.name, 1, entry.stat().st_size])
+            elif entry.is_dir():
+                files = [child.stat().st_size for child in os.scandir(entry.path) if child.is_file()]
+                signature.append([entry.name, len(files), sum(files)])
+        return signature
+
+    @staticmethod
+    def _day_storage_stats(day_dir) -> Dict:
+        """遍历日期目录统计存储占用（清单缺失或过期时使用）"""
+        artifacts: Dict[str, int] = {}
+        for path in day_dir.rglob("*"):
+            if not path.is_file():
+                continue
+            relative = path.relative_to(day_dir)
+            if relative.parts[0] == PARTITIONS_DIR_NAME:
+                artifact = "columnar"
+            elif len(relative.parts) > 1:
+                artifact = relative.parts[0]
+            elif path.name == DAY_ARCHIVE_NAME:
+                artifact = "archive"
+            elif path.name == COLUMNAR_FILE_NAME:
+                artifact = "columnar"
+            else:
+                artifact = "index"
+            artifacts[artifact] = artifacts.get(artifact, 0) + path.stat().st_size
+        return {
+            "bytes": sum(artifacts.values()),
+            "artifacts": artifacts,
+            "compacted": (day_dir / DAY_ARCHIVE_NAME).exists(),
+        }
+
     def get_system_status(self) -> Dict:
         """
         获取系统运行状态
@@ -546,38 +752,48 @@ class DataService:
         output_dir = self.parser.project_root / "output"
 
         total_storage = 0
+        storage_by_type: Dict[str, int] = {}
+        day_count = 0
+        compacted_days = 0
         oldest_record = None
         latest_record = None
-        total_news = 0
 
         if output_dir.exists():
-            # 遍历日期文件夹
+            # 日期目录的统计优先取存储清单，只有清单中缺失或已变化的日期才遍历文件
+            manifest = self.parser.read_storage_manifest()
+
             for date_folder in output_dir.iterdir():
-                if date_folder.is_dir():
-                    # 解析日期
-                    try:
-                        date_str = date_folder.name
-                        # 格式: YYYY年MM月DD日
-                        date_match = re.match(r'(\d{4})年(\d{2})月(\d{2})日', date_str)
-                        if date_match:
-                            folder_date = datetime(
-                                int(date_match.group(1)),
-                                int(date_match.group(2)),
-                                int(date_match.group(3))
-                            )
-
-                            if oldest_record is None or folder_date < oldest_record:
-                                oldest_record = folder_date
-                            if latest_record is None or folder_date > latest_record:
-                                latest_record = folder_date
-
-                    except:
-                        pass
-
-                    # 计算存储大小
+                if not date_folder.is_dir():
+                    continue
+
+                # 解析日期（格式: YYYY年MM月DD日）
+                date_match = re.match(r'(\d{4})年(\d{2})月(\d{2})日$', date_folder.name)
+                if not date_match:
+                    # 其他目录（推送记录、抓取缓存等）直接统计
                     for item in date_folder.rglob("*"):
                         if item.is_file():
                             total_storage += item.stat().st_size
+                    continue
+
+                folder_date = datetime(
+                    int(date_match.group(1)),
+                    int(date_match.group(2)),
+                    int(date_match.group(3))
+                )
+                if oldest_record is None or folder_date < oldest_record:
+                    oldest_record = folder_date
+                if latest_record is None or folder_date > latest_record:
+                    latest_record = folder_date
+
+                entry = manifest.get(date_folder.name)
+                if not entry or entry.get("signature") != self._day_storage_signature(date_folder):
+                    entry = self._day_storage_stats(date_folder)
+
+                day_count += 1
+                compacted_days += bool(entry.get("compacted"))
+                total_storage += entry["bytes"]
+                for artifact, size in entry.get("artifacts", {}).items():
+                    storage_by_type[artifact] = storage_by_type.get(artifact, 0) + size
 
         # 读取版本信息
         version_file = self.parser.project_root / "version"
@@ -596,6 +812,12 @@ class DataService:
             },
             "data": {
                 "total_storage": f"{total_storage / 1024 / 1024:.2f} MB",
+                "storage_by_type": {
+                    artifact: f"{size / 1024 / 1024:.2f} MB"
+                    for artifact, size in sorted(storage_by_type.items())
+                },
+                "days": day_count,
+                "compacted_days": compacted_days,
                 "oldest_record": oldest_record.strftime("%Y-%m-%d") if oldest_record else None,
                 "latest_record": latest_record.strftime("%Y-%m-%d") if latest_record else None,
             },
@@ -0,0 +1,216 @@
+"""
+单日标题的紧凑表示
+
+按日读取的结果（{platform_id: {title: {ranks, url, mobileUrl}}}）不再逐条保存字典：
+标题驻留为整数编号并跨平台共享，链接拼接保存在 UTF-8 字符串池中，排名以链表形式存放在
+array("H") / array("I") 中。通过 Mapping 视图读取，访问某条标题时才还原为字典，
+调用方用法与普通字典相同。结构与 main.py 中的 DayTitleTable 一致。
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+
+
+NO_RANK = 0xFFFFFFFF  # 排名链表的结束标记
+
+
+class TextPool:
+    """只追加的 UTF-8 字符串池，按编号取回；编号 0 为空字符串"""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("I", [0, 0])
+
+    def add(self, text: str) -> int:
+        """
+        追加字符串
+
+        Args:
+            text: 字符串
+
+        Returns:
+            字符串编号，空字符串固定为 0
+        """
+        if not text:
+            return 0
+        self.data += text.encode("utf-8")
+        self.offsets.append(len(self.data))
+        return len(self.offsets) - 2
+
+    def __getitem__(self, text_id: int) -> str:
+        return self.data[self.offsets[text_id]:self.offsets[text_id + 1]].decode("utf-8")
+
+
+class _PlatformColumns:
+    """单个平台的标题列，按首次出现的顺序每个标题一行"""
+
+    __slots__ = (
+        "rows", "title_ids", "url_ids", "mobile_ids",
+        "rank_heads", "rank_tails", "rank_values", "rank_next",
+    )
+
+    def __init__(self):
+        self.rows: Dict[int, int] = {}  # 标题编号 -> 行号
+        self.title_ids = array("I")
+        self.url_ids = array("I")
+        self.mobile_ids = array("I")
+        self.rank_heads = array("I")
+        self.rank_tails = array("I")
+        self.rank_values = array("H")
+        self.rank_next = array("I")
+
+    def add_row(self, title_id: int, url_id: int, mobile_id: int) -> int:
+        row = self.rows[title_id] = len(self.title_ids)
+        self.title_ids.append(title_id)
+        self.url_ids.append(url_id)
+        self.mobile_ids.append(mobile_id)
+        self.rank_heads.append(NO_RANK)
+        self.rank_tails.append(NO_RANK)
+        return row
+
+    def append_ranks(self, row: int, ranks: List[int]) -> None:
+        for rank in ranks:
+            position = len(self.rank_values)
+            self.rank_values.append(rank)
+            self.rank_next.append(NO_RANK)
+            tail = self.rank_tails[row]
+            if tail == NO_RANK:
+                self.rank_heads[row] = position
+            else:
+                self.rank_next[tail] = position
+            self.rank_tails[row] = position
+
+    def ranks(self, row: int) -> List[int]:
+        ranks = []
+        position = self.rank_heads[row]
+        while position != NO_RANK:
+            ranks.append(self.rank_values[position])
+            position = self.rank_next[position]
+        return ranks
+
+
+class DayTitles:
+    """单日各平台标题的紧凑表示，合并规则与 ParserService.read_all_titles_for_date 一致：
+    排名按批次顺序追加，链接取首次出现时的值"""
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self._title_ids: Dict[str, int] = {}
+        self.urls = TextPool()
+        self.platforms: Dict[str, _PlatformColumns] = {}
+
+    def title_id(self, title: str) -> int:
+        """
+        把标题驻留为编号
+
+        Args:
+            title: 标题
+
+        Returns:
+            标题编号，同一标题在各平台共用同一编号
+        """
+        title_id = self._title_ids.get(title)
+        if title_id is None:
+            title_id = self._title_ids[title] = len(self.titles)
+            self.titles.append(title)
+        return title_id
+
+    def add_snapshot(self, titles_by_id: Dict) -> None:
+        """
+        合并一个批次的快照
+
+        Args:
+            titles_by_id: {platform_id: {title: {ranks, url, mobileUrl}}}
+        """
+        for platform_id, titles in titles_by_id.items():
+            columns = self.platforms.get(platform_id)
+            if columns is None:
+                columns = self.platforms[platform_id] = _PlatformColumns()
+            for title, info in titles.items():
+                title_id = self.title_id(title)
+                row = columns.rows.get(title_id)
+                if row is None:
+                    url = info.get("url", "") or ""
+                    mobile_url = info.get("mobileUrl", "") or ""
+                    url_id = self.urls.add(url)
+                    # 移动端链接与链接相同时只保存一份
+                    mobile_id = url_id if mobile_url == url else self.urls.add(mobile_url)
+                    row = columns.add_row(title_id, url_id, mobile_id)
+                columns.append_ranks(row, info["ranks"])
+
+    def entry(self, columns: _PlatformColumns, row: int) -> Dict:
+        """还原一行为 {ranks, url, mobileUrl}"""
+        return {
+            "ranks": columns.ranks(row),
+            "url": self.urls[columns.url_ids[row]],
+            "mobileUrl": self.urls[columns.mobile_ids[row]],
+        }
+
+    def view(self) -> "DayTitlesView":
+        """
+        获取只读映射视图
+
+        Returns:
+            {platform_id: {title: {ranks, url, mobileUrl}}} 结构的视图
+        """
+        return DayTitlesView(self)
+
+
+class PlatformTitlesView(Mapping):
+    """单个平台 {title: {ranks, url, mobileUrl}} 的只读视图"""
+
+    __slots__ = ("_day", "_columns")
+
+    def __init__(self, day: DayTitles, columns: _PlatformColumns):
+        self._day = day
+        self._columns = columns
+
+    def __getitem__(self, title: str) -> Dict:
+        title_id = self._day._title_ids.get(title)
+        row = self._columns.rows.get(title_id) if title_id is not None else None
+        if row is None:
+            raise KeyError(title)
+        return self._day.entry(self._columns, row)
+
+    def __contains__(self, title) -> bool:
+        title_id = self._day._title_ids.get(title)
+        return title_id is not None and title_id in self._columns.rows
+
+    def __iter__(self) -> Iterator[str]:
+        titles = self._day.titles
+        return (titles[title_id] for title_id in self._columns.title_ids)
+
+    def __len__(self) -> int:
+        return len(self._columns.title_ids)
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        day = self._day
+        columns = self._columns
+        return (
+            (day.titles[title_id], day.entry(columns, row))
+            for row, title_id in enumerate(columns.title_ids)
+        )
+
+
+class DayTitlesView(Mapping):
+    """{platform_id: PlatformTitlesView} 的只读视图"""
+
+    __slots__ = ("_day",)
+
+    def __init__(self, day: DayTitles):
+        self._day = day
+
+    def __getitem__(self, platform_id: str) -> PlatformTitlesView:
+        return PlatformTitlesView(self._day, self._day.platforms[platform_id])
+
+    def __contains__(self, platform_id) -> bool:
+        return platform_id in self._day.platforms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._day.platforms)
+
+    def __len__(self) -> int:
+        return len(self._day.platforms)
@@ -1,18 +1,121 @@
 """
 文件解析服务
 
-提供txt格式新闻数据和YAML配置文件的解析功能。
+提供txt格式新闻数据、列式快照库和YAML配置文件的解析功能。
 """
 
+import contextlib
+import json
+import mmap
 import re
+import sys
+import zipfile
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from datetime import datetime
 
 import yaml
 
 from ..utils.errors import FileParseError, DataNotFoundError
-from .cache_service import get_cache
+from .cache_service import get_cache, get_day_cache
+from .crawler_service import get_crawler_engine
+from .day_titles import DayTitles
+
+
+# main.py 中 SeenTitleIndex 的文件名
+SEEN_TITLES_FILE_NAME = ".seen_titles.log"
+# main.py 压缩归档已结束日期时生成的文件，内含 txt/ 和 html/
+DAY_ARCHIVE_NAME = "archive.zip"
+# main.py 维护的存储统计清单
+STORAGE_MANIFEST_NAME = ".storage_manifest.json"
+# main.py 写入快照时维护的当日快照清单（见 main.py 中的 write_snapshot）
+SNAPSHOT_MANIFEST_NAME = ".snapshots.json"
+SNAPSHOT_MANIFEST_VERSION = 1
+# main.py 的列式快照库（ColumnarDayStore / PartitionedDayStore），读取时直接使用 main.py 中的实现
+COLUMNAR_FILE_NAME = "snapshots.col"  # 早期版本的整天快照库
+PARTITIONS_DIR_NAME = "snapshots"  # 按平台分区的快照库目录
+
+
+class LazyTxtSnapshot:
+    """txt 快照的平台分段索引：只扫描分段边界和平台头，按需解析请求的平台"""
+
+    FAILED_MARKER = "==== 以下ID请求失败 ====".encode("utf-8")
+
+    def __init__(self, data, parser: "ParserService"):
+        """
+        建立平台分段索引
+
+        Args:
+            data: txt 快照的字节内容（内存映射的文件或压缩归档中读出的内容）
+            parser: 用于解析标题行的 ParserService
+        """
+        self._data = data
+        self._parser = parser
+        # platform_id -> (分段起点, 分段终点)，与 parse_txt_content 一样同一平台以最后一段为准
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        self.id_to_name: Dict[str, str] = {}
+
+        start = 0
+        size = len(data)
+        while start <= size:
+            end = data.find(b"\n\n", start)
+            if end < 0:
+                end = size
+            self._index_section(start, end)
+            start = end + 2
+
+    def _index_section(self, start: int, end: int) -> None:
+        section = self._data[start:end].strip()
+        if not section or self.FAILED_MARKER in section:
+            return
+        header_end = section.find(b"\n")
+        if header_end < 0:
+            return
+
+        header_line = section[:header_end].decode("utf-8").strip()
+        if " | " in header_line:
+            source_id, name = (part.strip() for part in header_line.split(" | ", 1))
+        else:
+            source_id = name = header_line
+        self.id_to_name[source_id] = name
+        self.sections[source_id] = (start, end)
+
+    def read(
+        self,
+        platform_ids: Optional[List[str]] = None,
+        keyword: Optional[str] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        解析请求的平台
+
+        Args:
+            platform_ids: 平台ID列表，None表示所有平台
+            keyword: 关键词，不为空时只返回标题包含该词的新闻（不区分大小写），平台仍会出现在结果中
+
+        Returns:
+            (titles_by_id, id_to_name) 元组，id_to_name 包含文件中的所有平台
+        """
+        keyword_lower = keyword.lower() if keyword else None
+        titles_by_id = {}
+        for source_id, (start, end) in self.sections.items():
+            if platform_ids is not None and source_id not in platform_ids:
+                continue
+            titles = {}
+            lines = self._data[start:end].decode("utf-8").strip().split("\n")
+            for line in lines[1:]:
+                if not line.strip():
+                    continue
+                try:
+                    title, info = self._parser.parse_title_line(line)
+                except Exception:
+                    # 忽略单行解析错误
+                    continue
+                if keyword_lower and keyword_lower not in title.lower():
+                    continue
+                titles[title] = info
+            titles_by_id[source_id] = titles
+        return titles_by_id, dict(self.id_to_name)
 
 
 class ParserService:
@@ -34,6 +137,7 @@ class ParserService:
 
         # 初始化缓存服务
         self.cache = get_cache()
+        self.day_cache = get_day_cache()
 
     @staticmethod
     def clean_title(title: str) -> str:
@@ -70,79 +174,472 @@ class ParserService:
         if not file_path.exists():
             raise FileParseError(str(file_path), "文件不存在")
 
-        titles_by_id = {}
-        id_to_name = {}
-
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
-                sections = content.split("\n\n")
+        except Exception as e:
+            raise FileParseError(str(file_path), str(e))
 
-                for section in sections:
-                    if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                        continue
+        return self.parse_txt_content(content, str(file_path))
 
-                    lines = section.strip().split("\n")
-                    if len(lines) < 2:
-                        continue
+    def parse_title_line(self, line: str) -> Tuple[str, Dict]:
+        """
+        解析txt快照中的一行标题，格式: 排名. 标题 [URL:链接] [MOBILE:链接]
 
-                    # 解析header: id | name 或 id
-                    header_line = lines[0].strip()
-                    if " | " in header_line:
-                        parts = header_line.split(" | ", 1)
-                        source_id = parts[0].strip()
-                        name = parts[1].strip()
-                        id_to_name[source_id] = name
-                    else:
-                        source_id = header_line
-                        id_to_name[source_id] = source_id
-
-                    titles_by_id[source_id] = {}
-
-                    # 解析标题行
-                    for line in lines[1:]:
-                        if line.strip():
-                            try:
-                                title_part = line.strip()
-                                rank = None
-
-                                # 提取排名
-                                if ". " in title_part and title_part.split(". ")[0].isdigit():
-                                    rank_str, title_part = title_part.split(". ", 1)
-                                    rank = int(rank_str)
-
-                                # 提取 MOBILE URL
-                                mobile_url = ""
-                                if " [MOBILE:" in title_part:
-                                    title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                                    if mobile_part.endswith("]"):
-                                        mobile_url = mobile_part[:-1]
-
-                                # 提取 URL
-                                url = ""
-                                if " [URL:" in title_part:
-                                    title_part, url_part = title_part.rsplit(" [URL:", 1)
-                                    if url_part.endswith("]"):
-                                        url = url_part[:-1]
-
-                                title = self.clean_title(title_part.strip())
-                                ranks = [rank] if rank is not None else [1]
-
-                                titles_by_id[source_id][title] = {
-                                    "ranks": ranks,
-                                    "url": url,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                            except Exception as e:
-                                # 忽略单行解析错误
-                                continue
+        Args:
+            line: 标题行
+
+        Returns:
+            (title, {ranks, url, mobileUrl}) 元组
+        """
+        title_part = line.strip()
+        rank = None
+
+        # 提取排名
+        if ". " in title_part and title_part.split(". ")[0].isdigit():
+            rank_str, title_part = title_part.split(". ", 1)
+            rank = int(rank_str)
+
+        # 提取 MOBILE URL
+        mobile_url = ""
+        if " [MOBILE:" in title_part:
+            title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
+            if mobile_part.endswith("]"):
+                mobile_url = mobile_part[:-1]
+
+        # 提取 URL
+        url = ""
+        if " [URL:" in title_part:
+            title_part, url_part = title_part.rsplit(" [URL:", 1)
+            if url_part.endswith("]"):
+                url = url_part[:-1]
+
+        title = self.clean_title(title_part.strip())
+        ranks = [rank] if rank is not None else [1]
+
+        return title, {
+            "ranks": ranks,
+            "url": url,
+            "mobileUrl": mobile_url,
+        }
+
+    def read_txt_snapshot(
+        self,
+        file_path: Path,
+        platform_ids: Optional[List[str]] = None,
+        keyword: Optional[str] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        以内存映射方式读取txt快照，只解析请求的平台和匹配关键词的标题
 
+        Args:
+            file_path: txt文件路径
+            platform_ids: 平台ID列表，None表示所有平台
+            keyword: 关键词，不为空时只返回标题包含该词的新闻（不区分大小写）
+
+        Returns:
+            (titles_by_id, id_to_name) 元组，id_to_name 包含文件中的所有平台
+
+        Raises:
+            FileParseError: 文件解析错误
+        """
+        try:
+            with open(file_path, "rb") as f:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # 空文件无法映射
+                    return {}, {}
+            with data:
+                return LazyTxtSnapshot(data, self).read(platform_ids, keyword)
         except Exception as e:
             raise FileParseError(str(file_path), str(e))
 
+    def read_archived_txt(
+        self,
+        day_dir: Path,
+        member: str,
+        platform_ids: Optional[List[str]] = None,
+        keyword: Optional[str] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        读取已压缩归档日期中的一个txt快照，只解析请求的平台和匹配关键词的标题
+
+        Args:
+            day_dir: 日期目录
+            member: 归档内的文件名，如 txt/08时30分.txt
+            platform_ids: 平台ID列表，None表示所有平台
+            keyword: 关键词，不为空时只返回标题包含该词的新闻（不区分大小写）
+
+        Returns:
+            (titles_by_id, id_to_name) 元组，id_to_name 包含文件中的所有平台
+
+        Raises:
+            FileParseError: 文件解析错误
+        """
+        archive_path = day_dir / DAY_ARCHIVE_NAME
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                data = archive.read(member)
+            return LazyTxtSnapshot(data, self).read(platform_ids, keyword)
+        except Exception as e:
+            raise FileParseError(f"{archive_path}:{member}", str(e))
+
+    def parse_txt_content(self, content: str, source: str = "") -> Tuple[Dict, Dict]:
+        """
+        解析txt快照内容
+
+        Args:
+            content: txt快照文本
+            source: 来源描述，用于错误信息
+
+        Returns:
+            (titles_by_id, id_to_name) 元组，结构与 parse_txt_file 相同
+
+        Raises:
+            FileParseError: 文件解析错误
+        """
+        titles_by_id = {}
+        id_to_name = {}
+
+        try:
+            sections = content.split("\n\n")
+
+            for section in sections:
+                if not section.strip() or "==== 以下ID请求失败 ====" in section:
+                    continue
+
+                lines = section.strip().split("\n")
+                if len(lines) < 2:
+                    continue
+
+                # 解析header: id | name 或 id
+                header_line = lines[0].strip()
+                if " | " in header_line:
+                    parts = header_line.split(" | ", 1)
+                    source_id = parts[0].strip()
+                    name = parts[1].strip()
+                    id_to_name[source_id] = name
+                else:
+                    source_id = header_line
+                    id_to_name[source_id] = source_id
+
+                titles_by_id[source_id] = {}
+
+                # 解析标题行
+                for line in lines[1:]:
+                    if line.strip():
+                        try:
+                            title, info = self.parse_title_line(line)
+                            titles_by_id[source_id][title] = info
+                        except Exception as e:
+                            # 忽略单行解析错误
+                            continue
+
+        except Exception as e:
+            raise FileParseError(source, str(e))
+
         return titles_by_id, id_to_name
 
+    def read_snapshot_manifest(self, day_dir: Path) -> Optional[Dict[str, Dict]]:
+        """
+        读取某天的快照清单
+
+        Args:
+            day_dir: 日期目录
+
+        Returns:
+            {批次时间: {crc32, size, platforms, failed, saved_at}}，按时间排序；
+            清单不存在（清单出现之前写入的日期）或无法解析时返回 None
+        """
+        try:
+            with open(day_dir / SNAPSHOT_MANIFEST_NAME, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != SNAPSHOT_MANIFEST_VERSION:
+            return None
+        return data.get("ticks", {})
+
+    def list_snapshots(self, day_dir: Path) -> List[Tuple[str, Callable, float]]:
+        """
+        按时间顺序列出某天的批次快照
+
+        批次取自当天的快照清单，清单出现之前写入的日期扫描 txt 目录和压缩归档；
+        有按平台分区的快照库（snapshots/）时从分区读取，只打开请求平台的文件；
+        早期版本的整天快照库（snapshots.col）中已有的批次从该文件读取；
+        其余批次解析 txt 文件（已压缩归档的日期从 archive.zip 中读取）
+
+        Args:
+            day_dir: 日期目录，如 output/2025年11月17日
+
+        Returns:
+            [(文件名, 读取函数, 时间戳)] 列表，读取函数接受 platform_ids 和可选的 keyword 参数，
+            只解析请求的平台和匹配关键词的标题，返回 (titles_by_id, id_to_name)
+        """
+        store_ticks = {}
+        store_path = day_dir / COLUMNAR_FILE_NAME
+        partitions_dir = day_dir / PARTITIONS_DIR_NAME
+        engine = None
+        if store_path.exists() or partitions_dir.is_dir():
+            engine = self._get_store_engine()
+        if engine is not None and store_path.exists():
+            try:
+                with contextlib.redirect_stdout(sys.stderr):
+                    store = engine.ColumnarDayStore(store_path)
+                store_ticks = {
+                    time_info: (partial(self._read_columnar, store, index), store.ticks[index][1])
+                    for time_info, index in store.tick_index().items()
+                }
+            except Exception as e:
+                print(f"Warning: 读取列式快照库 {store_path} 失败: {e}")
+
+        archive_path = day_dir / DAY_ARCHIVE_NAME
+        manifest = self.read_snapshot_manifest(day_dir)
+        if manifest is not None:
+            partitioned = None
+            if engine is not None and partitions_dir.is_dir():
+                partitioned = engine.PartitionedDayStore(partitions_dir)
+            snapshots = []
+            archived = None
+            for time_info, info in manifest.items():
+                if time_info in store_ticks:
+                    read_snapshot, timestamp = store_ticks[time_info]
+                elif partitioned is not None:
+                    source_ids = [
+                        platform_id
+                        for platform_id, count in info.get("platforms", {}).items()
+                        if count
+                    ]
+                    read_snapshot = partial(
+                        self._read_partitioned, partitioned, day_dir, time_info, source_ids
+                    )
+                    timestamp = info.get("saved_at", 0)
+                else:
+                    txt_file = day_dir / "txt" / f"{time_info}.txt"
+                    if txt_file.exists():
+                        read_snapshot = partial(self.read_txt_snapshot, txt_file)
+                    else:
+                        if archived is None:
+                            archived = self._list_archived_txt_safe(archive_path)
+                        if time_info not in archived:
+                            continue
+                        read_snapshot = partial(self.read_archived_txt, day_dir, archived[time_info])
+                    timestamp = info.get("saved_at", 0)
+                snapshots.append((f"{time_info}.txt", read_snapshot, timestamp))
+
+            # 清单未登记的 txt（并发写入时丢失的登记）照常读取
+            txt_dir = day_dir / "txt"
+            if txt_dir.is_dir():
+                unlisted = [
+                    txt_file for txt_file in txt_dir.glob("*.txt") if txt_file.stem not in manifest
+                ]
+                if unlisted:
+                    for txt_file in unlisted:
+                        snapshots.append((
+                            txt_file.name,
+                            partial(self.read_txt_snapshot, txt_file),
+                            txt_file.stat().st_mtime,
+                        ))
+                    snapshots.sort(key=lambda snapshot: snapshot[0])
+            return snapshots
+
+        snapshots = {}
+        if archive_path.exists():
+            archive_mtime = archive_path.stat().st_mtime
+            for time_info, member in self._list_archived_txt_safe(archive_path).items():
+                snapshots[time_info] = (
+                    partial(self.read_archived_txt, day_dir, member),
+                    archive_mtime,
+                )
+
+        txt_dir = day_dir / "txt"
+        if txt_dir.exists():
+            for txt_file in txt_dir.glob("*.txt"):
+                snapshots[txt_file.stem] = (
+                    partial(self.read_txt_snapshot, txt_file),
+                    txt_file.stat().st_mtime,
+                )
+
+        snapshots.update(store_ticks)
+        return [
+            (f"{time_info}.txt", read_snapshot, timestamp)
+            for time_info, (read_snapshot, timestamp) in sorted(snapshots.items())
+        ]
+
+    def _get_store_engine(self):
+        """加载 main.py 以读取列式快照库，失败时返回 None（改读 txt 快照）"""
+        try:
+            return get_crawler_engine(self.project_root)
+        except Exception as e:
+            print(f"Warning: 加载 main.py 失败，不读取列式快照库: {e}")
+            return None
+
+    @staticmethod
+    def _copy_snapshot(snapshot: Tuple[Dict, Dict], keyword: Optional[str]) -> Tuple[Dict, Dict]:
+        """复制快照库读出的批次（快照库内部缓存共享这些字典），keyword 不为空时只保留匹配的标题"""
+        titles_by_id, id_to_name = snapshot
+        keyword_lower = keyword.lower() if keyword else None
+        return {
+            source_id: {
+                title: {**info, "ranks": list(info["ranks"])}
+                for title, info in titles.items()
+                if not keyword_lower or keyword_lower in title.lower()
+            }
+            for source_id, titles in titles_by_id.items()
+        }, dict(id_to_name)
+
+    def _read_columnar(
+        self,
+        store,
+        index: int,
+        platform_ids: Optional[List[str]] = None,
+        keyword: Optional[str] = None
+    ) -> Tuple[Dict, Dict]:
+        """从早期版本的整天快照库读取一个批次"""
+        with contextlib.redirect_stdout(sys.stderr):
+            snapshot = store.read_snapshot(index, platform_ids)
+        return self._copy_snapshot(snapshot, keyword)
+
+    def _read_partitioned(
+        self,
+        store,
+        day_dir: Path,
+        time_info: str,
+        source_ids: List[str],
+        platform_ids: Optional[List[str]] = None,
+        keyword: Optional[str] = None
+    ) -> Tuple[Dict, Dict]:
+        """从分区快照库读取一个批次，分区缺少该批次时改读 txt（或压缩归档中的 txt）"""
+        # main.py 打开分区文件时可能打印日志，重定向到 stderr 以免污染 stdio 协议输出
+        with contextlib.redirect_stdout(sys.stderr):
+            result = store.read_snapshot(time_info, source_ids, platform_ids)
+        if result is not None:
+            return self._copy_snapshot(result, keyword)
+        txt_file = day_dir / "txt" / f"{time_info}.txt"
+        if txt_file.exists():
+            return self.read_txt_snapshot(txt_file, platform_ids, keyword)
+        archived = self._list_archived_txt_safe(day_dir / DAY_ARCHIVE_NAME)
+        if time_info not in archived:
+            raise FileParseError(str(txt_file), "快照不存在")
+        return self.read_archived_txt(day_dir, archived[time_info], platform_ids, keyword)
+
+    def _list_archived_txt_safe(self, archive_path: Path) -> Dict[str, str]:
+        """同 _list_archived_txt，归档不存在或无法读取时返回空字典"""
+        if not archive_path.exists():
+            return {}
+        try:
+            return self._list_archived_txt(archive_path)
+        except Exception as e:
+            print(f"Warning: 读取压缩归档 {archive_path} 失败: {e}")
+            return {}
+
+    @staticmethod
+    def _list_archived_txt(archive_path: Path) -> Dict[str, str]:
+        """压缩归档中的 txt 快照：批次时间 -> 归档内的文件名"""
+        with zipfile.ZipFile(archive_path) as archive:
+            return {
+                Path(name).stem: name
+                for name in archive.namelist()
+                if name.startswith("txt/") and name.endswith(".txt")
+            }
+
+    def list_txt_snapshot_times(self, day_dir: Path) -> set:
+        """
+        列出某天 txt 快照的批次时间（含已压缩归档的），优先读取快照清单，不解析文件内容
+
+        Args:
+            day_dir: 日期目录
+
+        Returns:
+            批次时间集合，如 {"08时30分", "09时00分"}
+        """
+        manifest = self.read_snapshot_manifest(day_dir)
+        if manifest is not None:
+            return set(manifest)
+
+        times = set(self._list_archived_txt_safe(day_dir / DAY_ARCHIVE_NAME))
+        txt_dir = day_dir / "txt"
+        if txt_dir.exists():
+            times.update(path.stem for path in txt_dir.glob("*.txt"))
+        return times
+
+    def read_storage_manifest(self) -> Dict:
+        """
+        读取 main.py 维护的存储统计清单（output/.storage_manifest.json）
+
+        Returns:
+            {日期目录名: {signature, bytes, files, artifacts, compacted}}，清单不存在或无法解析时返回空字典
+        """
+        manifest_path = self.project_root / "output" / STORAGE_MANIFEST_NAME
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("days", {})
+        except (OSError, ValueError):
+            return {}
+
+    def list_new_titles_by_tick(
+        self,
+        day_dir: Path,
+        snapshots: Optional[List[Tuple[str, Callable, float]]] = None
+    ) -> List[Tuple[str, Dict[str, List[str]]]]:
+        """
+        按时间顺序列出每个批次当天首次出现的标题
+
+        优先读取 main.py 按批次追加的已出现标题索引（.seen_titles.log），
+        索引尚未覆盖的批次（如 MCP 手动抓取保存的快照）从快照补齐
+
+        Args:
+            day_dir: 日期目录，如 output/2025年11月17日
+            snapshots: list_snapshots 的结果，不传时重新列出
+
+        Returns:
+            [(批次时间, {platform_id: [本批次首次出现的标题]})] 列表
+        """
+        if snapshots is None:
+            snapshots = self.list_snapshots(day_dir)
+        tick_times = [file_name[:-len(".txt")] for file_name, _, _ in snapshots]
+
+        records = []
+        log_path = day_dir / SEEN_TITLES_FILE_NAME
+        if log_path.exists():
+            try:
+                with open(log_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if not line.endswith("\n"):
+                            break
+                        record = json.loads(line)
+                        records.append((record["time"], record["new"]))
+            except Exception as e:
+                print(f"Warning: 读取已出现标题索引 {log_path} 失败: {e}")
+                records = []
+
+        # 索引与当前快照列表不一致（批次被改写或插入）时全部从快照重新计算
+        if [time_info for time_info, _ in records] != tick_times[:len(records)]:
+            records = []
+
+        seen: Dict[str, set] = {}
+        for _, new in records:
+            for platform_id, titles in new.items():
+                seen.setdefault(platform_id, set()).update(titles)
+
+        for (_, read_snapshot, _), time_info in zip(snapshots[len(records):], tick_times[len(records):]):
+            try:
+                titles_by_id, _ = read_snapshot(None)
+            except Exception as e:
+                print(f"Warning: 解析快照 {time_info} 失败: {e}")
+                titles_by_id = {}
+            new = {}
+            for platform_id, titles in titles_by_id.items():
+                platform_seen = seen.setdefault(platform_id, set())
+                new_titles = [title for title in titles if title not in platform_seen]
+                if new_titles:
+                    new[platform_id] = new_titles
+                    platform_seen.update(new_titles)
+            records.append((time_info, new))
+
+        return records
+
     def get_date_folder_name(self, date: datetime = None) -> str:
         """
         获取日期文件夹名称
@@ -160,18 +657,24 @@ class ParserService:
     def read_all_titles_for_date(
         self,
         date: datetime = None,
-        platform_ids: Optional[List[str]] = None
+        platform_ids: Optional[List[str]] = None,
+        keyword: Optional[str] = None
     ) -> Tuple[Dict, Dict, Dict]:
         """
         读取指定日期的所有标题文件（带缓存）
 
+        快照按需解析，只还原请求的平台和匹配关键词的标题；结果缓存在容量有限的
+        按日缓存中，跨多天的查询占用的内存不随历史天数增长
+
         Args:
             date: 日期对象，默认为今天
             platform_ids: 平台ID列表，None表示所有平台
+            keyword: 关键词，不为空时只返回标题包含该词的新闻（不区分大小写）
 
         Returns:
             (all_titles, id_to_name, all_timestamps) 元组
-            - all_titles: {platform_id: {title: {ranks, url, mobileUrl, ...}}}
+            - all_titles: {platform_id: {title: {ranks, url, mobileUrl, ...}}}，
+              为紧凑表示（见 DayTitles）的只读视图，访问时才还原字典
             - id_to_name: {platform_id: platform_name}
             - all_timestamps: {filename: timestamp}
 
@@ -181,7 +684,7 @@ class ParserService:
         # 生成缓存键
         date_str = self.get_date_folder_name(date)
         platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
-        cache_key = f"read_all_titles:{date_str}:{platform_key}"
+        cache_key = f"read_all_titles:{date_str}:{platform_key}:{(keyword or '').lower()}"
 
         # 尝试从缓存获取
         # 对于历史数据（非今天），使用更长的缓存时间（1小时）
@@ -189,73 +692,66 @@ class ParserService:
         is_today = (date is None) or (date.date() == datetime.now().date())
         ttl = 900 if is_today else 3600  # 15分钟 vs 1小时
 
-        cached = self.cache.get(cache_key, ttl=ttl)
+        cached = self.day_cache.get(cache_key, ttl=ttl)
         if cached:
             return cached
 
         # 缓存未命中，读取文件
         date_folder = self.get_date_folder_name(date)
-        txt_dir = self.project_root / "output" / date_folder / "txt"
+        day_dir = self.project_root / "output" / date_folder
 
-        if not txt_dir.exists():
+        if not day_dir.exists():
             raise DataNotFoundError(
                 f"未找到 {date_folder} 的数据目录",
                 suggestion="请先运行爬虫或检查日期是否正确"
             )
 
-        all_titles = {}
+        day_titles = DayTitles()
         id_to_name = {}
         all_timestamps = {}
 
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+        # 按时间顺序读取所有批次快照
+        snapshots = self.list_snapshots(day_dir)
 
-        if not txt_files:
+        if not snapshots:
             raise DataNotFoundError(
                 f"{date_folder} 没有数据文件",
                 suggestion="请等待爬虫任务完成"
             )
 
-        for txt_file in txt_files:
+        for file_name, read_snapshot, timestamp in snapshots:
             try:
-                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+                titles_by_id, file_id_to_name = read_snapshot(platform_ids, keyword)
 
                 # 更新id_to_name
                 id_to_name.update(file_id_to_name)
 
-                # 合并标题数据
-                for platform_id, titles in titles_by_id.items():
-                    # 如果指定了平台过滤
-                    if platform_ids and platform_id not in platform_ids:
-                        continue
-
-                    if platform_id not in all_titles:
-                        all_titles[platform_id] = {}
-
-                    for title, info in titles.items():
-                        if title in all_titles[platform_id]:
-                            # 合并排名
-                            all_titles[platform_id][title]["ranks"].extend(info["ranks"])
-                        else:
-                            all_titles[platform_id][title] = info.copy()
+                # 合并标题数据（如果指定了平台过滤，只合并这些平台）
+                if platform_ids:
+                    titles_by_id = {
+                        platform_id: titles
+                        for platform_id, titles in titles_by_id.items()
+                        if platform_id in platform_ids
+                    }
+                day_titles.add_snapshot(titles_by_id)
 
-                # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+                # 记录快照时间戳
+                all_timestamps[file_name] = timestamp
 
             except Exception as e:
                 # 忽略单个文件的解析错误，继续处理其他文件
-                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+                print(f"Warning: 解析快照 {file_name} 失败: {e}")
                 continue
 
-        if not all_titles:
+        if not day_titles.platforms:
             raise DataNotFoundError(
                 f"{date_folder} 没有有效的数据",
                 suggestion="请检查数据文件格式或重新运行爬虫"
             )
 
         # 缓存结果
-        result = (all_titles, id_to_name, all_timestamps)
-        self.cache.set(cache_key, result)
+        result = (day_titles.view(), id_to_name, all_timestamps)
+        self.day_cache.set(cache_key, result)
 
         return result
 
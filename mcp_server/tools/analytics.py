@@ -20,6 +20,19 @@ from ..utils.validators import (
 )
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
+try:
+    import numpy as np  # 可选依赖，用于批量计算新闻权重
+except ImportError:
+    np = None
+
+# 权重配置（与 config.yaml 保持一致）
+RANK_WEIGHT = 0.6
+FREQUENCY_WEIGHT = 0.3
+HOTNESS_WEIGHT = 0.1
+
+# 少于该条数时 NumPy 的转换开销大于收益，按纯 Python 计算
+NUMPY_MIN_BATCH = 256
+
 
 def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     """
@@ -43,11 +56,6 @@ def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
 
     count = news_data.get("count", len(ranks))
 
-    # 权重配置（与 config.yaml 保持一致）
-    RANK_WEIGHT = 0.6
-    FREQUENCY_WEIGHT = 0.3
-    HOTNESS_WEIGHT = 0.1
-
     # 1. 排名权重：Σ(11 - min(rank, 10)) / 出现次数
     rank_scores = []
     for rank in ranks:
@@ -74,6 +82,84 @@ def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
     return total_weight
 
 
+def calculate_news_weights(news_list: List[Dict], rank_threshold: int = 5) -> List[float]:
+    """
+    批量计算新闻权重，结果与逐条调用 calculate_news_weight 相同
+
+    排名按列展开后，排名、频次、热度三项权重一次算出；安装了 NumPy 且条数较多时整列向量化计算
+
+    Args:
+        news_list: 新闻数据字典列表，包含 ranks 和 count 字段
+        rank_threshold: 高排名阈值，默认5
+
+    Returns:
+        与 news_list 一一对应的权重列表
+    """
+    # 排名按列展开：第 i 条的排名为 rank_values[rank_offsets[i]:rank_offsets[i + 1]]
+    rank_values = []
+    rank_offsets = [0]
+    counts = []
+    for news in news_list:
+        ranks = news.get("ranks", [])
+        rank_values.extend(ranks)
+        rank_offsets.append(len(rank_values))
+        counts.append(news.get("count", len(ranks)))
+
+    if np is not None and len(counts) >= NUMPY_MIN_BATCH:
+        values = np.asarray(rank_values, dtype=np.int64)
+        offsets = np.asarray(rank_offsets, dtype=np.int64)
+        lengths = np.diff(offsets)
+        present = lengths > 0
+        weights = np.zeros(len(lengths))
+        if present.any():
+            # 去掉没有排名的条目后，各段的起点依次相接，可以直接按段求和
+            starts = offsets[:-1][present]
+            rank_sums = np.add.reduceat(11 - np.minimum(values, 10), starts)
+            high_rank_counts = np.add.reduceat((values <= rank_threshold).astype(np.int64), starts)
+            lengths = lengths[present]
+            frequency = np.minimum(np.asarray(counts, dtype=np.int64)[present], 10) * 10
+            weights[present] = (
+                rank_sums / lengths * RANK_WEIGHT
+                + frequency * FREQUENCY_WEIGHT
+                + high_rank_counts / lengths * 100 * HOTNESS_WEIGHT
+            )
+        return weights.tolist()
+
+    weights = []
+    for index, count in enumerate(counts):
+        start = rank_offsets[index]
+        end = rank_offsets[index + 1]
+        if start == end:
+            weights.append(0.0)
+            continue
+        rank_sum = 0
+        high_rank_count = 0
+        for rank in rank_values[start:end]:
+            rank_sum += 11 - (rank if rank < 10 else 10)
+            if rank <= rank_threshold:
+                high_rank_count += 1
+        length = end - start
+        weights.append(
+            rank_sum / length * RANK_WEIGHT
+            + min(count, 10) * 10 * FREQUENCY_WEIGHT
+            + high_rank_count / length * 100 * HOTNESS_WEIGHT
+        )
+    return weights
+
+
+def sort_news_by_weight(news_list: List[Dict], rank_threshold: int = 5) -> None:
+    """
+    按权重从高到低原地排序，权重预先批量计算，权重相同时保持原有顺序
+
+    Args:
+        news_list: 新闻数据字典列表，包含 ranks 和 count 字段
+        rank_threshold: 高排名阈值，默认5
+    """
+    weights = calculate_news_weights(news_list, rank_threshold)
+    order = sorted(range(len(news_list)), key=weights.__getitem__, reverse=True)
+    news_list[:] = [news_list[index] for index in order]
+
+
 class AnalyticsTools:
     """高级数据分析工具类"""
 
@@ -306,41 +392,27 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
-            # 收集趋势数据
+            # 收集趋势数据（已归档的日期走 SQLite 索引查询，没有数据的日期计为 0）
             trend_data = []
-            current_date = start_date
-
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该时间点的话题出现次数
-                    count = 0
-                    matched_titles = []
-
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-                                matched_titles.append(title)
-
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count,
-                        "sample_titles": matched_titles[:3]  # 只保留前3个样本
-                    })
 
-                except DataNotFoundError:
-                    trend_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0,
-                        "sample_titles": []
-                    })
+            for current_date, all_titles, _ in self.data_service.iter_titles_by_date(
+                start_date, end_date, keyword=topic
+            ):
+                # 统计该时间点的话题出现次数
+                count = 0
+                matched_titles = []
 
-                # 按天增加时间
-                current_date += timedelta(days=1)
+                for _, titles in all_titles.items():
+                    for title in titles.keys():
+                        if topic.lower() in title.lower():
+                            count += 1
+                            matched_titles.append(title)
+
+                trend_data.append({
+                    "date": current_date.strftime("%Y-%m-%d"),
+                    "count": count,
+                    "sample_titles": matched_titles[:3]  # 只保留前3个样本
+                })
 
             # 计算趋势指标
             counts = [item["count"] for item in trend_data]
@@ -755,10 +827,7 @@ class AnalyticsTools:
 
             # 按权重排序（如果启用）
             if sort_by_weight:
-                deduplicated_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                sort_news_by_weight(deduplicated_news)
 
             # 限制返回数量
             selected_news = deduplicated_news[:limit]
@@ -1116,10 +1185,7 @@ class AnalyticsTools:
 
             # 按权重排序（如果启用）
             if sort_by_weight:
-                related_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                sort_news_by_weight(related_news)
             else:
                 # 按排名排序
                 related_news.sort(key=lambda x: x["rank"])
@@ -1507,34 +1573,22 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
-            # 收集话题历史数据
+            # 收集话题历史数据（已归档的日期走 SQLite 索引查询，没有数据的日期计为 0）
             lifecycle_data = []
-            current_date = start_date
-            while current_date <= end_date:
-                try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该日的话题出现次数
-                    count = 0
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": count
-                    })
-
-                except DataNotFoundError:
-                    lifecycle_data.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "count": 0
-                    })
+            for current_date, all_titles, _ in self.data_service.iter_titles_by_date(
+                start_date, end_date, keyword=topic
+            ):
+                # 统计该日的话题出现次数
+                count = 0
+                for _, titles in all_titles.items():
+                    for title in titles.keys():
+                        if topic.lower() in title.lower():
+                            count += 1
 
-                current_date += timedelta(days=1)
+                lifecycle_data.append({
+                    "date": current_date.strftime("%Y-%m-%d"),
+                    "count": count
+                })
 
             # 计算分析天数
             total_days = (end_date - start_date).days + 1
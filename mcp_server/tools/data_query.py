@@ -14,7 +14,8 @@ from ..utils.validators import (
     validate_date_range,
     validate_top_n,
     validate_mode,
-    validate_date_query
+    validate_date_query,
+    validate_tick_time
 )
 from ..utils.errors import MCPError
 
@@ -282,3 +283,70 @@ class DataQueryTools:
                 }
             }
 
+    def get_new_titles_since(
+        self,
+        since_time: Optional[str] = None,
+        date_query: Optional[str] = None,
+        platforms: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        include_url: bool = False
+    ) -> Dict:
+        """
+        查询某批次之后新出现的新闻
+
+        Args:
+            since_time: 批次时间，如 "09:30"，返回该批次之后当天首次出现的新闻；
+                        不指定时只返回最新一批新增的新闻
+            date_query: 日期查询字符串（可选，默认"今天"），格式同 get_news_by_date
+            platforms: 平台ID列表，如 ['zhihu', 'weibo']
+            limit: 返回条数限制，默认50
+            include_url: 是否包含URL链接，默认False（节省token）
+
+        Returns:
+            新增新闻列表字典
+
+        Example:
+            >>> tools = DataQueryTools()
+            >>> result = tools.get_new_titles_since(since_time="09:30", platforms=['zhihu'])
+            >>> print(result['ticks'])
+            ['10时00分', '10时30分']
+        """
+        try:
+            # 参数验证
+            if since_time is not None:
+                since_time = validate_tick_time(since_time)
+            if date_query is None:
+                date_query = "今天"
+            target_date = validate_date_query(date_query)
+            platforms = validate_platforms(platforms)
+            limit = validate_limit(limit, default=50)
+
+            # 获取数据
+            result = self.data_service.get_new_titles_since(
+                since_time=since_time,
+                target_date=target_date,
+                platforms=platforms,
+                limit=limit,
+                include_url=include_url
+            )
+
+            return {
+                **result,
+                "date_query": date_query,
+                "platforms": platforms,
+                "success": True
+            }
+
+        except MCPError as e:
+            return {
+                "success": False,
+                "error": e.to_dict()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": str(e)
+                }
+            }
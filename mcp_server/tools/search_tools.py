@@ -187,8 +187,8 @@ class SearchTools:
             if sort_by == "relevance":
                 all_matches.sort(key=lambda x: x.get("similarity_score", 1.0), reverse=True)
             elif sort_by == "weight":
-                from .analytics import calculate_news_weight
-                all_matches.sort(key=lambda x: calculate_news_weight(x), reverse=True)
+                from .analytics import sort_news_by_weight
+                sort_news_by_weight(all_matches)
             elif sort_by == "date":
                 all_matches.sort(key=lambda x: x.get("date", ""), reverse=True)
 
@@ -572,15 +572,13 @@ class SearchTools:
                     suggestion="请提供更详细的文本内容"
                 )
 
-            # 收集所有相关新闻
+            # 收集所有相关新闻（已归档的日期走 SQLite 索引查询）
             all_related_news = []
-            current_date = search_start
 
-            while current_date <= search_end:
+            for current_date, all_titles, id_to_name in self.data_service.iter_titles_by_date(
+                search_start, search_end
+            ):
                 try:
-                    # 读取该日期的数据
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(current_date)
-
                     # 搜索相关新闻
                     for platform_id, titles in all_titles.items():
                         platform_name = id_to_name.get(platform_id, platform_id)
@@ -621,16 +619,10 @@ class SearchTools:
 
                                 all_related_news.append(news_item)
 
-                except DataNotFoundError:
-                    # 该日期没有数据，继续下一天
-                    pass
                 except Exception as e:
                     # 记录错误但继续处理其他日期
                     print(f"Warning: 处理日期 {current_date.strftime('%Y-%m-%d')} 时出错: {e}")
 
-                # 移动到下一天
-                current_date += timedelta(days=1)
-
             if not all_related_news:
                 return {
                     "success": True,
@@ -4,9 +4,12 @@
 实现系统状态查询和爬虫触发功能。
 """
 
+import contextlib
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from ..services.crawler_service import get_crawler_engine
 from ..services.data_service import DataService
 from ..utils.validators import validate_platforms
 from ..utils.errors import MCPError, CrawlTaskError
@@ -65,7 +68,7 @@ class SystemManagementTools:
                 }
             }
 
-    def trigger_crawl(self, platforms: Optional[List[str]] = None, save_to_local: bool = False, include_url: bool = False) -> Dict:
+    def trigger_crawl(self, platforms: Optional[List[str]] = None, save_to_local: bool = False, include_url: bool = False, force_refresh: bool = False) -> Dict:
         """
         手动触发一次临时爬取任务（可选持久化）
 
@@ -73,6 +76,8 @@ class SystemManagementTools:
             platforms: 指定平台列表，为空则爬取所有平台
             save_to_local: 是否保存到本地 output 目录，默认 False
             include_url: 是否包含URL链接，默认False（节省token）
+            force_refresh: 是否忽略抓取缓存强制请求上游，默认 False
+                （缓存有效期内直接复用定时任务或上次手动抓取的结果）
 
         Returns:
             爬取结果字典，包含新闻数据和保存路径（如果保存）
@@ -87,10 +92,7 @@ class SystemManagementTools:
             >>> print(result['saved_files'])
         """
         try:
-            import json
             import time
-            import random
-            import requests
             from datetime import datetime
             import pytz
             import yaml
@@ -130,7 +132,12 @@ class SystemManagementTools:
                 target_platforms = all_platforms
 
             # 获取请求间隔
-            request_interval = config_data.get("crawler", {}).get("request_interval", 100)
+            crawler_config = config_data.get("crawler", {})
+            request_interval = crawler_config.get("request_interval", 100)
+
+            proxy_url = None
+            if crawler_config.get("use_proxy", False):
+                proxy_url = crawler_config.get("default_proxy")
 
             # 构建平台ID列表
             ids = []
@@ -142,84 +149,41 @@ class SystemManagementTools:
 
             print(f"开始临时爬取，平台: {[p.get('name', p['id']) for p in target_platforms]}")
 
-            # 爬取数据
-            results = {}
-            id_to_name = {}
-            failed_ids = []
-
-            for i, id_info in enumerate(ids):
-                if isinstance(id_info, tuple):
-                    id_value, name = id_info
-                else:
-                    id_value = id_info
-                    name = id_value
-
-                id_to_name[id_value] = name
-
-                # 构建请求URL
-                url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Accept": "application/json, text/plain, */*",
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Connection": "keep-alive",
-                    "Cache-Control": "no-cache",
-                }
-
-                # 重试机制
-                max_retries = 2
-                retries = 0
-                success = False
-
-                while retries <= max_retries and not success:
-                    try:
-                        response = requests.get(url, headers=headers, timeout=10)
-                        response.raise_for_status()
-
-                        data_text = response.text
-                        data_json = json.loads(data_text)
-
-                        status = data_json.get("status", "未知")
-                        if status not in ["success", "cache"]:
-                            raise ValueError(f"响应状态异常: {status}")
-
-                        status_info = "最新数据" if status == "success" else "缓存数据"
-                        print(f"获取 {id_value} 成功（{status_info}）")
-
-                        # 解析数据
-                        results[id_value] = {}
-                        for index, item in enumerate(data_json.get("items", []), 1):
-                            title = item["title"]
-                            url_link = item.get("url", "")
-                            mobile_url = item.get("mobileUrl", "")
-
-                            if title in results[id_value]:
-                                results[id_value][title]["ranks"].append(index)
-                            else:
-                                results[id_value][title] = {
-                                    "ranks": [index],
-                                    "url": url_link,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                        success = True
-
-                    except Exception as e:
-                        retries += 1
-                        if retries <= max_retries:
-                            wait_time = random.uniform(3, 5)
-                            print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                            time.sleep(wait_time)
-                        else:
-                            print(f"请求 {id_value} 失败: {e}")
-                            failed_ids.append(id_value)
-
-                # 请求间隔
-                if i < len(ids) - 1:
-                    actual_interval = request_interval + random.randint(-10, 20)
-                    actual_interval = max(50, actual_interval)
-                    time.sleep(actual_interval / 1000)
+            # 使用与 main.py 相同的数据源适配器和并发抓取引擎，
+            # 平台健康度状态和抓取缓存与定时任务共享，临时抓取不更新当天的响应指纹
+            engine = get_crawler_engine(self.project_root)
+            fetch_cache_config = crawler_config.get("fetch_cache") or {}
+            fetch_cache = None
+            if fetch_cache_config.get("enabled", True):
+                fetch_cache = engine.FetchCache(
+                    self.project_root / "output" / ".fetch_cache",
+                    fetch_cache_config.get("ttl", 300),
+                )
+            fetcher = engine.DataFetcher(
+                proxy_url,
+                crawler_config.get("max_concurrency", 8),
+                crawler_config.get("per_host_concurrency", 8),
+                crawler_config.get("per_host_interval", 50),
+                crawler_config.get("hedge_after", 0),
+                platforms=all_platforms,
+                sources_config=crawler_config.get("sources") or {},
+                health_file=self.project_root / "output" / ".crawler_health.json",
+                track_fingerprints=False,
+                keep_details=False,
+                fetch_cache=fetch_cache,
+            )
+            with contextlib.redirect_stdout(sys.stderr):
+                results, id_to_name, failed_ids = fetcher.crawl_websites(
+                    ids,
+                    request_interval,
+                    crawler_config.get("crawl_deadline", 0),
+                    force_refresh=force_refresh,
+                )
+            cached_platforms = [
+                platform_id
+                for platform_id, stats in fetcher.crawl_stats.items()
+                if stats.get("cached")
+            ]
 
             # 格式化返回数据
             news_data = []
@@ -253,6 +217,7 @@ class SystemManagementTools:
                 "platforms": list(results.keys()),
                 "total_news": len(news_data),
                 "failed_platforms": failed_ids,
+                "cached_platforms": cached_platforms,
                 "data": news_data,
                 "saved_to_local": save_to_local
             }
@@ -260,18 +225,6 @@ class SystemManagementTools:
             # 如果需要持久化，调用保存逻辑
             if save_to_local:
                 try:
-                    import re
-
-                    # 辅助函数：清理标题
-                    def clean_title(title: str) -> str:
-                        """清理标题中的特殊字符"""
-                        if not isinstance(title, str):
-                            title = str(title)
-                        cleaned_title = title.replace("\n", " ").replace("\r", " ")
-                        cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-                        cleaned_title = cleaned_title.strip()
-                        return cleaned_title
-
                     # 辅助函数：创建目录
                     def ensure_directory_exists(directory: str):
                         """确保目录存在"""
@@ -281,59 +234,20 @@ class SystemManagementTools:
                     date_folder = now.strftime("%Y年%m月%d日")
                     time_filename = now.strftime("%H时%M分")
 
-                    # 创建 txt 文件路径
-                    txt_dir = self.project_root / "output" / date_folder / "txt"
-                    ensure_directory_exists(str(txt_dir))
-                    txt_file_path = txt_dir / f"{time_filename}.txt"
+                    # 保存 txt 文件：与 main.py 使用同一写入逻辑（原子写入并登记到当日快照清单）
+                    txt_file_path = engine.write_snapshot(
+                        self.project_root / "output" / date_folder,
+                        time_filename,
+                        results,
+                        id_to_name,
+                        failed_ids,
+                    )
 
                     # 创建 html 文件路径
                     html_dir = self.project_root / "output" / date_folder / "html"
                     ensure_directory_exists(str(html_dir))
                     html_file_path = html_dir / f"{time_filename}.html"
 
-                    # 保存 txt 文件（按照 main.py 的格式）
-                    with open(txt_file_path, "w", encoding="utf-8") as f:
-                        for id_value, title_data in results.items():
-                            # id | name 或 id
-                            name = id_to_name.get(id_value)
-                            if name and name != id_value:
-                                f.write(f"{id_value} | {name}\n")
-                            else:
-                                f.write(f"{id_value}\n")
-
-                            # 按排名排序标题
-                            sorted_titles = []
-                            for title, info in title_data.items():
-                                cleaned = clean_title(title)
-                                if isinstance(info, dict):
-                                    ranks = info.get("ranks", [])
-                                    url = info.get("url", "")
-                                    mobile_url = info.get("mobileUrl", "")
-                                else:
-                                    ranks = info if isinstance(info, list) else []
-                                    url = ""
-                                    mobile_url = ""
-
-                                rank = ranks[0] if ranks else 1
-                                sorted_titles.append((rank, cleaned, url, mobile_url))
-
-                            sorted_titles.sort(key=lambda x: x[0])
-
-                            for rank, cleaned, url, mobile_url in sorted_titles:
-                                line = f"{rank}. {cleaned}"
-                                if url:
-                                    line += f" [URL:{url}]"
-                                if mobile_url:
-                                    line += f" [MOBILE:{mobile_url}]"
-                                f.write(line + "\n")
-
-                            f.write("\n")
-
-                        if failed_ids:
-                            f.write("==== 以下ID请求失败 ====\n")
-                            for id_value in failed_ids:
-                                f.write(f"{id_value}\n")
-
                     # 保存 html 文件（简化版）
                     html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
                     with open(html_file_path, "w", encoding="utf-8") as f:
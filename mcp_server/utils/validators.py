@@ -7,6 +7,7 @@
 from datetime import datetime
 from typing import List, Optional
 import os
+import re
 import yaml
 
 from .errors import InvalidParameterError
@@ -142,6 +143,28 @@ def validate_date(date_str: str) -> datetime:
         )
 
 
+def validate_tick_time(time_str: str) -> str:
+    """
+    验证批次时间格式
+
+    Args:
+        time_str: 批次时间，如 "09:30"、"9:30" 或 "09时30分"
+
+    Returns:
+        快照文件名使用的批次时间，如 "09时30分"
+
+    Raises:
+        InvalidParameterError: 时间格式错误
+    """
+    match = re.fullmatch(r"\s*(\d{1,2})\s*[:：时]\s*(\d{1,2})\s*分?\s*", str(time_str))
+    if not match or int(match.group(1)) > 23 or int(match.group(2)) > 59:
+        raise InvalidParameterError(
+            f"批次时间格式错误: {time_str}",
+            suggestion="请使用 HH:MM 格式，例如: 09:30"
+        )
+    return f"{int(match.group(1)):02d}时{int(match.group(2)):02d}分"
+
+
 def validate_date_range(date_range: Optional[dict]) -> Optional[tuple]:
     """
     验证日期范围